@@ -2,262 +2,577 @@ import os
 import sys
 import time
 import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query
 import dotenv
 from src.logger import logger
 from main import main as process_tender_data
-from main import specific_pdf_download
-from src.services.save_excel import save_to_excel, pdf_result_to_excel
-from src.services.send_email import send_email, send_notification_email
+from pipeline import run_pipeline
+from src.services.export import DEFAULT_EXPORT_FORMATS, ExportFormat, available_formats
+from src.services.offload import (
+    export_overviews_async,
+    export_pdf_results_async,
+    offload_stats,
+    pdf_result_to_excel_async,
+    save_to_excel_async,
+    send_file_email_async,
+    send_notification_email_async,
+    shutdown_pools,
+)
+from src.services.http_client import close_session
+from src.services.browser_pool import start_browser_pool, close_browser_pool
+from src.agent.code_index import get_code_index
+from src.dependencies import get_job_repository
+from src.jobs import JobManager, JobProgress
+from schemas.job_schema import JobEntry, JobStatus
 dotenv.load_dotenv()
 
+job_manager: Optional[JobManager] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global job_manager
+    # Warm the shared Chromium pool so the first scrape doesn't pay the cold start
+    await start_browser_pool()
+    # Build the code index once, off the event loop, before the first classification
+    await asyncio.to_thread(get_code_index)
+    job_manager = JobManager(get_job_repository())
+    for kind, handler in JOB_HANDLERS.items():
+        job_manager.register(kind, handler)
+    # Picks up jobs left queued or running by the previous process
+    await job_manager.start()
+    yield
+    await job_manager.stop()
+    # Let in-flight report builds and sends finish
+    await asyncio.to_thread(shutdown_pools)
+    await close_browser_pool()
+    # Release pooled keep-alive connections on shutdown
+    await close_session()
+
+
+def _overview_report_hook(date_from: str, date_to: str, email_type: str | None = None):
+    """Pipeline hook that saves (and optionally emails) the overview Excel before PDF analysis ends."""
+    async def hook(overviews: list[dict]):
+        if not overviews:
+            return
+        before_pdf_excel = f"tender_data/tender_overviews_{date_from}_to_{date_to}.xlsx"
+        await save_to_excel_async(overviews, before_pdf_excel)
+        if email_type is None:
+            return
+        await send_file_email_async(
+            before_pdf_excel,
+            report_title="Tender Overview Report",
+            total_tenders=len(overviews),
+            type=email_type,
+            mail_type="special"
+        )
+    return hook
+
+
 app = FastAPI(
     title="Tender Document Analysis API",
     description="API for processing tender document data and generating comprehensive Excel reports",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 #Request and Response Models
 class TenderRequest(BaseModel):
     date_from: str
     date_to: str
+    # Parquet/CSV exports written alongside the Excel reports; EXPORT_FORMATS when omitted
+    formats: Optional[List[ExportFormat]] = None
 
 class TenderResponse(BaseModel):
     status: str
     message: str
     statistics: dict
     timestamp: str
+    job_id: Optional[str] = None
 
+class JobResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    date_from: str
+    date_to: str
+    attempts: int
+    progress: dict
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
 
-# API Endpoints
-@app.get("/", tags=["Health"])
-async def health_check():
-    """
-    Health check endpoint to verify that the API is running.
-    """
-    logger.info("Health check requested")
-    return {
-        "service": "Tender Document analysis API",
-        "status": "running",
-        "version": "1.0.0",
-    }
-@app.post("/process_tenders_default", response_model=TenderResponse, tags=["Tender Processing"])
-async def process_tenders_default(request: TenderRequest):
+
+def _timestamp() -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+
+
+def _job_response(job: JobEntry) -> JobResponse:
+    return JobResponse(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status.value,
+        date_from=job.date_from,
+        date_to=job.date_to,
+        attempts=job.attempts,
+        progress=job.progress,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def _submit_job(
+    kind: str, date_from: str, date_to: str, formats: Optional[List[ExportFormat]] = None
+) -> TenderResponse:
+    """Queue a processing job and answer immediately with its ID."""
+    formats = DEFAULT_EXPORT_FORMATS if formats is None else formats
+    unavailable = [f.value for f in formats if f not in available_formats()]
+    if unavailable:
+        raise HTTPException(status_code=400, detail=f"Export formats not available on this server: {', '.join(unavailable)}")
+    job, coalesced = await job_manager.submit(kind, date_from, date_to, [f.value for f in formats])
+    message = (
+        f"A {kind} job for this date range is already {job.status.value}; returning it."
+        if coalesced else "Job queued."
+    )
+    return TenderResponse(
+        status=job.status.value,
+        message=message,
+        statistics={"date_from": date_from, "date_to": date_to},
+        timestamp=_timestamp(),
+        job_id=job.id,
+    )
+
+
+async def _export(
+    formats: List[str],
+    overviews: list[dict],
+    output_name: str,
+    pdf_results: Optional[list[dict]] = None,
+    pdf_output_name: Optional[str] = None,
+) -> List[str]:
+    """Write the requested Parquet/CSV exports next to the JSON dumps; returns their paths."""
+    paths = await export_overviews_async(overviews, f"tender_data/{output_name}", formats)
+    if pdf_results:
+        paths += await export_pdf_results_async(pdf_results, f"tender_data/{pdf_output_name}", formats)
+    return paths
+
+
+# Job handlers: each runs one processing job and returns the final TenderResponse as a dict
+async def process_tenders_default_job(date_from: str, date_to: str, progress: JobProgress, formats: List[str]) -> dict:
     start_time = time.time()
-    logger.info(f"Processing tenders from {request.date_from} to {request.date_to}")
-    try:
-        output_name = f"tender_overviews_{request.date_from}_to_{request.date_to}"
-        overviews = await process_tender_data(output_name=output_name, start_date=request.date_from, end_date=request.date_to)
-        end_time = time.time()
-        elapsed_time = end_time - start_time
-        statistics = {
-            "date_from": request.date_from,
-            "date_to": request.date_to,
-            "processing_time_seconds": elapsed_time
-        }
+    logger.info(f"Processing tenders from {date_from} to {date_to}")
+    output_name = f"tender_overviews_{date_from}_to_{date_to}"
+    progress.update("classifying")
+    overviews = await process_tender_data(output_name=output_name, start_date=date_from, end_date=date_to)
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    statistics = {
+        "date_from": date_from,
+        "date_to": date_to,
+        "processing_time_seconds": elapsed_time
+    }
 
-        if not overviews:
-            send_notification_email(
-                report_title="Tender Overview Report",
-                message="No tenders found in the specified date range.",
-                type="default"
-            )
-            return TenderResponse(
-                status="success",
-                message="No tenders found in the specified date range.",
-                statistics=statistics,
-                timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-            )
-
-        
-
-        logger.info("Saving tender overviews to Excel")
-        excel_filepath = f"tender_data/tender_overviews_{request.date_from}_to_{request.date_to}.xlsx"
-        save_to_excel(overviews, excel_filepath)
-
-        logger.info("Sending email with Excel report")
-
-        with open(excel_filepath, 'rb') as f: 
-            filedata = f.read()
-        
-        send_email(
-            filename=os.path.basename(excel_filepath),
-            filedata=filedata, 
+    if not overviews:
+        await send_notification_email_async(
             report_title="Tender Overview Report",
-            total_tenders=len(overviews),
+            message="No tenders found in the specified date range.",
+            type="default"
         )
-    
-        logger.info(f"Tender processing completed in {elapsed_time:.2f} seconds")
         return TenderResponse(
             status="success",
-            message="Tender data processed successfully.",
+            message="No tenders found in the specified date range.",
             statistics=statistics,
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-        )
-    except Exception as e:
-        logger.error(f"Error processing tenders: {e}")
+            timestamp=_timestamp()
+        ).model_dump()
+
+    if formats:
+        statistics["exports"] = await _export(formats, overviews, output_name)
+
+    logger.info("Saving tender overviews to Excel")
+    progress.update("reporting", force=True, overviews=len(overviews))
+    excel_filepath = f"tender_data/tender_overviews_{date_from}_to_{date_to}.xlsx"
+    await save_to_excel_async(overviews, excel_filepath)
+
+    logger.info("Sending email with Excel report")
+
+    await send_file_email_async(
+        excel_filepath,
+        report_title="Tender Overview Report",
+        total_tenders=len(overviews),
+    )
+
+    logger.info(f"Tender processing completed in {elapsed_time:.2f} seconds")
+    return TenderResponse(
+        status="success",
+        message="Tender data processed successfully.",
+        statistics=statistics,
+        timestamp=_timestamp()
+    ).model_dump()
+
+
+async def process_tenders_job(date_from: str, date_to: str, progress: JobProgress, formats: List[str]) -> dict:
+    start_time = time.time()
+    logger.info(f"Processing tenders from {date_from} to {date_to}")
+    output_name = f"tender_overviews_{date_from}_to_{date_to}"
+    specific_filename = f"specific_tender_pdfs_{date_from}_to_{date_to}"
+    progress.update("pipeline")
+    result = await run_pipeline(
+        start_date=date_from,
+        end_date=date_to,
+        output_name=output_name,
+        pdf_output_name=specific_filename,
+        on_progress=progress.pipeline,
+    )
+    overviews = result.overviews
+    pdf_results = result.pdf_results
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    statistics = {
+        "date_from": date_from,
+        "date_to": date_to,
+        "processing_time_seconds": elapsed_time
+    }
+    if not overviews:
         return TenderResponse(
-            status="error",
-            message=str(e),
-            statistics={},
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-        )
-    
-@app.post("/process_tenders", response_model=TenderResponse, tags=["Tender Processing"])
-async def process_tenders(request: TenderRequest):
+            status="success",
+            message="No tenders found in the specified date range.",
+            statistics=statistics,
+            timestamp=_timestamp()
+        ).model_dump()
+
+    if formats:
+        statistics["exports"] = await _export(formats, overviews, output_name, pdf_results, specific_filename)
+
+    #send overviews
+    progress.update("reporting", force=True, overviews=len(overviews), pdf_results=len(pdf_results))
+    overview_excel = f"tender_data/tender_overviews_{date_from}_to_{date_to}.xlsx"
+    await save_to_excel_async(overviews, overview_excel)
+    await send_file_email_async(
+        overview_excel,
+        report_title="Tender Overview Report",
+        total_tenders=len(overviews),
+    )
+
+    # Calculate statistics
+    total_pdfs = sum(len(result.get('pdf_paths', [])) for result in pdf_results)
+
+    #save excel
+    excel_filepath = f"tender_data/tender_overviews_pdf_{date_from}_to_{date_to}.xlsx"
+    await pdf_result_to_excel_async(pdf_results, excel_filepath)
+    date_range = f"{date_from} to {date_to}"
+    await send_file_email_async(
+        excel_filepath,
+        report_title="Tender Analysis with PDF Reports",
+        total_tenders=len(overviews),
+    )
+
+    logger.info(f"Tender processing completed in {elapsed_time:.2f} seconds")
+    return TenderResponse(
+        status="success",
+        message="Tender data processed successfully.",
+        statistics=statistics,
+        timestamp=_timestamp()
+    ).model_dump()
+
+
+async def monday_tender_job(date_from: str, date_to: str, progress: JobProgress, formats: List[str]) -> dict:
     start_time = time.time()
-    logger.info(f"Processing tenders from {request.date_from} to {request.date_to}")
-    try:
-        output_name = f"tender_overviews_{request.date_from}_to_{request.date_to}"
-        overviews = await process_tender_data(output_name=output_name, start_date=request.date_from, end_date=request.date_to)
-        end_time = time.time()
-        elapsed_time = end_time - start_time
-        statistics = {
-            "date_from": request.date_from,
-            "date_to": request.date_to,
-            "processing_time_seconds": elapsed_time
-        }
-        if not overviews:
-            return TenderResponse(
-                status="success",
-                message="No tenders found in the specified date range.",
-                statistics=statistics,
-                timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-            )
-
-        specific_filename = f"specific_tender_pdfs_{request.date_from}_to_{request.date_to}"
-        pdf_results = await specific_pdf_download(overviews, specific_filename)
-
-        #send overviews
-        overview_excel = f"tender_data/tender_overviews_{request.date_from}_to_{request.date_to}.xlsx"
-        save_to_excel(overviews, overview_excel)
-        with open(overview_excel, 'rb') as f: 
-            overview_filedata = f.read()
-        
-        send_email(
-            filename=os.path.basename(overview_excel),
-            filedata=overview_filedata, 
+    logger.info(f"Processing tenders from {date_from} to {date_to} - Monday run")
+    output_name = f"tender_overviews_{date_from}_to_{date_to}"
+    specific_filename = f"specific_tender_pdfs_{date_from}_to_{date_to}"
+    progress.update("pipeline")
+    # The overview report goes out as soon as classification finishes, while PDFs are still processed
+    result = await run_pipeline(
+        start_date=date_from,
+        end_date=date_to,
+        output_name=output_name,
+        pdf_output_name=specific_filename,
+        on_overviews_ready=_overview_report_hook(date_from, date_to, "special_monday"),
+        on_progress=progress.pipeline,
+    )
+    overviews = result.overviews
+    pdf_results = result.pdf_results
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    statistics = {
+        "date_from": date_from,
+        "date_to": date_to,
+        "processing_time_seconds": elapsed_time
+    }
+    if not overviews:
+        await send_notification_email_async(
             report_title="Tender Overview Report",
-            total_tenders=len(overviews),
-        )
-        
-        # Calculate statistics
-        total_pdfs = sum(len(result.get('pdf_paths', [])) for result in pdf_results)
-        
-        #save excel
-        excel_filepath = f"tender_data/tender_overviews_pdf_{request.date_from}_to_{request.date_to}.xlsx"
-        pdf_result_to_excel(pdf_results, excel_filepath)
-        with open(excel_filepath, 'rb') as f: 
-            filedata = f.read()
-        
-        date_range = f"{request.date_from} to {request.date_to}"
-        send_email(
-            filename=os.path.basename(excel_filepath),
-            filedata=filedata, 
-            report_title="Tender Analysis with PDF Reports",
-            total_tenders=len(overviews),
+            message="No tenders found in the specified date range.",
+            type="special_monday"
         )
-    
-        logger.info(f"Tender processing completed in {elapsed_time:.2f} seconds")
         return TenderResponse(
             status="success",
-            message="Tender data processed successfully.",
+            message="No tenders found in the specified date range.",
             statistics=statistics,
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+            timestamp=_timestamp()
+        ).model_dump()
+
+    if formats:
+        statistics["exports"] = await _export(formats, overviews, output_name, pdf_results, specific_filename)
+
+    # Calculate statistics
+    total_pdfs = sum(len(result.get('pdf_paths', [])) for result in pdf_results)
+
+    #save excel
+    progress.update("reporting", force=True, overviews=len(overviews), pdf_results=len(pdf_results))
+    excel_filepath = f"tender_data/tender_overviews_pdf_{date_from}_to_{date_to}.xlsx"
+    await pdf_result_to_excel_async(pdf_results, excel_filepath)
+    await send_file_email_async(
+        excel_filepath,
+        report_title="Tender Analysis with PDF Reports - Monday Batch",
+        total_tenders=len(overviews),
+        type="special_monday"
+    )
+
+    logger.info(f"Monday tender processing completed in {elapsed_time:.2f} seconds")
+    return TenderResponse(
+        status="success",
+        message="Tender data processed successfully.",
+        statistics=statistics,
+        timestamp=_timestamp()
+    ).model_dump()
+
+
+async def wednesday_tender_job(date_from: str, date_to: str, progress: JobProgress, formats: List[str]) -> dict:
+    start_time = time.time()
+    logger.info(f"Processing tenders from {date_from} to {date_to} - Wednesday run")
+    output_name = f"tender_overviews_{date_from}_to_{date_to}"
+    specific_filename = f"specific_tender_pdfs_{date_from}_to_{date_to}"
+    progress.update("pipeline")
+    # The overview Excel is written as soon as classification finishes, while PDFs are still processed
+    result = await run_pipeline(
+        start_date=date_from,
+        end_date=date_to,
+        output_name=output_name,
+        pdf_output_name=specific_filename,
+        on_overviews_ready=_overview_report_hook(date_from, date_to),
+        on_progress=progress.pipeline,
+    )
+    overviews = result.overviews
+    pdf_results = result.pdf_results
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    statistics = {
+        "date_from": date_from,
+        "date_to": date_to,
+        "processing_time_seconds": elapsed_time
+    }
+    if not overviews:
+        await send_notification_email_async(
+            report_title="Tender Overview Report",
+            message="No tenders found in the specified date range.",
+            type="special_wednesday"
         )
-    except Exception as e:
-        logger.error(f"Error processing tenders: {e}")
         return TenderResponse(
-            status="error",
-            message=str(e),
-            statistics={},
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-        )
-    
-#Monday run 6,7,1
-@app.post("/monday_tender_process", response_model=TenderResponse, tags=["Tender Processing"])
-async def monday_tender_process():
+            status="success",
+            message="No tenders found in the specified date range.",
+            statistics=statistics,
+            timestamp=_timestamp()
+        ).model_dump()
+
+    if formats:
+        statistics["exports"] = await _export(formats, overviews, output_name, pdf_results, specific_filename)
+
+    # Calculate statistics
+    total_pdfs = sum(len(result.get('pdf_paths', [])) for result in pdf_results)
+
+    #save excel
+    progress.update("reporting", force=True, overviews=len(overviews), pdf_results=len(pdf_results))
+    excel_filepath = f"tender_data/tender_overviews_pdf_{date_from}_to_{date_to}.xlsx"
+    await pdf_result_to_excel_async(pdf_results, excel_filepath)
+    await send_file_email_async(
+        excel_filepath,
+        report_title="Tender Analysis with PDF Reports - Wednesday Batch",
+        total_tenders=len(overviews),
+        type="special_wednesday"
+    )
+
+    logger.info(f"Wednesday tender processing completed in {elapsed_time:.2f} seconds")
+    return TenderResponse(
+        status="success",
+        message="Tender data processed successfully.",
+        statistics=statistics,
+        timestamp=_timestamp()
+    ).model_dump()
+
+
+async def friday_tender_job(date_from: str, date_to: str, progress: JobProgress, formats: List[str]) -> dict:
     start_time = time.time()
-    date_to = time.strftime("%Y-%m-%d", time.gmtime(start_time))
-    date_from = time.strftime("%Y-%m-%d", time.gmtime(start_time - 2 * 24 * 60 * 60))  # 2 days back to cover weekend
-    logger.info(f"Processing tenders from {date_from} to {date_to} - Monday run")
-    try:
-        output_name = f"tender_overviews_{date_from}_to_{date_to}"
-        overviews = await process_tender_data(output_name=output_name, start_date=date_from, end_date=date_to)
-        end_time = time.time()
-        elapsed_time = end_time - start_time
-        statistics = {
-            "date_from": date_from,
-            "date_to": date_to,
-            "processing_time_seconds": elapsed_time
-        }
-        if not overviews:
-            send_notification_email(
-                report_title="Tender Overview Report",
-                message="No tenders found in the specified date range.",
-                type="special_monday"
-            )
-            return TenderResponse(
-                status="success",
-                message="No tenders found in the specified date range.",
-                statistics=statistics,
-                timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-            )
-        
-        #before pdf to send mail
-        before_pdf_excel = f"tender_data/tender_overviews_{date_from}_to_{date_to}.xlsx"
-        save_to_excel(overviews, before_pdf_excel)
-        with open(before_pdf_excel, 'rb') as f: 
-            filedata = f.read()
-        send_email(
-            filename=os.path.basename(before_pdf_excel),
-            filedata=filedata,
+    logger.info(f"Processing tenders from {date_from} to {date_to} - Friday run")
+    output_name = f"tender_overviews_{date_from}_to_{date_to}"
+    specific_filename = f"specific_tender_pdfs_{date_from}_to_{date_to}"
+    progress.update("pipeline")
+    # The overview report goes out as soon as classification finishes, while PDFs are still processed
+    result = await run_pipeline(
+        start_date=date_from,
+        end_date=date_to,
+        output_name=output_name,
+        pdf_output_name=specific_filename,
+        on_overviews_ready=_overview_report_hook(date_from, date_to, "special_friday"),
+        on_progress=progress.pipeline,
+    )
+    overviews = result.overviews
+    pdf_results = result.pdf_results
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    statistics = {
+        "date_from": date_from,
+        "date_to": date_to,
+        "processing_time_seconds": elapsed_time
+    }
+    if not overviews:
+        await send_notification_email_async(
             report_title="Tender Overview Report",
-            total_tenders=len(overviews),
-            type="special_monday",
-            mail_type="special"
+            message="No tenders found in the specified date range.",
+            type="default"
         )
+        return TenderResponse(
+            status="success",
+            message="No tenders found in the specified date range.",
+            statistics=statistics,
+            timestamp=_timestamp()
+        ).model_dump()
 
-        specific_filename = f"specific_tender_pdfs_{date_from}_to_{date_to}"
-        pdf_results = await specific_pdf_download(overviews, specific_filename)
-        
-        # Calculate statistics
-        total_pdfs = sum(len(result.get('pdf_paths', [])) for result in pdf_results)
-        
-        #save excel
-        excel_filepath = f"tender_data/tender_overviews_pdf_{date_from}_to_{date_to}.xlsx"
-        pdf_result_to_excel(pdf_results, excel_filepath)
-        with open(excel_filepath, 'rb') as f: 
-            filedata = f.read()
-        
-        send_email(
-            filename=os.path.basename(excel_filepath),
-            filedata=filedata, 
-            report_title="Tender Analysis with PDF Reports - Monday Batch",
-            total_tenders=len(overviews),
-            type="special_monday"
+    if formats:
+        statistics["exports"] = await _export(formats, overviews, output_name, pdf_results, specific_filename)
+
+    if not pdf_results:
+        await send_notification_email_async(
+            report_title="Tender PDF Download Report",
+            message="No PDFs were downloaded for the tenders in the specified date range.",
+            type="special_friday"
         )
-    
-        logger.info(f"Monday tender processing completed in {elapsed_time:.2f} seconds")
         return TenderResponse(
             status="success",
-            message="Tender data processed successfully.",
+            message="No PDFs were downloaded for the tenders in the specified date range.",
             statistics=statistics,
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+            timestamp=_timestamp()
+        ).model_dump()
+
+    #save excel
+    progress.update("reporting", force=True, overviews=len(overviews), pdf_results=len(pdf_results))
+    excel_filepath = f"tender_data/tender_overviews_pdf_{date_from}_to_{date_to}.xlsx"
+    await pdf_result_to_excel_async(pdf_results, excel_filepath)
+    await send_file_email_async(
+        excel_filepath,
+        report_title="Tender Analysis with PDF Reports - Friday Batch",
+        total_tenders=len(overviews),
+        type="special_friday"
+    )
+
+    logger.info(f"Friday tender processing completed in {elapsed_time:.2f} seconds")
+    return TenderResponse(
+        status="success",
+        message="Tender data processed successfully.",
+        statistics=statistics,
+        timestamp=_timestamp()
+    ).model_dump()
+
+
+async def daily_tender_job(date_from: str, date_to: str, progress: JobProgress, formats: List[str]) -> dict:
+    start_time = time.time()
+    logger.info("Starting daily tender processing")
+    today_date = date_from
+    output_name = f"tender_overviews_{today_date}"
+    progress.update("classifying")
+    overviews =await process_tender_data(output_name=output_name, start_date=today_date, end_date=today_date)
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    statistics = {
+        "date": today_date,
+        "processing_time_seconds": elapsed_time
+    }
+    logger.info(f"Daily tender processing completed in {elapsed_time:.2f} seconds")
+
+    if not overviews:
+        await send_notification_email_async(
+            report_title="Daily Tender Overview Report",
+            message="No tenders found for today.",
+            type="default"
         )
-    except Exception as e:
-        logger.error(f"Error processing tenders: {e}")
         return TenderResponse(
-            status="error",
-            message=str(e),
-            statistics={},
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-        )
+            status="success",
+            message="No tenders found for today.",
+            statistics=statistics,
+            timestamp=_timestamp()
+        ).model_dump()
+
+    if formats:
+        statistics["exports"] = await _export(formats, overviews, output_name)
+
+    #send email with summary
+    progress.update("reporting", force=True, overviews=len(overviews))
+    excel_filepath = f"tender_data/tender_overviews_{today_date}.xlsx"
+    await send_file_email_async(
+        excel_filepath,
+        report_title="Daily Tender Overview Report",
+        total_tenders=0,
+    )
+
+    return TenderResponse(
+        status="success",
+        message="Daily tender data processed successfully.",
+        statistics=statistics,
+        timestamp=_timestamp()
+    ).model_dump()
+
+
+JOB_HANDLERS = {
+    "process_tenders_default": process_tenders_default_job,
+    "process_tenders": process_tenders_job,
+    "monday_tender_process": monday_tender_job,
+    "wednesday_tender_process": wednesday_tender_job,
+    "friday_tender_process": friday_tender_job,
+    "daily_tender_process": daily_tender_job,
+}
+
+
+# API Endpoints
+@app.get("/", tags=["Health"])
+async def health_check():
+    """
+    Health check endpoint to verify that the API is running.
+    """
+    logger.info("Health check requested")
+    return {
+        "service": "Tender Document analysis API",
+        "status": "running",
+        "version": "1.0.0",
+        "offload": offload_stats(),
+    }
+
+# Processing endpoints queue a job and return its ID at once; poll /jobs/{job_id} for the outcome
+@app.post("/process_tenders_default", response_model=TenderResponse, tags=["Tender Processing"])
+async def process_tenders_default(request: TenderRequest):
+    return await _submit_job("process_tenders_default", request.date_from, request.date_to, request.formats)
+
+@app.post("/process_tenders", response_model=TenderResponse, tags=["Tender Processing"])
+async def process_tenders(request: TenderRequest):
+    return await _submit_job("process_tenders", request.date_from, request.date_to, request.formats)
+
+#Monday run 6,7,1
+@app.post("/monday_tender_process", response_model=TenderResponse, tags=["Tender Processing"])
+async def monday_tender_process(formats: Optional[List[ExportFormat]] = Query(None)):
+    start_time = time.time()
+    date_to = time.strftime("%Y-%m-%d", time.gmtime(start_time))
+    date_from = time.strftime("%Y-%m-%d", time.gmtime(start_time - 2 * 24 * 60 * 60))  # 2 days back to cover weekend
+    return await _submit_job("monday_tender_process", date_from, date_to, formats)
 
 #Wednesday run 2,3
 @app.post("/wednesday_tender_process", response_model=TenderResponse, tags=["Tender Processing"])
-async def wednesday_tender_process():
+async def wednesday_tender_process(formats: Optional[List[ExportFormat]] = Query(None)):
     """
     Process tender documents for the given date range and generate an Excel report.
     This endpoint is intended to be triggered by a Wednesday scheduler.
@@ -265,73 +580,11 @@ async def wednesday_tender_process():
     start_time = time.time()
     date_to = time.strftime("%Y-%m-%d", time.gmtime(start_time))
     date_from = time.strftime("%Y-%m-%d", time.gmtime(start_time - 1 * 24 * 60 * 60))  # 1 day back
-    logger.info(f"Processing tenders from {date_from} to {date_to} - Wednesday run")
+    return await _submit_job("wednesday_tender_process", date_from, date_to, formats)
 
-    try:
-        output_name = f"tender_overviews_{date_from}_to_{date_to}"
-        overviews = await process_tender_data(output_name=output_name, start_date=date_from, end_date=date_to)
-        end_time = time.time()
-        elapsed_time = end_time - start_time
-        statistics = {
-            "date_from": date_from,
-            "date_to": date_to,
-            "processing_time_seconds": elapsed_time
-        }
-        if not overviews:
-            send_notification_email(
-                report_title="Tender Overview Report",
-                message="No tenders found in the specified date range.",
-                type="special_wednesday"
-            )
-            return TenderResponse(
-                status="success",
-                message="No tenders found in the specified date range.",
-                statistics=statistics,
-                timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-            )
-
-        specific_filename = f"specific_tender_pdfs_{date_from}_to_{date_to}"
-        pdf_results = await specific_pdf_download(overviews, specific_filename)
-        #before pdf to send mail
-        before_pdf_excel = f"tender_data/tender_overviews_{date_from}_to_{date_to}.xlsx"
-        save_to_excel(overviews, before_pdf_excel)
-        # Calculate statistics
-        total_pdfs = sum(len(result.get('pdf_paths', [])) for result in pdf_results)
-        
-        #save excel
-        excel_filepath = f"tender_data/tender_overviews_pdf_{date_from}_to_{date_to}.xlsx"
-        pdf_result_to_excel(pdf_results, excel_filepath)
-        with open(excel_filepath, 'rb') as f: 
-            filedata = f.read()
-        
-        send_email(
-            filename=os.path.basename(excel_filepath),
-            filedata=filedata, 
-            report_title="Tender Analysis with PDF Reports - Wednesday Batch",
-            total_tenders=len(overviews),
-            type="special_wednesday"
-        )
-    
-        logger.info(f"Wednesday tender processing completed in {elapsed_time:.2f} seconds")
-        return TenderResponse(
-            status="success",
-            message="Tender data processed successfully.",
-            statistics=statistics,
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-        )
-
-    except Exception as e:
-        logger.error(f"Error processing tenders: {e}")
-        return TenderResponse(
-            status="error",
-            message=str(e),
-            statistics={},
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-        )
-    
 #Friday run 4,5
 @app.post("/friday_tender_process", response_model=TenderResponse, tags=["Tender Processing"])
-async def friday_tender_process():
+async def friday_tender_process(formats: Optional[List[ExportFormat]] = Query(None)):
     """
     Process tender documents for the given date range and generate an Excel report.
     This endpoint is intended to be triggered by a Friday scheduler.
@@ -339,151 +592,53 @@ async def friday_tender_process():
     start_time = time.time()
     date_to = time.strftime("%Y-%m-%d", time.gmtime(start_time))
     date_from = time.strftime("%Y-%m-%d", time.gmtime(start_time - 1 * 24 * 60 * 60))  # 1 day back
-    logger.info(f"Processing tenders from {date_from} to {date_to} - Friday run")
+    return await _submit_job("friday_tender_process", date_from, date_to, formats)
 
-    try:
-        output_name = f"tender_overviews_{date_from}_to_{date_to}"
-        overviews = await process_tender_data(output_name=output_name, start_date=date_from, end_date=date_to)
-        end_time = time.time()
-        elapsed_time = end_time - start_time
-        statistics = {
-            "date_from": date_from,
-            "date_to": date_to,
-            "processing_time_seconds": elapsed_time
-        }
-        if not overviews:
-            send_notification_email(
-                report_title="Tender Overview Report",
-                message="No tenders found in the specified date range.",
-                type="default"
-            )
-            return TenderResponse(
-                status="success",
-                message="No tenders found in the specified date range.",
-                statistics=statistics,
-                timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-            )
-        else:
-            #before pdf to send mail
-            before_pdf_excel = f"tender_data/tender_overviews_{date_from}_to_{date_to}.xlsx"
-            save_to_excel(overviews, before_pdf_excel)
-            with open(before_pdf_excel, 'rb') as f: 
-                filedata = f.read()
-            send_email(
-                filename=os.path.basename(before_pdf_excel),
-                filedata=filedata, 
-                report_title="Tender Overview Report",
-                total_tenders=len(overviews),
-                type="special_friday",
-                mail_type="special"
-            )
-
-        
-
-        specific_filename = f"specific_tender_pdfs_{date_from}_to_{date_to}"
-        pdf_results = await specific_pdf_download(overviews, specific_filename)
-        
-        if not pdf_results:
-            send_notification_email(
-                report_title="Tender PDF Download Report",
-                message="No PDFs were downloaded for the tenders in the specified date range.",
-                type="special_friday"
-            )
-            return TenderResponse(
-                status="success",
-                message="No PDFs were downloaded for the tenders in the specified date range.",
-                statistics=statistics,
-                timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-            )
-
-        #save excel
-        excel_filepath = f"tender_data/tender_overviews_pdf_{date_from}_to_{date_to}.xlsx"
-        pdf_result_to_excel(pdf_results, excel_filepath)
-        with open(excel_filepath, 'rb') as f: 
-            filedata = f.read()
-
-        send_email(
-            filename=os.path.basename(excel_filepath),
-            filedata=filedata, 
-            report_title="Tender Analysis with PDF Reports - Friday Batch",
-            total_tenders=len(overviews),
-            type="special_friday"
-        )
-    
-        logger.info(f"Friday tender processing completed in {elapsed_time:.2f} seconds")
-        return TenderResponse(
-            status="success",
-            message="Tender data processed successfully.",
-            statistics=statistics,
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-        )
-    except Exception as e:
-        logger.error(f"Error processing tenders: {e}")
-        return TenderResponse(
-            status="error",
-            message=str(e),
-            statistics={},
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-        )
-    
 
 @app.post("/daily_tender_process", response_model=TenderResponse, tags=["Tender Processing"])
-async def daily_tender_process():
-    start_time = time.time()
-    logger.info("Starting daily tender processing")
-    try:
-        today_date = time.strftime("%Y-%m-%d", time.gmtime())
-        output_name = f"tender_overviews_{today_date}"
-        overviews =await process_tender_data(output_name=output_name, start_date=today_date, end_date=today_date)
-        end_time = time.time()
-        elapsed_time = end_time - start_time
-        statistics = {
-            "date": today_date,
-            "processing_time_seconds": elapsed_time
-        }
-        logger.info(f"Daily tender processing completed in {elapsed_time:.2f} seconds")
+async def daily_tender_process(formats: Optional[List[ExportFormat]] = Query(None)):
+    today_date = time.strftime("%Y-%m-%d", time.gmtime())
+    return await _submit_job("daily_tender_process", today_date, today_date, formats)
 
-        if not overviews:
-            send_notification_email(
-                report_title="Daily Tender Overview Report",
-                message="No tenders found for today.",
-                type="default"
-            )
-            return TenderResponse(
-                status="success",
-                message="No tenders found for today.",
-                statistics=statistics,
-                timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-            )
-
-        #send email with summary
-        excel_filepath = f"tender_data/tender_overviews_{today_date}.xlsx"
-        with open(excel_filepath, 'rb') as f:
-            filedata = f.read()
-        send_email(
-            filename=os.path.basename(excel_filepath),
-            filedata=filedata,
-            report_title="Daily Tender Overview Report",
-            total_tenders=0,
-        )
 
-        return TenderResponse(
-            status="success",
-            message="Daily tender data processed successfully.",
-            statistics=statistics,
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
-        )
+@app.get("/jobs", response_model=List[JobResponse], tags=["Jobs"])
+async def list_jobs(limit: int = 50):
+    return [_job_response(job) for job in await job_manager.list_jobs(limit)]
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse, tags=["Jobs"])
+async def job_status(job_id: str):
+    job = await job_manager.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return _job_response(job)
 
 
-    except Exception as e:
-        logger.error(f"Error in daily tender processing: {e}")
+@app.get("/jobs/{job_id}/progress", tags=["Jobs"])
+async def job_progress(job_id: str):
+    job = await job_manager.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return {"job_id": job.id, "status": job.status.value, "attempts": job.attempts, "progress": job.progress}
+
+
+@app.get("/jobs/{job_id}/result", response_model=TenderResponse, tags=["Jobs"])
+async def job_result(job_id: str):
+    job = await job_manager.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    if job.is_active:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is still {job.status.value}")
+    if job.status == JobStatus.FAILED:
         return TenderResponse(
             status="error",
-            message=str(e),
+            message=job.error or "Job failed.",
             statistics={},
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+            timestamp=_timestamp(),
+            job_id=job.id,
         )
-    
+    return TenderResponse(**{**job.result, "job_id": job.id})
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8003)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8003)
@@ -0,0 +1,143 @@
+"""Compare the in-memory and streaming Excel writers on synthetic reports.
+
+    python bench_excel.py                  # overview report, 1k, 10k and 50k data rows
+    python bench_excel.py --report pdf --rows 1000 5000 --memory
+
+Each run happens in a fresh process so peak memory of one writer doesn't leak into the other;
+runs exceeding --timeout are stopped and reported as such.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from schemas.lvl_schema import dict_of_level
+from src.services.save_excel import pdf_result_to_excel, save_to_excel
+
+
+# writer -> openpyxl write-only mode
+WRITERS = {
+    "workbook": False,
+    "streaming": True,
+}
+
+
+WORDS = ["барилга", "засвар", "нийлүүлэлт", "тоног", "төхөөрөмж", "сургууль", "эмнэлэг", "зам", "цахилгаан"]
+REQUIREMENT_WORDS = ["шаардлага", "гэрчилгээ", "хүргэлт", "баглаа", "стандарт", "чанар", "гэрээ", "төлбөр", "тусгай"]
+
+
+def _overview(rng: random.Random, codes: list, n: int) -> dict:
+    return {
+        "announced_date": f"2026-01-{n % 28 + 1:02d}",
+        "summary": " ".join(rng.choices(WORDS, k=rng.randint(10, 120))),
+        "tender_category": rng.sample(codes, rng.choice([1, 2])),
+        "tender_category_detail": rng.sample(codes, rng.choice([1, 2, 3])),
+        "name": " ".join(rng.choices(WORDS, k=rng.randint(3, 25))),
+        "ordering_organization": " ".join(rng.choices(WORDS, k=rng.randint(2, 8))),
+        "total_budget": rng.choice([None, rng.randint(1_000_000, 9_000_000_000)]),
+        "deadline_date": f"2026-02-{n % 28 + 1:02d}",
+        "selection_number": f"ШТ-{n:06d}",
+        "official_link": f"https://www.tender.gov.mn/mn/invitation/detail/{n}",
+        "tender_type": rng.choice(["G", "S"]),
+        "level1": rng.choice(["G", "S"]),
+        "level2": rng.sample(codes, rng.choice([1, 1, 2, 3])),
+        "level3": rng.sample(codes, rng.choice([1, 2, 4])),
+    }
+
+
+def synthetic_overviews(rows: int, seed: int = 7) -> list:
+    """Overviews shaped like pipeline output, totalling about `rows` data rows."""
+    rng = random.Random(seed)
+    codes = list(dict_of_level.keys())
+    overviews = []
+    total = 0
+    while total < rows:
+        overview = _overview(rng, codes, len(overviews))
+        overviews.append(overview)
+        total += max(len(overview[key]) for key in ("tender_category", "tender_category_detail", "level2", "level3"))
+    return overviews
+
+
+def synthetic_pdf_results(rows: int, seed: int = 7) -> list:
+    """PDF results (overview fields plus parts and requirements), totalling about `rows` data rows."""
+    rng = random.Random(seed)
+    codes = list(dict_of_level.keys())
+    results = []
+    total = 0
+    while total < rows:
+        parts = [
+            {
+                "part_name": f"Багц {k + 1}",
+                "content": " ".join(rng.choices(REQUIREMENT_WORDS, k=rng.randint(5, 60))),
+                "part_budget": rng.choice([None, rng.randint(100_000, 900_000_000)]),
+            }
+            for k in range(rng.choice([0, 1, 2, 3, 5]))
+        ]
+        results.append({
+            **_overview(rng, codes, len(results)),
+            "main_category": rng.choice(["Барилга", "Тоног төхөөрөмж", "Үйлчилгээ"]),
+            "parts": parts,
+            "requirements": {
+                key: " ".join(rng.choices(REQUIREMENT_WORDS, k=rng.randint(10, 150)))
+                for key in ("main_requirements", "business_requirements", "technical_requirements")
+            },
+        })
+        total += max(len(parts), 1)
+    return results
+
+
+REPORTS = {
+    "overview": (save_to_excel, synthetic_overviews),
+    "pdf": (pdf_result_to_excel, synthetic_pdf_results),
+}
+
+
+def _run(report: str, writer: str, rows: int, memory: bool) -> dict:
+    save, generate = REPORTS[report]
+    overviews = generate(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"{writer}.xlsx")
+        if memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        save(overviews, path, write_only=WRITERS[writer])
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if memory else None
+        if memory:
+            tracemalloc.stop()
+        return {"tenders": len(overviews), "seconds": seconds, "peak_mb": peak / (1024 * 1024) if memory else None,
+                "size_mb": os.path.getsize(path) / (1024 * 1024)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--report", choices=list(REPORTS), default="overview")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--writers", nargs="+", choices=list(WRITERS), default=list(WRITERS))
+    parser.add_argument("--memory", action="store_true", help="also trace peak Python memory (slower)")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds before a run is abandoned")
+    args = parser.parse_args()
+
+    print(f"{'rows':>7} {'writer':>10} {'tenders':>8} {'seconds':>9} {'peak MB':>8} {'file MB':>8}", flush=True)
+    for rows in args.rows:
+        for writer in args.writers:
+            pool = multiprocessing.Pool(1)
+            try:
+                result = pool.apply_async(_run, (args.report, writer, rows, args.memory)).get(args.timeout)
+            except multiprocessing.TimeoutError:
+                print(f"{rows:>7} {writer:>10} {'-':>8} {'>' + format(args.timeout, '.0f'):>9} {'-':>8} {'-':>8}", flush=True)
+                continue
+            finally:
+                pool.terminate()
+            peak = f"{result['peak_mb']:8.1f}" if result["peak_mb"] is not None else f"{'-':>8}"
+            print(
+                f"{rows:>7} {writer:>10} {result['tenders']:>8} {result['seconds']:>9.2f} {peak} {result['size_mb']:>8.1f}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
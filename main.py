@@ -2,18 +2,24 @@ import asyncio
 import json
 import os
 from dataclasses import asdict, is_dataclass
+from datetime import datetime, timedelta
 from enum import Enum
 
 from pydantic import BaseModel
 from dotenv import load_dotenv
-from pydantic_ai import BinaryContent
 load_dotenv()
 
 from src.services.get_info import get_info_from_tender_page, get_info_and_save
 from src.services.get_pdf import download_pdfs_from_tender_page
-from src.services.get_tenders import fetch_tender_infos
+from src.services.get_tenders import fetch_tender_infos_for_dates
+from src.services.http_client import close_session
+from src.services.browser_pool import close_browser_pool
+from src.services.request_policy import RequestStats
 from src.logger import logger
+from src.progress import ProgressTracker
 from src.agent.agent import AgentProcessor
+from src.agent.pdf_input import PdfInputLayer
+from src.dependencies import get_classification_cache_repository
 from schemas.lvl_schema import TenderOverview, TenderOverviewConfig, TenderOverviewAgent, dict_of_level
 from schemas.pdf_schema import PDFOverview, PDFFoodOverview, PDFOverviewConfig, PDFOverviewAgent, PDFFoodOverviewAgent, FoodCategory
 
@@ -32,34 +38,143 @@ def _json_default(value):
         return list(value)
     raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
-async def main(output_name: str = "tender_overviews", start_date: str = "2026-01-02", end_date: str = "2026-01-02"):
-    logger.info(f"Starting tender processing from {start_date} to {end_date}")
-    logger.info(f"Output will be saved as: {output_name}")
-    config = TenderOverviewConfig()
-    agent = TenderOverviewAgent(config)
-    processor = AgentProcessor(agent)
-    overviews = []
-    infos = []
-    
+PDF_DOWNLOAD_CONCURRENCY = int(os.getenv("PDF_DOWNLOAD_CONCURRENCY", "3"))
+PDF_ANALYSIS_CONCURRENCY = int(os.getenv("PDF_ANALYSIS_CONCURRENCY", "2"))
+
+SPECIFIC_CATEGORIES = [
+    "G07",
+    "S10",
+    "S11",
+    "S12",
+    "S13",
+    "S14",
+    "S15",
+    "S16",
+]
+
+
+def publish_date_range(start_date: str, end_date: str) -> list[str]:
+    """Every publish date from start_date to end_date inclusive (YYYY-MM-DD)."""
     publish_dates = []
     current_date = start_date
-    from datetime import datetime, timedelta
     end_date_obj = datetime.strptime(end_date, "%Y-%m-%d")
     while current_date <= end_date_obj.strftime("%Y-%m-%d"):
         publish_dates.append(current_date)
         current_date_obj = datetime.strptime(current_date, "%Y-%m-%d") + timedelta(days=1)
         current_date = current_date_obj.strftime("%Y-%m-%d")
+    return publish_dates
+
+
+def save_json(path: str, data, **kwargs):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4, **kwargs)
+
+
+def build_overview(result: TenderOverview, info: dict) -> dict:
+    """Flatten a classification result and its scraped tender info into a report row."""
+    # Handle None values for categories
+    tender_category = result.tender_category if result.tender_category is not None else []
+    tender_category_detail = result.tender_category_detail if result.tender_category_detail is not None else []
+    
+    return {
+        "name": result.name,
+        "selection_number": result.selection_number,
+        "ordering_organization": result.ordering_organization,
+        "announced_date": result.announced_date,
+        "deadline_date": result.deadline_date,
+        "official_link": info.get("official_link", ""),
+        "total_budget": result.total_budget,
+        "budget_type": result.budget_type,
+        "tender_type": dict_of_level.get(result.tender_type, result.tender_type),
+        "summary": result.summary,
+        "level1": result.tender_type,
+        "tender_category": [dict_of_level.get(t, "") for t in tender_category],
+        "level2": tender_category,
+        "tender_category_detail": [dict_of_level.get(t, "") for t in tender_category_detail],
+        "level3": tender_category_detail,
+        # "code_index" rows were guessed from the nearest codes after the model failed
+        "classification_source": "code_index" if result.is_fallback else "model",
+        "body": info.get("body", "")
+    }
+
+
+def is_specific_overview(overview: dict) -> bool:
+    """Whether a tender needs PDF analysis: a specific category, and G07 only for detail G07_007.
+
+    Code-index fallback rows are never analyzed; their categories are only a guess.
+    """
+    if overview.get("classification_source") == "code_index":
+        return False
+    level2 = overview.get("level2", [])
+    if not any(cat in level2 for cat in SPECIFIC_CATEGORIES):
+        return False
+    return not ("G07" in level2 and "G07_007" not in overview.get("level3", []))
+
+
+def is_food_overview(overview: dict) -> bool:
+    return "G07" in overview.get("level2", [])
+
+
+async def analyze_pdf_overview(
+    overview: dict,
+    food_processor: AgentProcessor,
+    software_processor: AgentProcessor,
+    pdf_inputs: PdfInputLayer | None = None,
+) -> dict | None:
+    """Run the food or software PDF agent over a tender's downloaded PDFs."""
+    if is_food_overview(overview):
+        processor, kind, main_category = food_processor, "food", "Нарийн хүнсний ногоо нийлүүлэл"
+    else:
+        processor, kind, main_category = software_processor, "software", "Программ, систем хөгжүүлэлт"
+
+    if pdf_inputs is None:
+        pdf_inputs = PdfInputLayer(PDFOverviewConfig().model_name)
+    # Uploaded handles (or budgeted inline bytes) live only for the duration of the call
+    async with pdf_inputs.open(overview.get("pdf_paths", [])) as inputs:
+        result = await processor.process(inputs)
+        used_text = any(isinstance(item, str) for item in inputs)
+    if not result and used_text:
+        logger.info(f"Retrying {kind} tender with whole PDFs: {overview.get('name', 'N/A')}")
+        async with pdf_inputs.open(overview.get("pdf_paths", []), allow_text=False) as inputs:
+            result = await processor.process(inputs)
+    logger.debug(f"AI analysis completed for {kind} tender")
+    if not result:
+        logger.warning(f"No result from AI analysis for {kind} tender: {overview.get('name', 'N/A')}")
+        return None
+
+    logger.info(f"Successfully processed {kind} tender with {len(result.parts) if result.parts else 0} parts")
+    return {
+        **overview,
+        "have_parts": result.have_parts,
+        "parts": [p.model_dump() if hasattr(p, 'model_dump') else p for p in result.parts] if result.parts else [],
+        "requirements": result.requirements.model_dump() if hasattr(result.requirements, 'model_dump') else result.requirements,
+        "main_category": main_category
+    }
+
+
+async def main(output_name: str = "tender_overviews", start_date: str = "2026-01-02", end_date: str = "2026-01-02"):
+    logger.info(f"Starting tender processing from {start_date} to {end_date}")
+    logger.info(f"Output will be saved as: {output_name}")
+    config = TenderOverviewConfig()
+    agent = TenderOverviewAgent(config)
+    cache = get_classification_cache_repository(agent.full_system_prompt, config.model_name)
+    processor = AgentProcessor(agent, cache=cache)
+    overviews = []
+    request_stats = RequestStats()
+    
+    publish_dates = publish_date_range(start_date, end_date)
 
     logger.info(f"Processing {len(publish_dates)} dates: {publish_dates}")
-    for publish_date in publish_dates:
-        tender_infos = await fetch_tender_infos(publish_date)
-        infos.extend(tender_infos)
-        logger.info(f"Fetched {len(tender_infos)} tender infos for date: {publish_date}")
+    infos = await fetch_tender_infos_for_dates(publish_dates, request_stats=request_stats)
     logger.info(f"Total infos collected: {len(infos)}")
+    request_stats.log_report("tender listing")
 
     logger.info("Processing tender infos to generate overviews")
     logger.info(f"Processing {len(infos)} tender infos using AI agent")
-    results = await processor.process_batch(infos)
+    try:
+        results = await processor.process_batch(infos)
+    finally:
+        cache.close()
     
     if results is None:
         logger.warning("AI agent returned None results")
@@ -67,6 +182,7 @@ async def main(output_name: str = "tender_overviews", start_date: str = "2026-01
     
     if results:
         logger.info(f"Successfully processed {len(results)} tender overviews")
+        # process_batch returns one result per input, matched by item_id, so positions line up
         for result, info in zip(results, infos):
             # Skip None results from failed batch chunks
             if result is None:
@@ -75,175 +191,112 @@ async def main(output_name: str = "tender_overviews", start_date: str = "2026-01
                 
             logger.debug(f"Matched result for tender: {result.name}")
             logger.debug(f"Official link: {info.get('official_link', '')}")
-            
-            # Handle None values for categories
-            tender_category = result.tender_category if result.tender_category is not None else []
-            tender_category_detail = result.tender_category_detail if result.tender_category_detail is not None else []
-            
-            overview = {
-                "name": result.name,
-                "selection_number": result.selection_number,
-                "ordering_organization": result.ordering_organization,
-                "announced_date": result.announced_date,
-                "deadline_date": result.deadline_date,
-                "official_link": info.get("official_link", ""),
-                "total_budget": result.total_budget,
-                "budget_type": result.budget_type,
-                "tender_type": dict_of_level.get(result.tender_type, result.tender_type),
-                "summary": result.summary,
-                "level1": result.tender_type,
-                "tender_category": [dict_of_level.get(t, "") for t in tender_category],
-                "level2": tender_category,
-                "tender_category_detail": [dict_of_level.get(t, "") for t in tender_category_detail],
-                "level3": tender_category_detail,
-                "body": info.get("body", "")
-            }
+            overview = build_overview(result, info)
             overviews.append(overview)
 
     
         #save overviews to json file
         logger.info(f"Saving {len(overviews)} overviews to tender_data/{output_name}.json")
-        with open(f"tender_data/{output_name}.json", "w", encoding="utf-8") as f:
-            json.dump(overviews, f, ensure_ascii=False, indent=4)
+        save_json(f"tender_data/{output_name}.json", overviews)
         logger.info(f"Successfully saved overviews to file")
     logger.info(f"Main processing completed. Total overviews: {len(overviews)}")
     return overviews
 
     
 async def specific_pdf_download(overviews: list[dict], output_name: str):
+    """Download PDFs for the specific-category tenders, then analyze them with the food/software agents.
+
+    Downloads run PDF_DOWNLOAD_CONCURRENCY at a time; the food and software analyses run in
+    parallel, each with PDF_ANALYSIS_CONCURRENCY LLM calls in flight.
+    """
 
     logger.info(f"Starting specific PDF download process for {len(overviews)} overviews")
-    #specific categories to analize pdf
-    category_list = [
-        "G07",
-        "S10",
-        "S11",
-        "S12",
-        "S13",
-        "S14",
-        "S15",
-        "S16",
-    ]
-    logger.debug(f"Target categories: {', '.join(category_list)}")
-    filtered_overviews = [overview for overview in overviews if any(cat in overview.get("level2", []) for cat in category_list)]
+    logger.debug(f"Target categories: {', '.join(SPECIFIC_CATEGORIES)}")
+    filtered_overviews = [overview for overview in overviews if is_specific_overview(overview)]
     logger.info(f"Filtered overviews count for specific categories: {len(filtered_overviews)}")
-    #additional filter only on G07 detail 007
-    initial_count = len(filtered_overviews)
-    filtered_overviews = [
-        overview for overview in filtered_overviews
-        if not ("G07" in overview.get("level2", []) and "G07_007" not in overview.get("level3", []))
-    ]
-    if len(filtered_overviews) < initial_count:
-        logger.info(f"Applied G07 detail filter: removed {initial_count - len(filtered_overviews)} overviews")
     
     #save pdfs
-    logger.info(f"Downloading PDFs for {len(filtered_overviews)} tenders")
-    pdf_download_count = 0
-    for idx, overview in enumerate(filtered_overviews, 1):
+    logger.info(
+        f"Downloading PDFs for {len(filtered_overviews)} tenders (concurrency={PDF_DOWNLOAD_CONCURRENCY})"
+    )
+    request_stats = RequestStats()
+    download_semaphore = asyncio.Semaphore(PDF_DOWNLOAD_CONCURRENCY)
+    download_progress = ProgressTracker("PDF download", len(filtered_overviews))
+
+    async def download_one(overview: dict):
         official_link = overview.get("official_link", "")
         if not official_link:
-            logger.warning(f"Tender [{idx}/{len(filtered_overviews)}] has no official link, skipping PDF download")
-            continue
-        logger.info(f"[{idx}/{len(filtered_overviews)}] Processing tender: {overview.get('name', 'N/A')}")
-        pdf_paths = await download_pdfs_from_tender_page(official_link)
+            logger.warning(f"Tender {overview.get('name', 'N/A')} has no official link, skipping PDF download")
+            download_progress.advance(succeeded=False, item=overview.get("name", "N/A"))
+            return
+        async with download_semaphore:
+            try:
+                pdf_paths = await download_pdfs_from_tender_page(official_link, request_stats)
+            except Exception as e:
+                logger.error(f"PDF download failed for {official_link}: {e}")
+                pdf_paths = []
         overview["pdf_paths"] = pdf_paths
-        pdf_download_count += len(pdf_paths)
-        logger.info(f"Downloaded {len(pdf_paths)} PDFs for tender: {overview.get('name', '')}")
+        download_progress.advance(succeeded=bool(pdf_paths), item=f"{len(pdf_paths)} PDFs for {overview.get('name', '')}")
+
+    await asyncio.gather(*(download_one(overview) for overview in filtered_overviews))
+    pdf_download_count = sum(len(overview.get("pdf_paths", [])) for overview in filtered_overviews)
     logger.info(f"Total PDFs downloaded: {pdf_download_count}")
+    request_stats.log_report("PDF pages")
     #save filtered overviews with pdf paths to json file
     logger.info("Saving filtered overviews with PDF info to file")
-    with open(f"tender_data/{output_name}_pdfs.json", "w", encoding="utf-8") as f:
-        json.dump(filtered_overviews, f, ensure_ascii=False, indent=4)
+    save_json(f"tender_data/{output_name}_pdfs.json", filtered_overviews)
     logger.info("Filtered overviews saved successfully")
 
     
-    food_overviews = []
-    software_overviews = []
-    for overview in filtered_overviews:
-        if "G07" in overview.get("level2", []):
-            food_overviews.append(overview)
-        else:
-            software_overviews.append(overview)
-    
+    food_overviews = [overview for overview in filtered_overviews if is_food_overview(overview)]
+    software_overviews = [overview for overview in filtered_overviews if not is_food_overview(overview)]
     logger.info(f"Categorized: {len(food_overviews)} food tenders, {len(software_overviews)} software tenders")
     
-    pdf_results = []
-
-    #process food overviews
-    if food_overviews:
-        logger.info(f"Processing {len(food_overviews)} food tenders with AI agent")
-        food_config = PDFOverviewConfig()
-        food_agent = PDFFoodOverviewAgent(food_config)
-        food_processor = AgentProcessor(food_agent)
-        #get pdfs from overviews
-
-        for idx, overview in enumerate(food_overviews, 1):
-            logger.info(f"[{idx}/{len(food_overviews)}] Analyzing food tender: {overview.get('name', 'N/A')}")
-            inputs = []
-            pdf_paths = overview.get("pdf_paths", [])
-            for pdf_path in pdf_paths:
-                with open(pdf_path, "rb") as f:
-                    pdf_content = f.read()
-                inputs.append(BinaryContent(pdf_content, media_type="application/pdf"))
-
-            food_result = await food_processor.process(inputs)
-            logger.debug(f"AI analysis completed for food tender")
-
-            if not food_result:
-                logger.warning(f"No result from AI analysis for food tender: {overview.get('name', 'N/A')}")
-                continue
+    food_processor = AgentProcessor(PDFFoodOverviewAgent(PDFOverviewConfig()))
+    software_processor = AgentProcessor(PDFOverviewAgent(PDFOverviewConfig()))
+    pdf_inputs = PdfInputLayer(PDFOverviewConfig().model_name)
 
-            overview_data = {
-                **overview,
-                "have_parts": food_result.have_parts,
-                "parts": [p.model_dump() if hasattr(p, 'model_dump') else p for p in food_result.parts] if food_result.parts else [],
-                "requirements": food_result.requirements.model_dump() if hasattr(food_result.requirements, 'model_dump') else food_result.requirements,
-                "main_category": "Нарийн хүнсний ногоо нийлүүлэл"
-            }
-            pdf_results.append(overview_data)
-            logger.info(f"Successfully processed food tender with {len(food_result.parts) if food_result.parts else 0} parts")
-    
-    if software_overviews:
-        logger.info(f"Processing {len(software_overviews)} software tenders with AI agent")
-        software_config = PDFOverviewConfig()
-        software_agent = PDFOverviewAgent(software_config)
-        software_processor = AgentProcessor(software_agent)
-        #get pdfs from overviews
-
-        for idx, overview in enumerate(software_overviews, 1):
-            logger.info(f"[{idx}/{len(software_overviews)}] Analyzing software tender: {overview.get('name', 'N/A')}")
-            inputs = []
-            pdf_paths = overview.get("pdf_paths", [])
-            for pdf_path in pdf_paths:
-                with open(pdf_path, "rb") as f:
-                    pdf_content = f.read()
-                inputs.append(BinaryContent(pdf_content, media_type="application/pdf"))
-
-            software_result = await software_processor.process(inputs)
-            if not software_result:
-                logger.warning(f"No result from AI analysis for software tender: {overview.get('name', 'N/A')}")
-                continue
+    async def analyze_track(label: str, track_overviews: list[dict]) -> list[dict]:
+        # Each track has its own LLM limit so a long food backlog never starves software tenders
+        semaphore = asyncio.Semaphore(PDF_ANALYSIS_CONCURRENCY)
+        progress = ProgressTracker(label, len(track_overviews))
+
+        async def analyze_one(overview: dict):
+            async with semaphore:
+                try:
+                    overview_data = await analyze_pdf_overview(overview, food_processor, software_processor, pdf_inputs)
+                except Exception as e:
+                    logger.error(f"PDF analysis failed for {overview.get('name', 'N/A')}: {e}")
+                    overview_data = None
+            progress.advance(succeeded=overview_data is not None, item=overview.get("name", "N/A"))
+            return overview_data
+
+        results = await asyncio.gather(*(analyze_one(overview) for overview in track_overviews))
+        return [result for result in results if result]
 
-            #save software results
-            overview_data = {
-                **overview,
-                "have_parts": software_result.have_parts,
-                "parts": [p.model_dump() if hasattr(p, 'model_dump') else p for p in software_result.parts] if software_result.parts else [],
-                "requirements": software_result.requirements.model_dump() if hasattr(software_result.requirements, 'model_dump') else software_result.requirements,
-                "main_category": "Программ, систем хөгжүүлэлт"
-            }
-            pdf_results.append(overview_data)
-            logger.info(f"Successfully processed software tender with {len(software_result.parts) if software_result.parts else 0} parts")
+    food_results, software_results = await asyncio.gather(
+        analyze_track("Food PDF analysis", food_overviews),
+        analyze_track("Software PDF analysis", software_overviews),
+    )
+    pdf_results = food_results + software_results
+    pdf_inputs.log_report("specific PDF analysis")
 
     logger.info(f"PDF processing completed. Total results: {len(pdf_results)}")
     #save pdf results to json file
     logger.info(f"Saving PDF analysis results to tender_data/{output_name}.json")
-    with open(f"tender_data/{output_name}.json", "w", encoding="utf-8") as f:
-        json.dump(pdf_results, f, ensure_ascii=False, indent=4, default=_json_default)
+    save_json(f"tender_data/{output_name}.json", pdf_results, default=_json_default)
     logger.info("PDF results saved successfully")
 
     return pdf_results
     
     
+async def _run_cli():
+    try:
+        await main()
+    finally:
+        await close_browser_pool()
+        await close_session()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(_run_cli())
\ No newline at end of file
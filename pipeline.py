@@ -0,0 +1,317 @@
+import os
+import time
+import asyncio
+import inspect
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, List, Optional
+
+from pydantic import BaseModel, Field
+
+from main import (
+    _json_default,
+    analyze_pdf_overview,
+    build_overview,
+    is_specific_overview,
+    publish_date_range,
+    save_json,
+)
+from src.agent.agent import AgentProcessor
+from src.agent.pdf_input import PdfInputLayer
+from src.dependencies import get_classification_cache_repository, get_tender_cache_repository
+from src.logger import logger
+from src.services.get_pdf import download_pdfs_from_tender_page
+from src.services.get_tenders import (
+    TENDER_FETCH_CONCURRENCY,
+    document_id_stats,
+    fetch_tender_detail,
+    fetch_tender_listing,
+    log_fetch_stats,
+)
+from src.services.request_policy import RequestStats
+from schemas.lvl_schema import TenderOverviewConfig, TenderOverviewAgent
+from schemas.pdf_schema import PDFOverviewConfig, PDFOverviewAgent, PDFFoodOverviewAgent
+
+
+class PipelineConfig(BaseModel):
+    """Worker counts and queue bounds for each pipeline stage."""
+    list_workers: int = Field(
+        default=int(os.getenv("PIPELINE_LIST_WORKERS", "4")),
+        description="Publish dates listed at once.",
+    )
+    detail_workers: int = Field(
+        default=int(os.getenv("PIPELINE_DETAIL_WORKERS", "10")),
+        description="Tenders whose detail page is resolved at once (browser use is further bounded by TENDER_FETCH_CONCURRENCY).",
+    )
+    classify_workers: int = Field(
+        default=int(os.getenv("PIPELINE_CLASSIFY_WORKERS", "2")),
+        description="Classification micro-batches in flight at once.",
+    )
+    classify_batch_size: int = Field(
+        default=int(os.getenv("PIPELINE_CLASSIFY_BATCH_SIZE", "20")),
+        description="Tenders collected into one classification micro-batch.",
+    )
+    classify_flush_seconds: float = Field(
+        default=float(os.getenv("PIPELINE_CLASSIFY_FLUSH_SECONDS", "5")),
+        description="Send a partial micro-batch when no new tender arrives for this long.",
+    )
+    download_workers: int = Field(
+        default=int(os.getenv("PIPELINE_DOWNLOAD_WORKERS", "3")),
+        description="Tenders whose PDFs are downloaded at once.",
+    )
+    analyze_workers: int = Field(
+        default=int(os.getenv("PIPELINE_ANALYZE_WORKERS", "2")),
+        description="Tenders whose PDFs are analyzed by the LLM at once.",
+    )
+    queue_size: int = Field(
+        default=int(os.getenv("PIPELINE_QUEUE_SIZE", "50")),
+        description="Capacity of each inter-stage queue; a full queue pauses the stage feeding it.",
+    )
+
+
+@dataclass
+class PipelineResult:
+    overviews: List[dict] = field(default_factory=list)
+    filtered_overviews: List[dict] = field(default_factory=list)
+    pdf_results: List[dict] = field(default_factory=list)
+    stage_stats: dict = field(default_factory=dict)
+
+
+# Marks the end of a stage's input; each worker passes it on to its siblings
+_DONE = object()
+
+OverviewsHook = Callable[[List[dict]], Any | Awaitable[Any]]
+ProgressHook = Callable[[dict], None]
+
+
+async def _run_stage(
+    name: str,
+    workers: int,
+    inbox: asyncio.Queue,
+    handler: Callable[[Any], Awaitable[None]],
+    outbox: Optional[asyncio.Queue],
+    stats: dict,
+    on_progress: Optional[ProgressHook] = None,
+):
+    """Run `workers` copies of `handler` over `inbox` until it is drained, then close `outbox`.
+
+    `on_progress` is called with `stats` after every item.
+    """
+    stage_stats = stats.setdefault(name, Counter())
+
+    async def worker():
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                inbox.put_nowait(_DONE)
+                return
+            started = time.perf_counter()
+            try:
+                await handler(item)
+                stage_stats["processed"] += 1
+            except Exception as e:
+                stage_stats["failed"] += 1
+                logger.error(f"Pipeline stage '{name}' failed on an item: {e}", exc_info=True)
+            finally:
+                stage_stats["busy_seconds"] += time.perf_counter() - started
+                if on_progress is not None:
+                    on_progress(stats)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+    stage_stats["finished_at"] = time.perf_counter() - started
+    if outbox is not None:
+        await outbox.put(_DONE)
+
+
+async def _batch_items(inbox: asyncio.Queue, outbox: asyncio.Queue, size: int, flush_seconds: float):
+    """Group single items into lists of up to `size`, flushing early when input goes quiet."""
+    batch = []
+    while True:
+        try:
+            item = await asyncio.wait_for(inbox.get(), timeout=flush_seconds if batch else None)
+        except asyncio.TimeoutError:
+            await outbox.put(batch)
+            batch = []
+            continue
+        if item is _DONE:
+            break
+        batch.append(item)
+        if len(batch) >= size:
+            await outbox.put(batch)
+            batch = []
+    if batch:
+        await outbox.put(batch)
+    await outbox.put(_DONE)
+
+
+def _ordered(items: List[tuple]) -> List[dict]:
+    return [value for _, value in sorted(items, key=lambda pair: pair[0])]
+
+
+async def run_pipeline(
+    start_date: str,
+    end_date: str,
+    output_name: str,
+    pdf_output_name: Optional[str] = None,
+    on_overviews_ready: Optional[OverviewsHook] = None,
+    config: Optional[PipelineConfig] = None,
+    on_progress: Optional[ProgressHook] = None,
+) -> PipelineResult:
+    """Stream tenders through list -> detail -> classify -> filter -> download PDF -> analyze PDF.
+
+    Stages are connected by bounded queues and run concurrently, so scraping, classification
+    and PDF work overlap. `on_overviews_ready` is called with every classified overview as
+    soon as classification finishes, while PDF stages keep running. PDF stages are skipped
+    when `pdf_output_name` is None. Outputs are written to the same JSON files as
+    `main.main` and `main.specific_pdf_download`. `on_progress` receives the per-stage
+    counters after every processed item.
+    """
+    config = config or PipelineConfig()
+    run_started = time.perf_counter()
+    with_pdfs = pdf_output_name is not None
+    publish_dates = publish_date_range(start_date, end_date)
+    logger.info(f"Starting pipeline for {len(publish_dates)} dates: {publish_dates}")
+    request_stats = RequestStats()
+
+    agent_config = TenderOverviewConfig()
+    agent = TenderOverviewAgent(agent_config)
+    cache = get_classification_cache_repository(agent.full_system_prompt, agent_config.model_name)
+    processor = AgentProcessor(agent, cache=cache)
+    if with_pdfs:
+        food_processor = AgentProcessor(PDFFoodOverviewAgent(PDFOverviewConfig()))
+        software_processor = AgentProcessor(PDFOverviewAgent(PDFOverviewConfig()))
+        pdf_inputs = PdfInputLayer(PDFOverviewConfig().model_name)
+
+    dates_queue: asyncio.Queue = asyncio.Queue()
+    for date_index, publish_date in enumerate(publish_dates):
+        dates_queue.put_nowait((date_index, publish_date))
+    dates_queue.put_nowait(_DONE)
+    items_queue: asyncio.Queue = asyncio.Queue(config.queue_size)
+    infos_queue: asyncio.Queue = asyncio.Queue(config.queue_size)
+    batches_queue: asyncio.Queue = asyncio.Queue(max(1, config.classify_workers))
+    filter_queue: Optional[asyncio.Queue] = asyncio.Queue(config.queue_size) if with_pdfs else None
+    download_queue: asyncio.Queue = asyncio.Queue(config.queue_size)
+    analyze_queue: asyncio.Queue = asyncio.Queue(config.queue_size)
+
+    stage_names = ["list", "detail", "classify"] + (["filter", "download", "analyze"] if with_pdfs else [])
+    stats: dict = {name: Counter() for name in stage_names}
+    seen_invitations = set()
+    detail_stats: Counter = Counter()
+    detail_cache = get_tender_cache_repository()
+    browser_semaphore = asyncio.Semaphore(TENDER_FETCH_CONCURRENCY)
+    overviews: List[tuple] = []
+    filtered_overviews: List[tuple] = []
+    pdf_results: List[tuple] = []
+    result = PipelineResult(stage_stats=stats)
+
+    async def list_dates(entry):
+        date_index, publish_date = entry
+        items = await fetch_tender_listing(publish_date)
+        logger.info(f"Listed {len(items)} tenders for date: {publish_date}")
+        for position, item in enumerate(items):
+            key = item.get("invitationId") or f"tender:{item.get('tenderId')}"
+            if key in seen_invitations:
+                stats["list"]["duplicates"] += 1
+                continue
+            seen_invitations.add(key)
+            # (date index, position) keeps the final output in listing order
+            await items_queue.put(((date_index, position), item))
+
+    async def scrape_detail(entry):
+        seq, item = entry
+        info = await fetch_tender_detail(item, browser_semaphore, detail_cache, detail_stats, request_stats)
+        await infos_queue.put((seq, info))
+
+    async def classify(batch):
+        seqs = [seq for seq, _ in batch]
+        infos = [info for _, info in batch]
+        results = await processor.process_batch(infos) or []
+        for seq, classification, info in zip(seqs, results, infos):
+            if classification is None:
+                logger.warning(f"Skipping None result for tender: {info.get('official_link', 'unknown')}")
+                continue
+            overview = build_overview(classification, info)
+            overviews.append((seq, overview))
+            if filter_queue is not None:
+                await filter_queue.put((seq, overview))
+
+    async def filter_specific(entry):
+        seq, overview = entry
+        if is_specific_overview(overview):
+            filtered_overviews.append(entry)
+            await download_queue.put(entry)
+
+    async def download_pdfs(entry):
+        seq, overview = entry
+        official_link = overview.get("official_link", "")
+        if official_link:
+            logger.info(f"Downloading PDFs for tender: {overview.get('name', 'N/A')}")
+            overview["pdf_paths"] = await download_pdfs_from_tender_page(official_link, request_stats)
+            stats["download"]["pdfs"] += len(overview["pdf_paths"])
+        else:
+            logger.warning(f"Tender {overview.get('name', 'N/A')} has no official link, skipping PDF download")
+        await analyze_queue.put(entry)
+
+    async def analyze_pdfs(entry):
+        seq, overview = entry
+        overview_data = await analyze_pdf_overview(overview, food_processor, software_processor, pdf_inputs)
+        if overview_data:
+            pdf_results.append((seq, overview_data))
+
+    async def classification_stages():
+        await asyncio.gather(
+            _run_stage("list", config.list_workers, dates_queue, list_dates, items_queue, stats, on_progress),
+            _run_stage("detail", config.detail_workers, items_queue, scrape_detail, infos_queue, stats, on_progress),
+            _batch_items(infos_queue, batches_queue, max(1, config.classify_batch_size), config.classify_flush_seconds),
+            _run_stage("classify", config.classify_workers, batches_queue, classify, filter_queue, stats, on_progress),
+        )
+        document_id_stats.update(detail_stats)
+        log_fetch_stats(f"{start_date}..{end_date}", detail_stats)
+        result.overviews = _ordered(overviews)
+        logger.info(
+            f"Pipeline classified {len(result.overviews)} tenders in {time.perf_counter() - run_started:.1f}s"
+        )
+        if result.overviews:
+            save_json(f"tender_data/{output_name}.json", result.overviews)
+        if on_overviews_ready is not None:
+            hook_result = on_overviews_ready(result.overviews)
+            if inspect.isawaitable(hook_result):
+                await hook_result
+
+    async def pdf_stages():
+        await asyncio.gather(
+            _run_stage("filter", 1, filter_queue, filter_specific, download_queue, stats, on_progress),
+            _run_stage("download", config.download_workers, download_queue, download_pdfs, analyze_queue, stats, on_progress),
+            _run_stage("analyze", config.analyze_workers, analyze_queue, analyze_pdfs, None, stats, on_progress),
+        )
+        result.filtered_overviews = _ordered(filtered_overviews)
+        result.pdf_results = _ordered(pdf_results)
+        pdf_inputs.log_report("pipeline")
+        save_json(f"tender_data/{pdf_output_name}_pdfs.json", result.filtered_overviews)
+        save_json(f"tender_data/{pdf_output_name}.json", result.pdf_results, default=_json_default)
+
+    tasks = [asyncio.create_task(classification_stages())]
+    if with_pdfs:
+        tasks.append(asyncio.create_task(pdf_stages()))
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    finally:
+        detail_cache.close()
+        cache.close()
+
+    request_stats.log_report("pipeline")
+    for name, stage_stats in stats.items():
+        logger.info(
+            f"Pipeline stage '{name}': processed={stage_stats['processed']}, failed={stage_stats['failed']}, "
+            f"busy={stage_stats['busy_seconds']:.1f}s, done after {stage_stats['finished_at']:.1f}s"
+        )
+    logger.info(
+        f"Pipeline completed in {time.perf_counter() - run_started:.1f}s: {len(result.overviews)} overviews, "
+        f"{len(result.filtered_overviews)} specific tenders, {len(result.pdf_results)} PDF results"
+    )
+    return result
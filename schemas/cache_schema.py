@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from schemas.lvl_schema import TenderOverview
+
+
+class TenderDetailEntry(BaseModel):
+    """A cached tender detail body keyed by tenderDocumentId."""
+    document_id: str = Field(..., description="tenderDocumentId used in DETAIL_URL.")
+    invitation_id: Optional[str] = Field(None, description="invitationId of the listing that points at this document.")
+    detail_url: str = Field("", description="DETAIL_URL the body was fetched from.")
+    raw_body: str = Field("", description="Raw HTML body returned by the detail API.")
+    markdown: str = Field("", description="markdownify conversion of raw_body.")
+    etag: Optional[str] = Field(None, description="ETag validator from the last 200 response.")
+    last_modified: Optional[str] = Field(None, description="Last-Modified validator from the last 200 response.")
+    fetched_at: datetime = Field(default_factory=datetime.utcnow, description="When the body was last downloaded.")
+    validated_at: datetime = Field(default_factory=datetime.utcnow, description="When the body was last confirmed current.")
+
+    model_config = {"from_attributes": True}
+
+
+class ClassificationEntry(BaseModel):
+    """A cached classification under its `ClassificationCacheRepository.make_key` key."""
+    key: str = Field(..., description="Hash of the input, system prompt and model.")
+    overview: TenderOverview = Field(..., description="Validated classification for that input.")
+
+
+class PdfManifestEntry(BaseModel):
+    """Maps a tender attachment URL to its SHA-256 entry in the PDF store."""
+    tender_number: str = Field(..., description="Invitation number taken from the tender page URL.")
+    url: str = Field(..., description="Attachment URL as linked from the tender page.")
+    sha256: str = Field(..., description="SHA-256 of the file contents; names the store entry.")
+    size: int = Field(..., description="File size in bytes.")
+    etag: Optional[str] = Field(None, description="ETag validator from the last 200 response.")
+    last_modified: Optional[str] = Field(None, description="Last-Modified validator from the last 200 response.")
+    fetched_at: datetime = Field(default_factory=datetime.utcnow, description="When the file was last downloaded.")
+    validated_at: datetime = Field(default_factory=datetime.utcnow, description="When the file was last confirmed current.")
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,46 @@
+from datetime import datetime
+from enum import Enum
+from typing import Iterable, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobEntry(BaseModel):
+    """One submitted processing run and its state in the job table."""
+    id: str = Field(..., description="Job ID returned on submission.")
+    kind: str = Field(..., description="Registered handler that runs the job, e.g. process_tenders.")
+    date_from: str = Field(..., description="First publish date covered (YYYY-MM-DD).")
+    date_to: str = Field(..., description="Last publish date covered (YYYY-MM-DD).")
+    formats: List[str] = Field(default_factory=list, description="Extra export formats to write, e.g. parquet or csv.")
+    status: JobStatus = Field(JobStatus.QUEUED, description="Current job state.")
+    progress: dict = Field(default_factory=dict, description="Latest progress snapshot reported by the handler.")
+    result: Optional[dict] = Field(None, description="Handler result once the job has succeeded.")
+    error: Optional[str] = Field(None, description="Error message once the job has failed.")
+    attempts: int = Field(0, description="Times the job has been started, including resumes after a restart.")
+    created_at: datetime = Field(default_factory=datetime.utcnow, description="When the job was submitted.")
+    started_at: Optional[datetime] = Field(None, description="When the latest attempt started.")
+    finished_at: Optional[datetime] = Field(None, description="When the job succeeded or failed.")
+
+    @property
+    def dedup_key(self) -> str:
+        return job_dedup_key(self.kind, self.date_from, self.date_to, self.formats)
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+def job_dedup_key(kind: str, date_from: str, date_to: str, formats: Iterable[str] = ()) -> str:
+    """Submissions sharing this key while one is queued or running coalesce into that job.
+
+    Export formats are part of the key, so a request for other formats isn't answered by a job
+    that won't write them.
+    """
+    return f"{kind}:{date_from}:{date_to}:{','.join(sorted(set(formats)))}"
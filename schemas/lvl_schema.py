@@ -1,7 +1,19 @@
-from pydantic import BaseModel, Field
+import os
+import time
+import asyncio
+from collections import Counter
+from pydantic import BaseModel, Field, PrivateAttr
+from dataclasses import dataclass
 from typing import List, Optional
 from enum import Enum
-from pydantic_ai import Agent
+from pydantic_ai import Agent, NativeOutput
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+
+from src.agent.code_index import CodeCandidates, get_code_index
+from src.agent.prompt_cache import PromptCache, get_prompt_cache
+from src.agent.keyword_scorer import KeywordMatch, KeywordScorer
+from src.agent.rate_limiter import RateLimiter, estimate_tokens
+from src.logger import logger
 
 dict_of_level = {
     "WORKS": "Works",
@@ -977,8 +989,12 @@ class TenderCategoryItem(str, Enum):
         }
         return descriptions.get(self, "No description available")
 
-def build_code_reference() -> str:
-    """Build a textual catalog of all codes and their descriptions for the LLM."""
+def build_code_reference(level2_codes: Optional[set[str]] = None) -> str:
+    """Build a textual catalog of all codes and their descriptions for the LLM.
+
+    With `level2_codes`, level-3 codes are listed only for those branches (plus Other);
+    the type and level-2 lists are always complete.
+    """
     lines: list[str] = []
 
     lines.append("Tender type codes:")
@@ -991,10 +1007,22 @@ def build_code_reference() -> str:
 
     lines.append("\nLevel-3 detail codes:")
     for item in TenderCategoryItem:
-        lines.append(f"- {item.value}: {item.description}")
+        if level2_codes is None or item.value == "Other" or item.value.split("_")[0] in level2_codes:
+            lines.append(f"- {item.value}: {item.description}")
 
     return "\n".join(lines)
 
+def build_code_catalog() -> list[tuple[str, Optional[str], str]]:
+    """(code, parent level-2 code, description) for every level-2 and level-3 code except Other."""
+    catalog: list[tuple[str, Optional[str], str]] = []
+    for c in TenderCategory:
+        if c.value != "Other":
+            catalog.append((c.value, None, c.description))
+    for item in TenderCategoryItem:
+        if item.value != "Other":
+            catalog.append((item.value, item.value.split("_")[0], item.description))
+    return catalog
+
 class BudgetType(str, Enum):
     """Budget funding source classification"""
     STATE_BUDGET = "Төсвийн хөрөнгө"
@@ -1006,6 +1034,10 @@ class BudgetType(str, Enum):
 
 class TenderOverview(BaseModel):
     """Structured summary of a tender plus its classification choices and rationale."""
+    item_id: Optional[str] = Field(
+        None,
+        title="Copy the input item's item_id exactly; used to match each overview to its input.",
+    )
     summary: str = Field(
         ...,
         title="3-4 sentence Mongolian summary highlighting scope, buyer, key dates, and what is being procured.",
@@ -1041,6 +1073,18 @@ class TenderOverview(BaseModel):
         min_length=1,
         title="Specific level-3 item codes that precisely describe what is being procured (at least one code).",
     )
+    # Set on overviews assigned by the code index after the model failed; never cached
+    _fallback: bool = PrivateAttr(default=False)
+    # Model that produced this overview; only the main model's results are cached
+    _produced_by: Optional[str] = PrivateAttr(default=None)
+
+    @property
+    def is_fallback(self) -> bool:
+        return self._fallback
+
+    @property
+    def produced_by(self) -> Optional[str]:
+        return self._produced_by
 
 class TenderOverviewConfig(BaseModel):
     """Model and prompt configuration for generating tender overviews."""
@@ -1091,6 +1135,93 @@ class TenderOverviewConfig(BaseModel):
         title="Model Name",
         description="The name of the language model to use for generating the tender overview.",
     )
+    max_concurrent_batches: int = Field(
+        default=4,
+        title="Max Concurrent Batches",
+        description="How many batch chunks may be in flight against the model at once.",
+    )
+    requests_per_minute: Optional[int] = Field(
+        default=150,
+        title="Requests Per Minute",
+        description="Provider request quota; None disables the request limit.",
+    )
+    tokens_per_minute: Optional[int] = Field(
+        default=2_000_000,
+        title="Tokens Per Minute",
+        description="Provider input-token quota (estimated); None disables the token limit.",
+    )
+    batch_token_budget: int = Field(
+        default=60_000,
+        title="Batch Token Budget",
+        description="Estimated input tokens of tender data packed into one batch request (system prompt excluded).",
+    )
+    batch_timeout_seconds: Optional[float] = Field(
+        default=300,
+        title="Batch Timeout Seconds",
+        description="A batch request running longer than this is split in half and retried; None disables the timeout.",
+    )
+    tiered: bool = Field(
+        default=os.getenv("TIERED_CLASSIFICATION", "0") in ("1", "true", "True"),
+        title="Tiered Classification",
+        description="Score tenders against the code catalog locally and send only ambiguous ones to `model_name`.",
+    )
+    fast_model_name: str = Field(
+        default=os.getenv("FAST_MODEL_NAME", "google-gla:gemini-2.5-flash"),
+        title="Fast Model Name",
+        description="Cheaper model used in tiered mode for tenders the keyword pass is confident about.",
+    )
+    tier_min_score: float = Field(
+        default=float(os.getenv("TIER_MIN_SCORE", "5.0")),
+        title="Tier Minimum Score",
+        description="Keyword score the best level-2 code needs for a tender to count as obvious.",
+    )
+    tier_min_margin: float = Field(
+        default=float(os.getenv("TIER_MIN_MARGIN", "0.35")),
+        title="Tier Minimum Margin",
+        description="Relative lead the best level-2 code needs over the runner-up for a tender to count as obvious.",
+    )
+    escalate_categories: List[str] = Field(
+        default=["G07", "S10", "S11", "S12", "S13", "S14", "S15", "S16"],
+        title="Escalate Categories",
+        description="Level-2 codes that drive the PDF stage; tenders touching them always go to `model_name`.",
+    )
+    trim_code_reference: bool = Field(
+        default=os.getenv("TRIM_CODE_REFERENCE", "0") in ("1", "true", "True"),
+        title="Trim Code Reference",
+        description="Send each batch only the level-3 branches its tenders are likely to need, picked by the code index.",
+    )
+    trim_candidates_per_tender: int = Field(
+        default=int(os.getenv("TRIM_CANDIDATES_PER_TENDER", "4")),
+        title="Trim Candidates Per Tender",
+        description="Nearest level-2 branches kept for each tender when trimming the code reference.",
+    )
+    context_cache: bool = Field(
+        default=True,
+        title="Context Cache",
+        description="Serve the static system prompt from a provider-side context cache (see PROMPT_CACHE); not used with trim_code_reference.",
+    )
+    index_fallback: bool = Field(
+        default=os.getenv("INDEX_FALLBACK", "0") in ("1", "true", "True"),
+        title="Index Fallback",
+        description=(
+            "Classify tenders the model failed on by their nearest codes in the local code index; such rows "
+            "carry classification_source=code_index and skip PDF analysis."
+        ),
+    )
+    index_fallback_min_score: float = Field(
+        default=0.15,
+        title="Index Fallback Minimum Score",
+        description="Cosine similarity the nearest level-2 code needs; below it the fallback assigns Other.",
+    )
+
+@dataclass
+class ModelTier:
+    """One model with its single and batch agents and its own provider quota."""
+    name: str
+    agent: Agent
+    batch_agent: Agent
+    rate_limiter: RateLimiter
+
 
 class TenderOverviewAgent:
     """Thin wrapper around `pydantic_ai.Agent` configured for tender overview generation."""
@@ -1098,50 +1229,394 @@ class TenderOverviewAgent:
     def __init__(self, config: TenderOverviewConfig):
         self.config = config
         # Enrich the system prompt with an explicit code/description reference
-        code_reference = build_code_reference()
-        full_system_prompt = f"{self.config.system_prompt}\n\n### Code reference catalog (types, level-2, level-3):\n{code_reference}"
-        self.agent = Agent(
-            model=self.config.model_name,
-            system_prompt=full_system_prompt,
-            output_type=TenderOverview,
+        self.code_reference = self._reference_instructions(build_code_reference())
+        full_system_prompt = f"{self.config.system_prompt}\n\n{self.code_reference}"
+        self.full_system_prompt = full_system_prompt
+        # When trimming, the catalog is sent per run as instructions instead of in the system prompt
+        self.agent_system_prompt = self.config.system_prompt if self.config.trim_code_reference else full_system_prompt
+        self._base_prompt_tokens = estimate_tokens(self.agent_system_prompt)
+        self._full_reference_tokens = estimate_tokens(self.code_reference)
+        # A trimmed catalog changes per run, so there is no static prefix worth caching
+        self.prompt_cache: Optional[PromptCache] = (
+            get_prompt_cache() if self.config.context_cache and not self.config.trim_code_reference else None
         )
-
-        self.batch_agent = Agent(
-            model=self.config.model_name,
-            system_prompt=full_system_prompt,
-            output_type=List[TenderOverview],
+        self.tier = self._build_tier(self.config.model_name)
+        self.agent = self.tier.agent
+        self.batch_agent = self.tier.batch_agent
+        # Shared by single and batch calls so both count against the same provider quota
+        self.rate_limiter = self.tier.rate_limiter
+        self._system_prompt_tokens = estimate_tokens(full_system_prompt)
+
+        self.fast_tier: Optional[ModelTier] = None
+        self.keyword_scorer: Optional[KeywordScorer] = None
+        if self.config.tiered:
+            self.fast_tier = self._build_tier(self.config.fast_model_name)
+            self.keyword_scorer = KeywordScorer(build_code_catalog())
+        # Cumulative routing and agreement counters for tiered mode
+        self.tier_stats = Counter()
+        self.code_index = get_code_index()
+
+    @staticmethod
+    def _reference_instructions(code_reference: str) -> str:
+        return f"### Code reference catalog (types, level-2, level-3):\n{code_reference}"
+
+    def _run_instructions(self, reference: Optional[str]) -> Optional[str]:
+        """Per-run instructions: the given reference when trimming, else none (catalog is in the system prompt)."""
+        if not self.config.trim_code_reference:
+            return None
+        return reference or self.code_reference
+
+    def _build_tier(self, model_name: str) -> ModelTier:
+        return ModelTier(
+            name=model_name,
+            agent=Agent(
+                model=model_name,
+                system_prompt=self.agent_system_prompt,
+                output_type=self._output_type(TenderOverview, model_name),
+            ),
+            batch_agent=Agent(
+                model=model_name,
+                system_prompt=self.agent_system_prompt,
+                output_type=self._output_type(List[TenderOverview], model_name),
+            ),
+            rate_limiter=RateLimiter(self.config.requests_per_minute, self.config.tokens_per_minute),
         )
 
-    async def analyze_tender(self, input_data: dict) -> TenderOverview | None:
+    def _output_type(self, output_type, model_name: str):
+        # Requests using a Gemini context cache may not carry tools, so structured output can't go
+        # through an output tool; models the cache won't serve keep the default tool output
+        cache = self.prompt_cache
+        if cache is not None and cache.restricts_tools and cache.supports(model_name, self.agent_system_prompt):
+            return NativeOutput(output_type)
+        return output_type
+
+    async def _model_settings(self, tier: ModelTier) -> Optional[dict]:
+        if self.prompt_cache is None:
+            return None
+        cached_content = await self.prompt_cache.cached_content(tier.name, self.agent_system_prompt)
+        return {"google_cached_content": cached_content} if cached_content else None
+
+    def _record_usage(self, result, model_settings: Optional[dict]):
+        # A method in pydantic-ai 1.x, a property in 2.x
+        usage = result.usage() if callable(result.usage) else result.usage
+        if self.prompt_cache is not None:
+            self.prompt_cache.record_usage(usage, cached=model_settings is not None)
+        return usage
+
+    async def analyze_tender(self, input_data: dict, tier: Optional[ModelTier] = None) -> TenderOverview | None:
+        tier = tier or self.tier
         try:
-            overview = await self.agent.run([
-                str(input_data)
-            ])
+            prompt = str(input_data)
+            await tier.rate_limiter.acquire(self._system_prompt_tokens + estimate_tokens(prompt))
+            model_settings = await self._model_settings(tier)
+            overview = await tier.agent.run([
+                prompt
+            ], instructions=self._run_instructions(None), model_settings=model_settings)
+            self._record_usage(overview, model_settings)
             return overview.output
         except Exception as e:
             return None
+
+    @staticmethod
+    def _assign_item_ids(input_data_list: List[dict]) -> List[str]:
+        """Stable, unique per-item IDs (invitation_id, else tender_id, else position)."""
+        ids = []
+        seen = {}
+        for index, input_data in enumerate(input_data_list):
+            base = str(input_data.get("invitation_id") or input_data.get("tender_id") or index)
+            count = seen.get(base, 0)
+            seen[base] = count + 1
+            ids.append(base if count == 0 else f"{base}#{count}")
+        return ids
         
+    def _pack_chunks(self, prompts: List[str], batch_size: int) -> List[List[int]]:
+        """Greedily pack consecutive items into chunks of at most `batch_size` items and
+        `batch_token_budget` estimated tokens; an oversized item gets a chunk of its own."""
+        chunks: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for index, prompt in enumerate(prompts):
+            tokens = estimate_tokens(prompt)
+            if current and (len(current) >= batch_size or current_tokens + tokens > self.config.batch_token_budget):
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
     async def analyze_tender_batch(self, input_data_list: List[dict], batch_size: int = 10) -> List[TenderOverview]:
-        """Process tenders in smaller chunks to avoid API timeouts."""
-        all_results = []
+        """Classify tenders; in tiered mode obvious ones go to the fast model first.
+
+        The returned list is aligned with the input (None where analysis failed).
+        """
+        if self.fast_tier is None or not input_data_list:
+            results = await self._classify_batch(input_data_list, batch_size, self.tier)
+        else:
+            results = await self._classify_tiered(input_data_list, batch_size)
+
+        failed = [i for i, overview in enumerate(results) if overview is None]
+        if failed and self.config.index_fallback:
+            candidates = self.code_index.search_many([input_data_list[i] for i in failed])
+            for i, candidate in zip(failed, candidates):
+                results[i] = self.fallback_overview(input_data_list[i], candidate)
+            logger.warning(f"Classified {len(failed)}/{len(results)} tenders by code index after the model failed")
+        return results
+
+    def fallback_overview(self, input_data: dict, candidates: CodeCandidates) -> TenderOverview:
+        """Overview built from the tender info and its nearest codes, for tenders the model failed on."""
+        best = candidates.best_level2
+        if best is not None and best.score >= self.config.index_fallback_min_score:
+            level2 = best.code
+            level3 = next((c.code for c in candidates.level3 if c.code.startswith(f"{level2}_")), TenderCategoryItem.Other.value)
+            tender_type = {"W": TenderType.WORKS, "G": TenderType.GOODS, "S": TenderType.SERVICES}[level2[0]]
+            reason = f"Загвар ангилж чадаагүй тул кодын индексийн хамгийн ойр код {level2}-г сонгосон (ижил төстэй байдал {best.score:.2f})."
+        else:
+            level2, level3, tender_type = TenderCategory.Other.value, TenderCategoryItem.Other.value, TenderType.OTHER
+            reason = "Загвар ангилж чадаагүй бөгөөд кодын индексэд тохирох код олдсонгүй."
+        try:
+            total_budget = float(input_data.get("total_budget"))
+        except (TypeError, ValueError):
+            total_budget = None
+        name = str(input_data.get("tender_name") or "")
+        overview = TenderOverview(
+            item_id=input_data.get("item_id"),
+            summary=name,
+            name=name,
+            selection_number=str(input_data.get("invitation_number") or input_data.get("tender_code") or ""),
+            ordering_organization=str(input_data.get("budget_entity_name") or ""),
+            announced_date=str(input_data.get("publish_date") or "")[:10],
+            deadline_date="",
+            official_link=str(input_data.get("official_link") or ""),
+            total_budget=total_budget,
+            type_reason=reason,
+            tender_type=tender_type,
+            category_reason=reason,
+            tender_category=[level2],
+            category_detail_reason=reason,
+            tender_category_detail=[level3],
+        )
+        overview._fallback = True
+        return overview
+
+    async def _classify_batch(self, input_data_list: List[dict], batch_size: int, tier: ModelTier) -> List[Optional[TenderOverview]]:
+        """Process tenders in token-budgeted chunks, dispatched concurrently, to avoid API timeouts.
+
+        Every item is tagged with an `item_id` that the model echoes back, so results are
+        matched by ID rather than position. A chunk that times out or fails output validation
+        is split in half and retried; items the model still drops are re-run singly.
+        The returned list is aligned with the input (None where analysis failed).
+        """
         total = len(input_data_list)
-        
-        for i in range(0, total, batch_size):
-            chunk = input_data_list[i:i + batch_size]
-            chunk_num = i // batch_size + 1
-            total_chunks = (total + batch_size - 1) // batch_size
-            
-            try:
-                overviews = await self.batch_agent.run([
-                    str(input_data) for input_data in chunk
-                ])
-                if overviews.output:
-                    all_results.extend(overviews.output)
-            except Exception as e:
-                # Log error but continue with remaining chunks
-                print(f"Error processing chunk {chunk_num}/{total_chunks}: {e}")
-                # Add None placeholders for failed items to maintain index alignment
-                all_results.extend([None] * len(chunk))
-                
-        return all_results
-        
+        item_ids = self._assign_item_ids(input_data_list)
+        prompts = [str({"item_id": item_ids[i], **input_data_list[i]}) for i in range(total)]
+        chunks = self._pack_chunks(prompts, max(1, batch_size))
+        total_chunks = len(chunks)
+        semaphore = asyncio.Semaphore(max(1, self.config.max_concurrent_batches))
+        results: List[Optional[TenderOverview]] = [None] * total
+        trim = self.config.trim_code_reference
+        candidates = self.code_index.search_many(input_data_list, level2_k=self.config.trim_candidates_per_tender) if trim else []
+        reference_tokens = Counter()
+
+        def chunk_reference(label: str, chunk: List[int], trimmed: bool) -> str:
+            if not trimmed:
+                reference_tokens["full"] += self._full_reference_tokens
+                reference_tokens["sent"] += self._full_reference_tokens
+                return self.code_reference
+            branches = {c.code for i in chunk for c in candidates[i].level2}
+            reference = self._reference_instructions(build_code_reference(branches))
+            tokens = estimate_tokens(reference)
+            reference_tokens["full"] += self._full_reference_tokens
+            reference_tokens["sent"] += tokens
+            logger.info(
+                f"Chunk {label}/{total_chunks}: code reference trimmed to {len(branches)} branches, "
+                f"~{tokens} tokens (full catalog ~{self._full_reference_tokens})"
+            )
+            return reference
+
+        async def run_single(index: int):
+            async with semaphore:
+                results[index] = await self.analyze_tender({"item_id": item_ids[index], **input_data_list[index]}, tier)
+
+        async def run_chunk(label: str, chunk: List[int], trimmed: bool = trim):
+            chunk_prompts = [prompts[i] for i in chunk]
+            reference = chunk_reference(label, chunk, trimmed) if trim else None
+            reference_size = estimate_tokens(reference) if reference else 0
+            estimated = (self._base_prompt_tokens + reference_size if trim else self._system_prompt_tokens) + sum(
+                estimate_tokens(p) for p in chunk_prompts
+            )
+            outputs = []
+            split = False
+            retry_full = False
+            async with semaphore:
+                await tier.rate_limiter.acquire(estimated)
+                started = time.perf_counter()
+                try:
+                    model_settings = await self._model_settings(tier)
+                    overviews = await asyncio.wait_for(
+                        tier.batch_agent.run(
+                            chunk_prompts, instructions=self._run_instructions(reference), model_settings=model_settings
+                        ),
+                        timeout=self.config.batch_timeout_seconds,
+                    )
+                    outputs = list(overviews.output or [])
+                    usage = self._record_usage(overviews, model_settings)
+                    logger.info(
+                        f"Chunk {label}/{total_chunks}: {len(chunk)} tenders in {time.perf_counter() - started:.1f}s, "
+                        f"tokens in={usage.input_tokens} (cached {usage.cache_read_tokens}) out={usage.output_tokens} "
+                        f"(estimated in={estimated})"
+                    )
+                except (asyncio.TimeoutError, UnexpectedModelBehavior) as e:
+                    logger.warning(
+                        f"Chunk {label}/{total_chunks}: {type(e).__name__} after {time.perf_counter() - started:.1f}s "
+                        f"with {len(chunk)} tenders (~{estimated} tokens)"
+                    )
+                    # A trimmed catalog may have left out the right branch: retry with the full one first
+                    retry_full = trimmed and isinstance(e, UnexpectedModelBehavior)
+                    split = not retry_full and len(chunk) > 1
+                except Exception as e:
+                    # Log error but continue with remaining chunks
+                    logger.error(f"Error processing chunk {label}/{total_chunks}: {e}")
+
+            if retry_full:
+                logger.info(f"Chunk {label}/{total_chunks}: retrying with the full code catalog")
+                await run_chunk(f"{label}F", chunk, trimmed=False)
+                return
+            if split:
+                middle = len(chunk) // 2
+                logger.info(f"Chunk {label}/{total_chunks}: splitting into {middle} + {len(chunk) - middle} and retrying")
+                await asyncio.gather(
+                    run_chunk(f"{label}.1", chunk[:middle], trimmed), run_chunk(f"{label}.2", chunk[middle:], trimmed)
+                )
+                return
+
+            by_id = {}
+            for overview in outputs:
+                if overview is not None and overview.item_id and overview.item_id not in by_id:
+                    by_id[overview.item_id] = overview
+            missing = []
+            for i in chunk:
+                overview = by_id.pop(item_ids[i], None)
+                if overview is None:
+                    missing.append(i)
+                else:
+                    results[i] = overview
+            if by_id:
+                logger.warning(f"Chunk {label}/{total_chunks}: ignoring {len(by_id)} overviews with unknown item_id")
+            if missing:
+                logger.warning(f"Chunk {label}/{total_chunks}: {len(missing)}/{len(chunk)} items missing, re-running singly")
+                await asyncio.gather(*(run_single(i) for i in missing))
+
+        logger.info(f"Classifying {total} tenders with {tier.name} in {total_chunks} chunks (token budget {self.config.batch_token_budget})")
+        await asyncio.gather(*(
+            run_chunk(str(chunk_num), chunk) for chunk_num, chunk in enumerate(chunks, 1)
+        ))
+        if trim and reference_tokens["full"]:
+            logger.info(
+                f"Code reference tokens for {total} tenders: ~{reference_tokens['sent']} sent vs "
+                f"~{reference_tokens['full']} with the full catalog "
+                f"({1 - reference_tokens['sent'] / reference_tokens['full']:.0%} saved)"
+            )
+        if self.prompt_cache is not None:
+            self.prompt_cache.log_report(tier.name)
+        for overview in results:
+            if overview is not None:
+                overview._produced_by = tier.name
+        return results
+
+    def _is_obvious(self, match: KeywordMatch) -> bool:
+        return (
+            match.level2 is not None
+            and match.score >= self.config.tier_min_score
+            and match.margin >= self.config.tier_min_margin
+            and match.level2 not in self.config.escalate_categories
+        )
+
+    @staticmethod
+    def _level2_codes(overview: TenderOverview) -> set:
+        return {getattr(code, "value", code) for code in overview.tender_category or []}
+
+    def _record_agreement(self, stats: Counter, prefix: str, overview: Optional[TenderOverview], match: KeywordMatch):
+        """Count whether the model's codes include the keyword pass's best level-2 / level-3 code."""
+        if overview is None or match.level2 is None:
+            return
+        stats[f"{prefix}_compared"] += 1
+        if match.level2 in self._level2_codes(overview):
+            stats[f"{prefix}_level2_agree"] += 1
+        details = {getattr(code, "value", code) for code in overview.tender_category_detail or []}
+        if match.level3 is not None and match.level3 in details:
+            stats[f"{prefix}_level3_agree"] += 1
+
+    async def _classify_tiered(self, input_data_list: List[dict], batch_size: int) -> List[Optional[TenderOverview]]:
+        """Route obvious tenders to the fast model and the rest to the main model.
+
+        A fast-model result is kept only when it agrees with the keyword pass on the level-2
+        code and stays clear of `escalate_categories`; otherwise the tender is escalated.
+        """
+        total = len(input_data_list)
+        matches = [self.keyword_scorer.score(input_data) for input_data in input_data_list]
+        obvious = [i for i, match in enumerate(matches) if self._is_obvious(match)]
+        obvious_set = set(obvious)
+        ambiguous = [i for i in range(total) if i not in obvious_set]
+        logger.info(
+            f"Tiered classification: {len(obvious)}/{total} obvious -> {self.fast_tier.name}, "
+            f"{len(ambiguous)} ambiguous -> {self.tier.name} "
+            f"(min score {self.config.tier_min_score}, min margin {self.config.tier_min_margin})"
+        )
+
+        async def classify(indices: List[int], tier: ModelTier) -> List[Optional[TenderOverview]]:
+            if not indices:
+                return []
+            return await self._classify_batch([input_data_list[i] for i in indices], batch_size, tier)
+
+        fast_results, main_results = await asyncio.gather(
+            classify(obvious, self.fast_tier), classify(ambiguous, self.tier)
+        )
+        stats = Counter(total=total, fast=len(obvious), main=len(ambiguous))
+        results: List[Optional[TenderOverview]] = [None] * total
+        escalated: List[int] = []
+        for i, overview in zip(obvious, fast_results):
+            self._record_agreement(stats, "fast", overview, matches[i])
+            if overview is None:
+                stats["escalated_failed"] += 1
+                escalated.append(i)
+            elif matches[i].level2 not in self._level2_codes(overview):
+                stats["escalated_disagreed"] += 1
+                escalated.append(i)
+            elif self._level2_codes(overview) & set(self.config.escalate_categories):
+                stats["escalated_category"] += 1
+                escalated.append(i)
+            else:
+                results[i] = overview
+        for i, overview in zip(ambiguous, main_results):
+            self._record_agreement(stats, "main", overview, matches[i])
+            results[i] = overview
+
+        if escalated:
+            logger.info(f"Tiered classification: escalating {len(escalated)} fast-tier results to {self.tier.name}")
+            for i, overview in zip(escalated, await classify(escalated, self.tier)):
+                self._record_agreement(stats, "escalated", overview, matches[i])
+                results[i] = overview
+        stats["escalated"] = len(escalated)
+
+        self.tier_stats.update(stats)
+        self._log_tier_report("this run", stats)
+        return results
+
+    def _log_tier_report(self, label: str, stats: Counter):
+        def rate(agree: str, compared: str) -> str:
+            return f"{stats[agree] / stats[compared]:.0%}" if stats[compared] else "n/a"
+
+        accepted = stats["fast"] - stats["escalated"]
+        logger.info(
+            f"Tier report ({label}): {stats['total']} tenders, {accepted} settled by fast model, "
+            f"{stats['main']} sent to main model, {stats['escalated']} escalated "
+            f"(failed={stats['escalated_failed']}, disagreed={stats['escalated_disagreed']}, category={stats['escalated_category']})"
+        )
+        logger.info(
+            f"Tier report ({label}): keyword agreement level-2/level-3 with "
+            f"fast model {rate('fast_level2_agree', 'fast_compared')}/{rate('fast_level3_agree', 'fast_compared')}, "
+            f"main model {rate('main_level2_agree', 'main_compared')}/{rate('main_level3_agree', 'main_compared')}, "
+            f"on escalation {rate('escalated_level2_agree', 'escalated_compared')}/{rate('escalated_level3_agree', 'escalated_compared')}"
+        )
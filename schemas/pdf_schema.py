@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from enum import Enum
-from pydantic_ai import Agent, BinaryContent
+from pydantic_ai import Agent, BinaryContent, UploadedFile
 
 from schemas.lvl_schema import TenderOverview
 
@@ -65,7 +65,7 @@ class PDFOverviewAgent:
             output_type=PDFOverview,
         )
     
-    async def analyze_tender(self, input_files: list[BinaryContent]) -> PDFOverview | None:
+    async def analyze_tender(self, input_files: list[str | BinaryContent | UploadedFile]) -> PDFOverview | None:
         try:
             overview = await self.agent.run([
                 *input_files
@@ -85,7 +85,7 @@ class PDFFoodOverviewAgent:
             output_type=PDFFoodOverview,
         )
     
-    async def analyze_tender(self, input_files: list[BinaryContent]) -> PDFFoodOverview | None:
+    async def analyze_tender(self, input_files: list[str | BinaryContent | UploadedFile]) -> PDFFoodOverview | None:
         try:
             overview = await self.agent.run([
                 *input_files
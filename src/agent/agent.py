@@ -1,14 +1,30 @@
+import asyncio
+import functools
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel
-from pydantic_ai import BinaryContent
-from typing import Any, Union, List
+from pydantic_ai import BinaryContent, UploadedFile
+from typing import Any, Optional, Union, List
 from src.logger import logger
+from src.repositories.classification_cache import ClassificationCacheRepository
+
+
+# Classification cache lookups and writes run here: SQLite I/O stays off the event loop the
+# classify workers share, and one thread serializes access to the cache session
+_cache_executor: Optional[ThreadPoolExecutor] = None
+
+
+async def _cache_call(fn, *args):
+    global _cache_executor
+    if _cache_executor is None:
+        _cache_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="classification-cache")
+    return await asyncio.get_running_loop().run_in_executor(_cache_executor, functools.partial(fn, *args))
 
 
 # Define an abstract base class for sentiment analysis agents
 class TenderCategoryAnalysisAgent(ABC):
     @abstractmethod
-    async def analyze_tender(self, input_data: BaseModel | List[BinaryContent]):
+    async def analyze_tender(self, input_data: BaseModel | List[str | BinaryContent | UploadedFile]):
         pass
 
     @abstractmethod
@@ -16,11 +32,12 @@ class TenderCategoryAnalysisAgent(ABC):
         pass
 
 class AgentProcessor:
-    def __init__(self, agent: Union[TenderCategoryAnalysisAgent, Any]):
+    def __init__(self, agent: Union[TenderCategoryAnalysisAgent, Any], cache: Optional[ClassificationCacheRepository] = None):
         self.agent = agent
+        self.cache = cache
         logger.info(f"AgentProcessor initialized with agent: {type(agent).__name__}")
 
-    async def process(self, input_data: BaseModel | List[BinaryContent]):
+    async def process(self, input_data: BaseModel | List[str | BinaryContent | UploadedFile]):
         logger.debug(f"Processing single tender with {type(self.agent).__name__}")
         result = await self.agent.analyze_tender(input_data)
         logger.debug(f"Tender processing completed")
@@ -28,9 +45,35 @@ class AgentProcessor:
     
     async def process_batch(self, input_data: List[BaseModel]):
         logger.info(f"Processing batch of {len(input_data)} tenders")
-        result = await self.agent.analyze_tender_batch(input_data)
+        if self.cache is None:
+            result = await self.agent.analyze_tender_batch(input_data)
+        else:
+            result = await self._process_batch_cached(input_data)
         logger.info(f"Batch processing completed")
         return result
+
+    async def _process_batch_cached(self, input_data: List[dict]):
+        """Serve cached classifications and send only the misses to the agent."""
+        keys = [self.cache.make_key(item) for item in input_data]
+        results = await _cache_call(self.cache.get_many, keys)
+        missing = [i for i, result in enumerate(results) if result is None]
+        logger.info(f"Classification cache: {len(input_data) - len(missing)} hits, {len(missing)} misses")
+
+        fresh_entries = {}
+        if missing:
+            fresh = await self.agent.analyze_tender_batch([input_data[i] for i in missing]) or []
+            for i, overview in zip(missing, fresh):
+                results[i] = overview
+                # Entries are keyed on the main model: fast-tier and code-index results would
+                # otherwise be served later as if the main model had produced them
+                if overview is not None and getattr(overview, "produced_by", None) == self.cache.model_name:
+                    fresh_entries[keys[i]] = overview
+
+        if fresh_entries:
+            await _cache_call(self.cache.upsert_many, fresh_entries)
+        await _cache_call(self.cache.flush_hits)
+        logger.info(f"Classification cache totals: {self.cache.stats()}")
+        return results
     
     def __call__(self, *args: Any, **kwds: Any) -> Any:
         return self.process(*args, **kwds)
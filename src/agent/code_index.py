@@ -0,0 +1,139 @@
+import os
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.agent.keyword_scorer import BODY_MAX_CHARS, NAME_WEIGHT, STOPWORDS, TOKEN_PATTERN
+from src.logger import logger
+
+
+# Hashed feature space; the matrix is (codes x dimensions) float32
+CODE_INDEX_DIMENSIONS = int(os.getenv("CODE_INDEX_DIMENSIONS", "4096"))
+NGRAM_RANGE = (3, 5)
+
+
+@dataclass
+class CodeCandidate:
+    code: str
+    score: float
+
+
+@dataclass
+class CodeCandidates:
+    """Nearest level-2 and level-3 codes for one tender, best first."""
+    level2: List[CodeCandidate]
+    level3: List[CodeCandidate]
+
+    @property
+    def best_level2(self) -> Optional[CodeCandidate]:
+        return self.level2[0] if self.level2 else None
+
+
+def _ngrams(text: str) -> Counter:
+    grams = Counter()
+    low, high = NGRAM_RANGE
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        padded = f" {token} "
+        for n in range(low, high + 1):
+            for start in range(max(1, len(padded) - n + 1)):
+                grams[padded[start:start + n]] += 1
+    return grams
+
+
+class CodeIndex:
+    """Character n-gram hashed vectors of the code catalog, searched by cosine similarity.
+
+    `catalog` is a list of (code, parent level-2 code or None, description). A level-2 code
+    scores the best of its own description and its level-3 children.
+    """
+
+    def __init__(self, catalog: Iterable[Tuple[str, Optional[str], str]], dimensions: int = CODE_INDEX_DIMENSIONS):
+        self.dimensions = dimensions
+        entries = list(catalog)
+        self.level2_codes = [code for code, parent, _ in entries if parent is None]
+        level2_position = {code: i for i, code in enumerate(self.level2_codes)}
+        self.level3_codes = [code for code, parent, _ in entries if parent is not None]
+        level3_parent = np.array(
+            [level2_position[parent] for _, parent, _ in entries if parent is not None], dtype=np.intp
+        )
+        # (level-2, level-3) membership, so level-2 scores can take the max over their children
+        self.children = level3_parent[None, :] == np.arange(len(self.level2_codes))[:, None]
+
+        counts = np.stack([self._counts(text) for _, _, text in entries])
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(entries)) / (1 + document_frequency)) + 1).astype(np.float32)
+        vectors = self._normalize(counts * self.idf)
+        self.level2_vectors = vectors[[i for i, (_, parent, _) in enumerate(entries) if parent is None]]
+        self.level3_vectors = vectors[[i for i, (_, parent, _) in enumerate(entries) if parent is not None]]
+        logger.info(
+            f"Code index built: {len(self.level2_codes)} level-2 and {len(self.level3_codes)} level-3 codes, "
+            f"{dimensions} dimensions ({vectors.nbytes / (1024 * 1024):.1f} MB)"
+        )
+
+    def _counts(self, text: str) -> np.ndarray:
+        grams = _ngrams(text)
+        if not grams:
+            return np.zeros(self.dimensions, dtype=np.float32)
+        buckets = [zlib.crc32(gram.encode("utf-8")) % self.dimensions for gram in grams]
+        weights = 1 + np.log(np.fromiter(grams.values(), dtype=np.float32, count=len(grams)))
+        return np.bincount(buckets, weights=weights, minlength=self.dimensions).astype(np.float32)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def embed(self, input_data: dict) -> np.ndarray:
+        """Unit vector for a tender; the name is weighted above the body."""
+        name = self._normalize(self._counts(str(input_data.get("tender_name") or "")) * self.idf)
+        body = self._normalize(self._counts(str(input_data.get("body") or "")[:BODY_MAX_CHARS]) * self.idf)
+        return self._normalize(NAME_WEIGHT * name + body)
+
+    def search_vectors(self, queries: np.ndarray, level2_k: int = 5, level3_k: int = 10) -> List[CodeCandidates]:
+        """Top-k codes for each row of `queries` (unit vectors, shape (n, dimensions))."""
+        level3_scores = queries @ self.level3_vectors.T
+        best_child = np.where(self.children[None, :, :], level3_scores[:, None, :], 0).max(axis=2)
+        level2_scores = np.maximum(queries @ self.level2_vectors.T, best_child)
+        return [
+            CodeCandidates(
+                level2=self._top(level2_scores[row], self.level2_codes, level2_k),
+                level3=self._top(level3_scores[row], self.level3_codes, level3_k),
+            )
+            for row in range(len(queries))
+        ]
+
+    @staticmethod
+    def _top(scores: np.ndarray, codes: List[str], k: int) -> List[CodeCandidate]:
+        k = min(k, len(codes))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [CodeCandidate(code=codes[i], score=float(scores[i])) for i in top if scores[i] > 0]
+
+    def search(self, input_data: dict, level2_k: int = 5, level3_k: int = 10) -> CodeCandidates:
+        return self.search_vectors(self.embed(input_data)[None, :], level2_k, level3_k)[0]
+
+    def search_many(self, input_data_list: List[dict], level2_k: int = 5, level3_k: int = 10) -> List[CodeCandidates]:
+        if not input_data_list:
+            return []
+        queries = np.stack([self.embed(input_data) for input_data in input_data_list])
+        return self.search_vectors(queries, level2_k, level3_k)
+
+
+_code_index: Optional[CodeIndex] = None
+
+
+def get_code_index() -> CodeIndex:
+    """Process-wide index over the tender code catalog, built on first use."""
+    global _code_index
+    if _code_index is None:
+        from schemas.lvl_schema import build_code_catalog
+
+        _code_index = CodeIndex(build_code_catalog())
+    return _code_index
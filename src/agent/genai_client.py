@@ -0,0 +1,14 @@
+import os
+
+
+_genai_client = None
+
+
+def get_genai_client():
+    """Shared Gemini SDK client for the Files and Caches APIs, created on first use."""
+    global _genai_client
+    if _genai_client is None:
+        from google import genai
+
+        _genai_client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+    return _genai_client
@@ -0,0 +1,117 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+TOKEN_PATTERN = re.compile(r"[a-zа-яёөү]+")
+# Mongolian is suffixing, so words are compared by their first few letters
+STEM_LENGTH = 5
+MIN_TOKEN_LENGTH = 3
+# Repeats of one word in a tender count at most this many times
+MAX_TERM_COUNT = 3
+# The tender name says more about the category than the body boilerplate
+NAME_WEIGHT = 3
+BODY_MAX_CHARS = 4000
+
+STOPWORDS = {
+    "and", "for", "the", "other", "with", "including", "not", "such", "e.g",
+    "бусад", "болон", "зэрэг", "ба", "нь", "бол", "тухай", "худалдан", "авах", "ажил",
+    "үйлчилгээ", "бараа", "тендер", "шалгаруулалт",
+}
+STOPWORD_STEMS = {word[:STEM_LENGTH] for word in STOPWORDS}
+
+
+def stems(text: str) -> List[str]:
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    return [
+        token[:STEM_LENGTH]
+        for token in tokens
+        if len(token) >= MIN_TOKEN_LENGTH and token[:STEM_LENGTH] not in STOPWORD_STEMS
+    ]
+
+
+@dataclass
+class KeywordMatch:
+    """Best level-2 / level-3 codes for one tender and how clearly they won."""
+    level2: Optional[str]
+    level3: Optional[str]
+    score: float
+    runner_up: float
+    matched_terms: List[str] = field(default_factory=list)
+
+    @property
+    def margin(self) -> float:
+        """Relative lead of the best level-2 code over the next one (0..1)."""
+        return (self.score - self.runner_up) / self.score if self.score > 0 else 0.0
+
+    @property
+    def tender_type(self) -> Optional[str]:
+        return self.level2[0] if self.level2 else None
+
+
+class KeywordScorer:
+    """TF-IDF keyword overlap between tender text and the code catalog descriptions.
+
+    `catalog` is a list of (code, parent level-2 code or None, description). A level-2 code
+    scores the best of its own description and its level-3 children.
+    """
+
+    def __init__(self, catalog: Iterable[Tuple[str, Optional[str], str]]):
+        self.parents: Dict[str, Optional[str]] = {}
+        documents: Dict[str, Counter] = {}
+        for code, parent, text in catalog:
+            self.parents[code] = parent
+            documents[code] = Counter(stems(text))
+
+        document_frequency = Counter()
+        for terms in documents.values():
+            document_frequency.update(terms.keys())
+        total = len(documents)
+        self.idf = {term: math.log((1 + total) / (1 + count)) + 1 for term, count in document_frequency.items()}
+        self.weights: Dict[str, Dict[str, float]] = {}
+        for code, terms in documents.items():
+            weights = {term: self.idf[term] for term in terms}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            self.weights[code] = {term: w / norm for term, w in weights.items()}
+
+    def tender_terms(self, input_data: dict) -> Counter:
+        name = str(input_data.get("tender_name") or "")
+        body = str(input_data.get("body") or "")[:BODY_MAX_CHARS]
+        terms = Counter(stems(body))
+        for term in stems(name):
+            terms[term] += NAME_WEIGHT
+        return terms
+
+    def score(self, input_data: dict) -> KeywordMatch:
+        terms = self.tender_terms(input_data)
+        scores: Dict[str, float] = {}
+        matched: Dict[str, List[str]] = {}
+        for code, weights in self.weights.items():
+            hits = [term for term in weights if term in terms]
+            if hits:
+                scores[code] = sum(weights[t] * self.idf[t] * min(terms[t], MAX_TERM_COUNT) for t in hits)
+                matched[code] = hits
+
+        level2_scores: Dict[str, float] = {}
+        best_child: Dict[str, Tuple[float, str]] = {}
+        for code, value in scores.items():
+            parent = self.parents[code]
+            level2 = parent or code
+            level2_scores[level2] = max(level2_scores.get(level2, 0.0), value)
+            if parent and value > best_child.get(parent, (0.0, ""))[0]:
+                best_child[parent] = (value, code)
+
+        if not level2_scores:
+            return KeywordMatch(level2=None, level3=None, score=0.0, runner_up=0.0)
+        ranked = sorted(level2_scores.items(), key=lambda kv: kv[1], reverse=True)
+        level2, top = ranked[0]
+        level3 = best_child.get(level2, (0.0, None))[1]
+        return KeywordMatch(
+            level2=level2,
+            level3=level3,
+            score=top,
+            runner_up=ranked[1][1] if len(ranked) > 1 else 0.0,
+            matched_terms=matched.get(level3 or level2, []),
+        )
@@ -0,0 +1,186 @@
+import os
+import re
+import asyncio
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from pydantic_ai import BinaryContent, UploadedFile
+
+from src.agent.genai_client import get_genai_client
+from src.logger import logger
+from src.services.pdf_store import file_sha256
+from src.services.pdf_text import extract_relevant_text
+
+
+PDF_MEDIA_TYPE = "application/pdf"
+# Upload PDFs through the Gemini Files API instead of inlining their bytes in every request
+PDF_UPLOAD_ENABLED = os.getenv("PDF_UPLOAD_ENABLED", "1") not in ("0", "false", "False")
+# Send locally extracted section III / Багц text instead of the PDF when the document has a text layer
+PDF_TEXT_EXTRACTION_ENABLED = os.getenv("PDF_TEXT_EXTRACTION", "1") not in ("0", "false", "False")
+# Bytes of inline PDF data allowed in memory at once across all analyses of a run
+PDF_INLINE_MEMORY_BUDGET = int(float(os.getenv("PDF_INLINE_MEMORY_BUDGET_MB", "256")) * 1024 * 1024)
+# Files API uploads expire after 48h; stop reusing a handle this long before it does
+UPLOAD_EXPIRY_MARGIN = timedelta(hours=1)
+UPLOAD_DEFAULT_LIFETIME = timedelta(hours=47)
+UPLOAD_ACTIVE_POLL_ATTEMPTS = 30
+
+# Files API providers that accept https:// file URIs
+UPLOAD_PROVIDERS = ("google-gla", "google")
+
+PdfInput = Union[str, BinaryContent, UploadedFile]
+
+_SHA256_NAME = re.compile(r"^[0-9a-f]{64}$")
+
+# sha256 -> (Files API URI, expiry); shared across runs so retries and re-runs reuse uploads
+_uploads: Dict[str, Tuple[str, datetime]] = {}
+
+
+def _path_sha256(path: str) -> str:
+    # Store entries are already named by their hash
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem if _SHA256_NAME.match(stem) else file_sha256(path)
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class MemoryBudget:
+    """Async byte budget; a request larger than the whole budget is admitted when nothing else is held."""
+
+    def __init__(self, limit_bytes: int):
+        self.limit_bytes = limit_bytes
+        self.in_use = 0
+        self.peak = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, size: int):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_use == 0 or self.in_use + size <= self.limit_bytes)
+            self.in_use += size
+            self.peak = max(self.peak, self.in_use)
+
+    async def release(self, size: int):
+        async with self._condition:
+            self.in_use -= size
+            self._condition.notify_all()
+
+
+class PdfInputLayer:
+    """Turns PDF paths into model inputs for one run.
+
+    Text PDFs are reduced locally to their opening, section III and Багц passages. Other
+    files are uploaded once through the Gemini Files API and the handle is reused for as
+    long as it is valid; when uploads are unavailable the bytes are sent inline, but only
+    while the run's memory budget allows.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        memory_budget_bytes: int = PDF_INLINE_MEMORY_BUDGET,
+        upload_enabled: bool = PDF_UPLOAD_ENABLED,
+        text_extraction: bool = PDF_TEXT_EXTRACTION_ENABLED,
+    ):
+        self.provider_name = model_name.split(":", 1)[0] if ":" in model_name else ""
+        self.upload_enabled = upload_enabled and self.provider_name in UPLOAD_PROVIDERS
+        self.text_extraction = text_extraction
+        self.budget = MemoryBudget(memory_budget_bytes)
+        self.stats = Counter()
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def _upload(self, path: str, sha256: str) -> Tuple[str, datetime]:
+        from google.genai import types
+
+        client = get_genai_client()
+        file = await client.aio.files.upload(
+            file=path, config={"mime_type": PDF_MEDIA_TYPE, "display_name": sha256[:16]}
+        )
+        for _ in range(UPLOAD_ACTIVE_POLL_ATTEMPTS):
+            if file.state != types.FileState.PROCESSING:
+                break
+            await asyncio.sleep(1)
+            file = await client.aio.files.get(name=file.name)
+        if file.state == types.FileState.FAILED:
+            raise RuntimeError(f"Files API could not process {path}")
+        expires = file.expiration_time or datetime.now(timezone.utc) + UPLOAD_DEFAULT_LIFETIME
+        return file.uri, expires
+
+    async def _uploaded_file(self, path: str) -> Optional[UploadedFile]:
+        """Return a Files API handle for `path`, uploading it only if no valid handle exists."""
+        try:
+            sha256 = await asyncio.to_thread(_path_sha256, path)
+            lock = self._locks.setdefault(sha256, asyncio.Lock())
+            async with lock:
+                cached = _uploads.get(sha256)
+                if cached is not None and cached[1] - datetime.now(timezone.utc) > UPLOAD_EXPIRY_MARGIN:
+                    self.stats["upload_reused"] += 1
+                    uri = cached[0]
+                else:
+                    uri, expires = await self._upload(path, sha256)
+                    _uploads[sha256] = (uri, expires)
+                    self.stats["uploaded"] += 1
+                    logger.info(f"Uploaded {path} to Files API: {uri}")
+            return UploadedFile(file_id=uri, provider_name=self.provider_name, media_type=PDF_MEDIA_TYPE)
+        except Exception as e:
+            self.stats["upload_failed"] += 1
+            logger.warning(f"Files API upload failed for {path}, sending inline: {e!r}")
+            return None
+
+    async def _sliced_text(self, path: str) -> Optional[str]:
+        pdf_text = await asyncio.to_thread(extract_relevant_text, path)
+        if pdf_text is None:
+            self.stats["whole_pdf"] += 1
+            return None
+        self.stats["text_sliced"] += 1
+        self.stats["text_chars_sent"] += len(pdf_text.text)
+        self.stats["text_chars_total"] += pdf_text.total_chars
+        logger.info(
+            f"Sending {len(pdf_text.text)}/{pdf_text.total_chars} chars of {os.path.basename(path)} "
+            f"({pdf_text.pages} pages, section III={pdf_text.section_found}, Багц={pdf_text.lots_found})"
+        )
+        return f"# PDF: {os.path.basename(path)} (extracted text)\n\n{pdf_text.text}"
+
+    @asynccontextmanager
+    async def open(self, pdf_paths: List[str], allow_text: bool = True) -> AsyncIterator[List[PdfInput]]:
+        """Yield model inputs for `pdf_paths`; inline bytes are held against the budget until exit.
+
+        Pass `allow_text=False` to send whole PDFs, e.g. after the sliced text failed.
+        """
+        inputs: List[Optional[PdfInput]] = [None] * len(pdf_paths)
+        inline = []
+        for index, path in enumerate(pdf_paths):
+            sliced = await self._sliced_text(path) if self.text_extraction and allow_text else None
+            if sliced is not None:
+                inputs[index] = sliced
+                continue
+            uploaded = await self._uploaded_file(path) if self.upload_enabled else None
+            if uploaded is not None:
+                inputs[index] = uploaded
+            else:
+                inline.append(index)
+
+        reserved = sum(os.path.getsize(pdf_paths[index]) for index in inline)
+        if reserved:
+            await self.budget.acquire(reserved)
+        try:
+            # Read under the reservation, on worker threads: a multi-MB read would stall the loop
+            contents = await asyncio.gather(*(asyncio.to_thread(_read_bytes, pdf_paths[index]) for index in inline))
+            for index, content in zip(inline, contents):
+                inputs[index] = BinaryContent(content, media_type=PDF_MEDIA_TYPE)
+                self.stats["inline"] += 1
+            yield inputs
+        finally:
+            if reserved:
+                await self.budget.release(reserved)
+
+    def log_report(self, label: str):
+        logger.info(
+            f"PDF inputs ({label}): text_sliced={self.stats['text_sliced']} "
+            f"({self.stats['text_chars_sent']}/{self.stats['text_chars_total']} chars), uploaded={self.stats['uploaded']}, reused={self.stats['upload_reused']}, "
+            f"upload_failed={self.stats['upload_failed']}, inline={self.stats['inline']}, "
+            f"peak inline memory {self.budget.peak / (1024 * 1024):.1f}/{self.budget.limit_bytes / (1024 * 1024):.0f} MB"
+        )
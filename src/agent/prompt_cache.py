@@ -0,0 +1,129 @@
+import os
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from src.agent.genai_client import get_genai_client
+from src.agent.rate_limiter import estimate_tokens
+from src.logger import logger
+
+
+# "gemini" (provider-side context caching), "stub" (in-process fake) or "off"
+PROMPT_CACHE_BACKEND = os.getenv("PROMPT_CACHE", "gemini")
+PROMPT_CACHE_TTL = timedelta(seconds=int(os.getenv("PROMPT_CACHE_TTL_SECONDS", "3600")))
+# Gemini rejects caches below a model-specific size (1024 tokens for 2.5 Flash, 4096 for 2.5 Pro)
+PROMPT_CACHE_MIN_TOKENS = int(os.getenv("PROMPT_CACHE_MIN_TOKENS", "4096"))
+# Stop handing out a cache this long before it expires
+PROMPT_CACHE_EXPIRY_MARGIN = timedelta(minutes=2)
+
+CACHE_PROVIDERS = ("google-gla", "google")
+
+
+class PromptCache(ABC):
+    """Provider-side cache of static system prompts, keyed by (model, prompt).
+
+    `cached_content` returns the name of a cache holding the prompt, creating one when
+    needed, or None when the prompt can't be cached; callers then send it as usual.
+    """
+
+    # Whether requests served from this cache may not carry tools (so no tool-based output)
+    restricts_tools = False
+
+    def __init__(self, ttl: timedelta = PROMPT_CACHE_TTL):
+        self.ttl = ttl
+        self.stats = Counter()
+        self._entries: Dict[str, Tuple[str, datetime]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @abstractmethod
+    async def _create(self, model_name: str, system_prompt: str) -> Tuple[str, datetime]:
+        """Create a cache for `system_prompt`; returns (cache name, expiry)."""
+
+    def supports(self, model_name: str, system_prompt: str) -> bool:
+        return True
+
+    async def cached_content(self, model_name: str, system_prompt: str) -> Optional[str]:
+        if not self.supports(model_name, system_prompt):
+            return None
+        key = hashlib.sha256(f"{model_name}\n{system_prompt}".encode("utf-8")).hexdigest()
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] - datetime.now(timezone.utc) > PROMPT_CACHE_EXPIRY_MARGIN:
+                return entry[0]
+            try:
+                name, expires = await self._create(model_name, system_prompt)
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.warning(f"Could not create prompt cache for {model_name}, sending the prompt uncached: {e!r}")
+                return None
+            self._entries[key] = (name, expires)
+            self.stats["created"] += 1
+            logger.info(f"Created prompt cache {name} for {model_name} (expires {expires:%H:%M:%S} UTC)")
+            return name
+
+    def record_usage(self, usage, cached: bool):
+        """Count a finished request; `usage` is a pydantic-ai RunUsage."""
+        self.stats["requests"] += 1
+        self.stats["cached_requests"] += int(cached)
+        self.stats["input_tokens"] += usage.input_tokens or 0
+        self.stats["cache_read_tokens"] += usage.cache_read_tokens or 0
+
+    def log_report(self, label: str):
+        input_tokens = self.stats["input_tokens"]
+        share = f"{self.stats['cache_read_tokens'] / input_tokens:.0%}" if input_tokens else "n/a"
+        logger.info(
+            f"Prompt cache ({label}): {self.stats['cached_requests']}/{self.stats['requests']} requests cached, "
+            f"{self.stats['cache_read_tokens']}/{input_tokens} input tokens read from cache ({share}), "
+            f"caches created={self.stats['created']} failed={self.stats['failed']}"
+        )
+
+
+class GeminiPromptCache(PromptCache):
+    """Context caching through the Gemini Caches API."""
+
+    restricts_tools = True
+
+    def supports(self, model_name: str, system_prompt: str) -> bool:
+        provider = model_name.split(":", 1)[0] if ":" in model_name else ""
+        return provider in CACHE_PROVIDERS and estimate_tokens(system_prompt) >= PROMPT_CACHE_MIN_TOKENS
+
+    async def _create(self, model_name: str, system_prompt: str) -> Tuple[str, datetime]:
+        from google.genai import types
+
+        cache = await get_genai_client().aio.caches.create(
+            model=model_name.split(":", 1)[1],
+            config=types.CreateCachedContentConfig(
+                system_instruction=system_prompt,
+                ttl=f"{int(self.ttl.total_seconds())}s",
+                display_name="tender-overview-prompt",
+            ),
+        )
+        return cache.name, cache.expire_time or datetime.now(timezone.utc) + self.ttl
+
+
+class StubPromptCache(PromptCache):
+    """In-process fake: hands out cache names without calling any provider."""
+
+    def __init__(self, ttl: timedelta = PROMPT_CACHE_TTL):
+        super().__init__(ttl)
+        self.prompts: Dict[str, str] = {}
+
+    async def _create(self, model_name: str, system_prompt: str) -> Tuple[str, datetime]:
+        name = f"cachedContents/stub-{len(self.prompts) + 1}"
+        self.prompts[name] = system_prompt
+        return name, datetime.now(timezone.utc) + self.ttl
+
+
+_prompt_cache: Optional[PromptCache] = None
+
+
+def get_prompt_cache() -> Optional[PromptCache]:
+    """Process-wide prompt cache for the configured backend; None when caching is off."""
+    global _prompt_cache
+    if _prompt_cache is None and PROMPT_CACHE_BACKEND != "off":
+        _prompt_cache = StubPromptCache() if PROMPT_CACHE_BACKEND == "stub" else GeminiPromptCache()
+    return _prompt_cache
@@ -0,0 +1,54 @@
+import time
+import asyncio
+from collections import deque
+from typing import Optional
+
+from src.logger import logger
+
+
+# Mongolian Cyrillic tokenizes denser than English; ~3 characters per token is a safe estimate
+CHARS_PER_TOKEN = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate for rate limiting and batch packing."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class RateLimiter:
+    """Sliding one-minute window limiting both requests and estimated input tokens."""
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None, window: float = 60.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window = window
+        self._events: deque = deque()  # (timestamp, tokens)
+        self._tokens_in_window = 0
+        self._lock = asyncio.Lock()
+
+    def _prune(self, now: float):
+        while self._events and now - self._events[0][0] >= self.window:
+            _, tokens = self._events.popleft()
+            self._tokens_in_window -= tokens
+
+    def _has_capacity(self, tokens: int) -> bool:
+        if self.requests_per_minute and len(self._events) >= self.requests_per_minute:
+            return False
+        # A single oversized request is still let through once the window is empty
+        if self.tokens_per_minute and self._events and self._tokens_in_window + tokens > self.tokens_per_minute:
+            return False
+        return True
+
+    async def acquire(self, tokens: int = 0):
+        """Wait until one more request of `tokens` estimated tokens fits in the window."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._prune(now)
+                if self._has_capacity(tokens):
+                    self._events.append((now, tokens))
+                    self._tokens_in_window += tokens
+                    return
+                wait = self._events[0][0] + self.window - now
+                logger.debug(f"Rate limit reached, waiting {wait:.1f}s")
+                await asyncio.sleep(max(wait, 0.05))
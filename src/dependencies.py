@@ -1,15 +1,61 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from dotenv import load_dotenv
 import os
 
+from schemas.lvl_schema import build_code_reference
+from src.repositories.classification_cache import ClassificationCacheRepository, content_hash
+from src.repositories.job_repository import JobRepository
+from src.repositories.models import Base, upgrade_schema
+from src.repositories.pdf_manifest import PdfManifestRepository
+from src.repositories.tender_cache import TenderDetailCacheRepository
+
 
 load_dotenv()
 
+_cache_sessionmaker = None
+
 
 def get_cola_sqlalchemy_repository():
     conn_str = os.getenv("DATABASE_URI", "sqlite:///products.db")
     engine = create_engine(conn_str)
     # Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
\ No newline at end of file
+    Session = sessionmaker(bind=engine)
+
+
+def get_cache_session() -> Session:
+    """Open a session on the local cache database, creating or upgrading its tables on first use."""
+    global _cache_sessionmaker
+    if _cache_sessionmaker is None:
+        conn_str = os.getenv("CACHE_DATABASE_URI", "sqlite:///cache/tender_cache.db")
+        if conn_str.startswith("sqlite:///"):
+            db_dir = os.path.dirname(conn_str[len("sqlite:///"):])
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+        engine = create_engine(conn_str)
+        Base.metadata.create_all(engine)
+        upgrade_schema(engine)
+        _cache_sessionmaker = sessionmaker(bind=engine, expire_on_commit=False)
+    return _cache_sessionmaker()
+
+
+def get_tender_cache_repository() -> TenderDetailCacheRepository:
+    return TenderDetailCacheRepository(get_cache_session())
+
+
+def get_pdf_manifest_repository() -> PdfManifestRepository:
+    return PdfManifestRepository(get_cache_session())
+
+
+def get_job_repository() -> JobRepository:
+    return JobRepository(get_cache_session())
+
+
+def get_classification_cache_repository(system_prompt: str, model_name: str) -> ClassificationCacheRepository:
+    return ClassificationCacheRepository(
+        get_cache_session(),
+        system_prompt=system_prompt,
+        model_name=model_name,
+        catalog_hash=content_hash(build_code_reference()),
+    )
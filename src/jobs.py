@@ -0,0 +1,192 @@
+import os
+import time
+import uuid
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from schemas.job_schema import JobEntry, JobStatus, job_dedup_key
+from src.logger import logger
+from src.repositories.job_repository import JobRepository
+
+
+# Jobs executed at once; each one already runs its own concurrent pipeline
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))
+# A job interrupted by a restart is resumed until it has been started this many times
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Minimum seconds between progress writes to the job table
+JOB_PROGRESS_INTERVAL = float(os.getenv("JOB_PROGRESS_INTERVAL_SECONDS", "2"))
+
+# Job table reads and writes run on this one thread: SQLite stays off the event loop and the
+# repository's session is never used from two threads at once
+_db_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _db_submit(fn, *args, **kwargs) -> Future:
+    global _db_executor
+    if _db_executor is None:
+        _db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-table")
+    return _db_executor.submit(fn, *args, **kwargs)
+
+
+async def _db_call(fn, *args, **kwargs):
+    return await asyncio.wrap_future(_db_submit(fn, *args, **kwargs))
+
+
+class JobProgress:
+    """Progress sink handed to a job handler; snapshots are written to the job table, throttled.
+
+    `update` never waits for the write: it is queued on the job table thread.
+    """
+
+    def __init__(self, repository: JobRepository, job_id: str, interval: float = JOB_PROGRESS_INTERVAL):
+        self.repository = repository
+        self.job_id = job_id
+        self.interval = interval
+        self.snapshot: dict = {}
+        self._last_write = 0.0
+        self._pending: Optional[Future] = None
+
+    def update(self, stage: Optional[str] = None, force: bool = False, **values):
+        if stage is not None:
+            self.snapshot["stage"] = stage
+        self.snapshot.update(values)
+        self.snapshot["updated_at"] = datetime.utcnow().isoformat(timespec="seconds")
+        now = time.monotonic()
+        if force or now - self._last_write >= self.interval:
+            self._last_write = now
+            self._pending = _db_submit(self._write, dict(self.snapshot))
+
+    def _write(self, snapshot: dict):
+        try:
+            self.repository.set_progress(self.job_id, snapshot)
+        except Exception as e:
+            self.repository.db_session.rollback()
+            logger.warning(f"Could not record progress of job {self.job_id}: {e}")
+
+    async def flush(self):
+        """Wait until the latest snapshot is in the job table."""
+        if self._pending is not None:
+            await asyncio.wrap_future(self._pending)
+
+    def pipeline(self, stage_stats: dict):
+        """`run_pipeline` progress callback: per-stage processed/failed counts."""
+        self.update(
+            stages={
+                name: {"processed": stats["processed"], "failed": stats["failed"]}
+                for name, stats in stage_stats.items()
+            }
+        )
+
+
+# (date_from, date_to, progress, export formats) -> result
+JobHandler = Callable[[str, str, JobProgress, List[str]], Awaitable[dict]]
+
+
+class JobManager:
+    """Runs submitted jobs on a pool of asyncio workers, persisting their state in the job table.
+
+    A submission for a kind, date range and export formats that already has a queued or
+    running job returns that job instead of creating a new one. On start, jobs left queued or running by a
+    previous process are queued again.
+    """
+
+    def __init__(self, repository: JobRepository, workers: int = JOB_WORKERS, max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.repository = repository
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.handlers: Dict[str, JobHandler] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._submit_lock = asyncio.Lock()
+
+    def register(self, kind: str, handler: JobHandler):
+        self.handlers[kind] = handler
+
+    async def submit(
+        self, kind: str, date_from: str, date_to: str, formats: Optional[List[str]] = None
+    ) -> Tuple[JobEntry, bool]:
+        """Queue a job; returns (job, coalesced) where coalesced means an existing job was returned."""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        formats = formats or []
+        async with self._submit_lock:
+            existing = await _db_call(self.repository.find_active, job_dedup_key(kind, date_from, date_to, formats))
+            if existing is not None:
+                logger.info(f"Job {kind} {date_from}..{date_to} already {existing.status.value} as {existing.id}")
+                return existing, True
+            job = await _db_call(
+                self.repository.create,
+                JobEntry(id=uuid.uuid4().hex, kind=kind, date_from=date_from, date_to=date_to, formats=formats)
+            )
+        await self._queue.put(job.id)
+        logger.info(f"Queued job {job.id}: {kind} {date_from}..{date_to}")
+        return job, False
+
+    async def get_job(self, job_id: str) -> Optional[JobEntry]:
+        return await _db_call(self.repository.get_by_id, job_id)
+
+    async def list_jobs(self, limit: int = 50) -> List[JobEntry]:
+        return await _db_call(self.repository.get_all, limit)
+
+    async def start(self):
+        for job in await _db_call(self.repository.unfinished):
+            if job.status == JobStatus.RUNNING and job.attempts >= self.max_attempts:
+                await _db_call(self.repository.finish, job.id, JobStatus.FAILED, error=f"Interrupted {job.attempts} times, giving up")
+                continue
+            job.status = JobStatus.QUEUED
+            await _db_call(self.repository.update, job.id, job)
+            await self._queue.put(job.id)
+            logger.info(f"Resuming job {job.id}: {job.kind} {job.date_from}..{job.date_to} (attempts so far: {job.attempts})")
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+        logger.info(f"Job manager started with {self.workers} workers")
+
+    async def stop(self):
+        """Cancel the workers; a cancelled job stays running in the table and is resumed on next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, number: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # A job table error must not take the worker down with it
+                logger.error(f"Job worker {number} could not run job {job_id}: {e}", exc_info=True)
+                try:
+                    await _db_call(self._fail_after_error, job_id, f"Job manager error: {e}")
+                except Exception as record_error:
+                    logger.error(f"Could not mark job {job_id} failed: {record_error}")
+            finally:
+                self._queue.task_done()
+
+    def _fail_after_error(self, job_id: str, error: str):
+        self.repository.db_session.rollback()
+        self.repository.finish(job_id, JobStatus.FAILED, error=error)
+
+    async def _run(self, job_id: str):
+        job = await _db_call(self.repository.mark_running, job_id)
+        if job is None:
+            return
+        progress = JobProgress(self.repository, job_id)
+        progress.update("started", force=True)
+        started = time.perf_counter()
+        logger.info(f"Job {job_id} started: {job.kind} {job.date_from}..{job.date_to} (attempt {job.attempts})")
+        try:
+            result = await self.handlers[job.kind](job.date_from, job.date_to, progress, job.formats)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job {job_id} failed after {time.perf_counter() - started:.1f}s: {e}", exc_info=True)
+            progress.update("failed", force=True)
+            await _db_call(self.repository.finish, job_id, JobStatus.FAILED, error=str(e))
+            return
+        progress.update("finished", force=True)
+        await _db_call(self.repository.finish, job_id, JobStatus.SUCCEEDED, result=result)
+        logger.info(f"Job {job_id} succeeded in {time.perf_counter() - started:.1f}s")
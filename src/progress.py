@@ -0,0 +1,47 @@
+import time
+from typing import Optional
+
+from src.logger import logger
+
+
+class ProgressTracker:
+    """Counts finished items out of a known total and logs progress with an ETA."""
+
+    def __init__(self, label: str, total: int):
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def eta(self) -> Optional[float]:
+        if not self.done or self.done >= self.total:
+            return None
+        return self.elapsed / self.done * (self.total - self.done)
+
+    def advance(self, succeeded: bool = True, item: str = ""):
+        """Record one finished item and log the running totals."""
+        self.done += 1
+        if not succeeded:
+            self.failed += 1
+        eta = self.eta()
+        logger.info(
+            f"[{self.label}] {self.done}/{self.total}"
+            + (f" ({self.failed} failed)" if self.failed else "")
+            + f", {self.elapsed:.1f}s elapsed"
+            + (f", ~{eta:.0f}s left" if eta is not None else "")
+            + (f": {item}" if item else "")
+        )
+
+    def summary(self) -> dict:
+        return {
+            "label": self.label,
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed, 2),
+        }
@@ -0,0 +1,150 @@
+import json
+import hashlib
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from schemas.cache_schema import ClassificationEntry
+from schemas.lvl_schema import TenderOverview
+from src.logger import logger
+from src.repositories.database import DatabaseRepository
+from src.repositories.models import ClassificationRecord
+
+
+# Bumped when entries written by earlier versions must no longer be served
+# (2: tiered runs had stored fast-tier results under the main model's key)
+CACHE_KEY_VERSION = 2
+
+
+def _normalize(value):
+    """Drop empty values and surrounding whitespace so cosmetic differences share a key."""
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items() if v is not None and v != ""}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def content_hash(*parts) -> str:
+    payload = json.dumps([_normalize(part) for part in parts], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ClassificationCacheRepository(DatabaseRepository):
+    """Cache of validated TenderOverview results keyed by input, system prompt and model.
+
+    Entries written against a different code catalog (`build_code_reference()` output)
+    are purged on construction.
+    """
+
+    def __init__(self, db_session: Session, system_prompt: str, model_name: str, catalog_hash: str):
+        super().__init__(db_session)
+        self.system_prompt = system_prompt
+        self.model_name = model_name
+        self.catalog_hash = catalog_hash
+        self.hits = 0
+        self.misses = 0
+        # Hit counts per key, written by flush_hits() so reads never open a write transaction
+        self._pending_hits: Counter = Counter()
+        self._invalidate_stale_catalog()
+
+    def _invalidate_stale_catalog(self):
+        result = self.db_session.execute(
+            delete(ClassificationRecord).where(ClassificationRecord.catalog_hash != self.catalog_hash)
+        )
+        self.db_session.commit()
+        if result.rowcount:
+            logger.info(f"Code catalog changed: invalidated {result.rowcount} cached classifications")
+
+    def make_key(self, input_data: dict) -> str:
+        return content_hash(input_data, self.system_prompt, self.model_name, CACHE_KEY_VERSION)
+
+    def get_by_id(self, record_id: str) -> Optional[TenderOverview]:
+        record = self.db_session.get(ClassificationRecord, record_id)
+        if record is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._pending_hits[record_id] += 1
+        return TenderOverview.model_validate_json(record.overview_json)
+
+    def get_many(self, record_ids: List[str]) -> List[Optional[TenderOverview]]:
+        """get_by_id for several keys in one query; results line up with `record_ids`."""
+        records = {
+            record.key: record
+            for record in self.db_session.scalars(
+                select(ClassificationRecord).where(ClassificationRecord.key.in_(set(record_ids)))
+            )
+        }
+        results = []
+        for record_id in record_ids:
+            record = records.get(record_id)
+            if record is None:
+                self.misses += 1
+                results.append(None)
+                continue
+            self.hits += 1
+            self._pending_hits[record_id] += 1
+            results.append(TenderOverview.model_validate_json(record.overview_json))
+        return results
+
+    def get_all(self) -> List[TenderOverview]:
+        records = self.db_session.scalars(select(ClassificationRecord)).all()
+        return [TenderOverview.model_validate_json(record.overview_json) for record in records]
+
+    def create(self, obj_in: ClassificationEntry) -> TenderOverview:
+        return self.upsert(obj_in.key, obj_in.overview)
+
+    def update(self, record_id: str, obj_in: TenderOverview) -> TenderOverview:
+        return self.upsert(record_id, obj_in)
+
+    def upsert(self, record_id: str, obj_in: TenderOverview) -> TenderOverview:
+        self._stage(record_id, obj_in)
+        self.db_session.commit()
+        return obj_in
+
+    def upsert_many(self, entries: Dict[str, TenderOverview]) -> None:
+        """upsert several entries in one transaction."""
+        for record_id, obj_in in entries.items():
+            self._stage(record_id, obj_in)
+        self.db_session.commit()
+
+    def _stage(self, record_id: str, obj_in: TenderOverview):
+        record = self.db_session.get(ClassificationRecord, record_id)
+        if record is None:
+            record = ClassificationRecord(key=record_id, hits=0, created_at=datetime.utcnow())
+            self.db_session.add(record)
+        record.catalog_hash = self.catalog_hash
+        record.model_name = self.model_name
+        record.overview_json = obj_in.model_dump_json()
+
+    def flush_hits(self) -> None:
+        """Persist the hit counts gathered by get_by_id in one transaction."""
+        if not self._pending_hits:
+            return
+        records = self.db_session.scalars(
+            select(ClassificationRecord).where(ClassificationRecord.key.in_(list(self._pending_hits)))
+        ).all()
+        for record in records:
+            record.hits = (record.hits or 0) + self._pending_hits[record.key]
+        self._pending_hits.clear()
+        self.db_session.commit()
+
+    def delete(self, record_id: str) -> None:
+        record = self.db_session.get(ClassificationRecord, record_id)
+        if record is not None:
+            self.db_session.delete(record)
+            self.db_session.commit()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
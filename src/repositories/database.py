@@ -7,6 +7,16 @@ class DatabaseRepository(ABC):
     def __init__(self, db_session: Session):
         self.db_session = db_session
 
+    def close(self):
+        """Close the session and return its connection to the pool."""
+        self.db_session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     @abstractmethod
     def get_by_id(self, record_id: int) -> Any:
         pass
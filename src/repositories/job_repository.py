@@ -0,0 +1,128 @@
+import json
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from schemas.job_schema import JobEntry, JobStatus
+from src.repositories.database import DatabaseRepository
+from src.repositories.models import JobRecord
+
+
+ACTIVE_STATUSES = (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+
+
+class JobRepository(DatabaseRepository):
+    """SQLite-backed job table for the background processing queue."""
+
+    def __init__(self, db_session: Session):
+        super().__init__(db_session)
+
+    @staticmethod
+    def _to_entry(record: JobRecord) -> JobEntry:
+        return JobEntry(
+            id=record.id,
+            kind=record.kind,
+            date_from=record.date_from,
+            date_to=record.date_to,
+            formats=[f for f in (record.formats or "").split(",") if f],
+            status=JobStatus(record.status),
+            progress=json.loads(record.progress_json or "{}"),
+            result=json.loads(record.result_json) if record.result_json else None,
+            error=record.error,
+            attempts=record.attempts,
+            created_at=record.created_at,
+            started_at=record.started_at,
+            finished_at=record.finished_at,
+        )
+
+    def get_by_id(self, record_id: str) -> Optional[JobEntry]:
+        record = self.db_session.get(JobRecord, record_id)
+        return self._to_entry(record) if record else None
+
+    def get_all(self, limit: int = 50) -> List[JobEntry]:
+        records = self.db_session.scalars(
+            select(JobRecord).order_by(JobRecord.created_at.desc()).limit(limit)
+        ).all()
+        return [self._to_entry(record) for record in records]
+
+    def create(self, obj_in: JobEntry) -> JobEntry:
+        record = JobRecord(
+            id=obj_in.id,
+            kind=obj_in.kind,
+            dedup_key=obj_in.dedup_key,
+            date_from=obj_in.date_from,
+            date_to=obj_in.date_to,
+            formats=",".join(obj_in.formats),
+            status=obj_in.status.value,
+            progress_json=json.dumps(obj_in.progress, ensure_ascii=False, default=str),
+            result_json=None,
+            error=None,
+            attempts=obj_in.attempts,
+            created_at=obj_in.created_at,
+        )
+        self.db_session.add(record)
+        self.db_session.commit()
+        return obj_in
+
+    def update(self, record_id: str, obj_in: JobEntry) -> Optional[JobEntry]:
+        record = self.db_session.get(JobRecord, record_id)
+        if record is None:
+            return None
+        record.status = obj_in.status.value
+        record.progress_json = json.dumps(obj_in.progress, ensure_ascii=False, default=str)
+        record.result_json = json.dumps(obj_in.result, ensure_ascii=False, default=str) if obj_in.result is not None else None
+        record.error = obj_in.error
+        record.attempts = obj_in.attempts
+        record.started_at = obj_in.started_at
+        record.finished_at = obj_in.finished_at
+        self.db_session.commit()
+        return self._to_entry(record)
+
+    def delete(self, record_id: str) -> None:
+        record = self.db_session.get(JobRecord, record_id)
+        if record is not None:
+            self.db_session.delete(record)
+            self.db_session.commit()
+
+    def find_active(self, dedup_key: str) -> Optional[JobEntry]:
+        record = self.db_session.scalars(
+            select(JobRecord)
+            .where(JobRecord.dedup_key == dedup_key, JobRecord.status.in_(ACTIVE_STATUSES))
+            .order_by(JobRecord.created_at)
+            .limit(1)
+        ).first()
+        return self._to_entry(record) if record else None
+
+    def mark_running(self, record_id: str) -> Optional[JobEntry]:
+        record = self.db_session.get(JobRecord, record_id)
+        if record is None:
+            return None
+        record.status = JobStatus.RUNNING.value
+        record.attempts += 1
+        record.started_at = datetime.utcnow()
+        self.db_session.commit()
+        return self._to_entry(record)
+
+    def set_progress(self, record_id: str, progress: dict) -> None:
+        record = self.db_session.get(JobRecord, record_id)
+        if record is not None:
+            record.progress_json = json.dumps(progress, ensure_ascii=False, default=str)
+            self.db_session.commit()
+
+    def finish(self, record_id: str, status: JobStatus, result: Optional[dict] = None, error: Optional[str] = None) -> None:
+        record = self.db_session.get(JobRecord, record_id)
+        if record is not None:
+            record.status = status.value
+            record.result_json = json.dumps(result, ensure_ascii=False, default=str) if result is not None else None
+            record.error = error
+            record.finished_at = datetime.utcnow()
+            self.db_session.commit()
+
+    def unfinished(self) -> List[JobEntry]:
+        """Queued and running jobs, oldest first; running ones were interrupted by a restart."""
+        records = self.db_session.scalars(
+            select(JobRecord).where(JobRecord.status.in_(ACTIVE_STATUSES)).order_by(JobRecord.created_at)
+        ).all()
+        return [self._to_entry(record) for record in records]
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Engine, Integer, String, Text, inspect, text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class TenderDetailRecord(Base):
+    """Cached DETAIL_URL body for one tenderDocumentId, plus its markdown conversion."""
+    __tablename__ = "tender_detail_cache"
+
+    document_id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    invitation_id: Mapped[str | None] = mapped_column(String(32), index=True)
+    detail_url: Mapped[str] = mapped_column(Text, default="")
+    raw_body: Mapped[str] = mapped_column(Text, default="")
+    markdown: Mapped[str] = mapped_column(Text, default="")
+    etag: Mapped[str | None] = mapped_column(String(255))
+    last_modified: Mapped[str | None] = mapped_column(String(64))
+    fetched_at: Mapped[datetime] = mapped_column(DateTime)
+    validated_at: Mapped[datetime] = mapped_column(DateTime)
+    hits: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class ClassificationRecord(Base):
+    """Validated TenderOverview cached under a hash of (input, system prompt, model)."""
+    __tablename__ = "classification_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    catalog_hash: Mapped[str] = mapped_column(String(64), index=True)
+    model_name: Mapped[str] = mapped_column(String(128))
+    overview_json: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    hits: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class PdfManifestRecord(Base):
+    """One tender attachment URL and the content-addressed store entry it resolved to."""
+    __tablename__ = "pdf_manifest"
+
+    tender_number: Mapped[str] = mapped_column(String(32), primary_key=True)
+    url: Mapped[str] = mapped_column(String(1024), primary_key=True)
+    sha256: Mapped[str] = mapped_column(String(64), index=True)
+    size: Mapped[int] = mapped_column(Integer)
+    etag: Mapped[str | None] = mapped_column(String(255))
+    last_modified: Mapped[str | None] = mapped_column(String(64))
+    fetched_at: Mapped[datetime] = mapped_column(DateTime)
+    validated_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class JobRecord(Base):
+    """A background processing job; survives restarts so unfinished jobs can be resumed."""
+    __tablename__ = "jobs"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(64))
+    dedup_key: Mapped[str] = mapped_column(String(160), index=True)
+    date_from: Mapped[str] = mapped_column(String(10))
+    date_to: Mapped[str] = mapped_column(String(10))
+    # Comma-separated export formats
+    formats: Mapped[str] = mapped_column(String(64), default="")
+    status: Mapped[str] = mapped_column(String(16), index=True)
+    progress_json: Mapped[str] = mapped_column(Text, default="{}")
+    result_json: Mapped[str | None] = mapped_column(Text)
+    error: Mapped[str | None] = mapped_column(Text)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+
+# Columns added after their table first shipped: (table, column, DDL). create_all never alters an
+# existing table, so these are added on startup to databases created before them.
+ADDED_COLUMNS = [
+    ("jobs", "formats", "VARCHAR(64) NOT NULL DEFAULT ''"),
+]
+
+
+def upgrade_schema(engine: Engine):
+    """Add any ADDED_COLUMNS missing from existing tables."""
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for table, column, ddl in ADDED_COLUMNS:
+            if table not in tables or column in {c["name"] for c in inspector.get_columns(table)}:
+                continue
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
@@ -0,0 +1,84 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from schemas.cache_schema import PdfManifestEntry
+from src.repositories.database import DatabaseRepository
+from src.repositories.models import PdfManifestRecord
+
+
+# Attachments rarely change after publication; within this window the store copy is used without asking
+PDF_MANIFEST_TTL = timedelta(hours=float(os.getenv("PDF_MANIFEST_TTL_HOURS", "168")))
+
+
+class PdfManifestRepository(DatabaseRepository):
+    """SQLite-backed manifest of (tender, attachment URL) -> PDF store entry."""
+
+    def __init__(self, db_session: Session, ttl: timedelta = PDF_MANIFEST_TTL):
+        super().__init__(db_session)
+        self.ttl = ttl
+
+    def get_by_id(self, record_id: Tuple[str, str]) -> Optional[PdfManifestEntry]:
+        tender_number, url = record_id
+        record = self.db_session.get(PdfManifestRecord, (str(tender_number), url))
+        return PdfManifestEntry.model_validate(record) if record else None
+
+    def get_by_sha256(self, sha256: str) -> List[PdfManifestEntry]:
+        records = self.db_session.scalars(
+            select(PdfManifestRecord).where(PdfManifestRecord.sha256 == sha256)
+        ).all()
+        return [PdfManifestEntry.model_validate(record) for record in records]
+
+    def get_all(self) -> List[PdfManifestEntry]:
+        records = self.db_session.scalars(select(PdfManifestRecord)).all()
+        return [PdfManifestEntry.model_validate(record) for record in records]
+
+    def create(self, obj_in: PdfManifestEntry) -> PdfManifestEntry:
+        return self.upsert(obj_in)
+
+    def update(self, record_id: Tuple[str, str], obj_in: PdfManifestEntry) -> PdfManifestEntry:
+        tender_number, url = record_id
+        return self.upsert(obj_in.model_copy(update={"tender_number": str(tender_number), "url": url}))
+
+    def upsert(self, obj_in: PdfManifestEntry) -> PdfManifestEntry:
+        record = self.db_session.get(PdfManifestRecord, (obj_in.tender_number, obj_in.url))
+        values = obj_in.model_dump()
+        if record is None:
+            record = PdfManifestRecord(**values)
+            self.db_session.add(record)
+        else:
+            for key, value in values.items():
+                setattr(record, key, value)
+        self.db_session.commit()
+        return obj_in
+
+    def mark_validated(self, record_id: Tuple[str, str]) -> None:
+        """Record a successful revalidation (304) without touching the stored file."""
+        tender_number, url = record_id
+        record = self.db_session.get(PdfManifestRecord, (str(tender_number), url))
+        if record is not None:
+            record.validated_at = datetime.utcnow()
+            self.db_session.commit()
+
+    def delete(self, record_id: Tuple[str, str]) -> None:
+        tender_number, url = record_id
+        record = self.db_session.get(PdfManifestRecord, (str(tender_number), url))
+        if record is not None:
+            self.db_session.delete(record)
+            self.db_session.commit()
+
+    def is_fresh(self, entry: PdfManifestEntry) -> bool:
+        return datetime.utcnow() - entry.validated_at < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: Optional[PdfManifestEntry]) -> dict:
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
@@ -0,0 +1,84 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from schemas.cache_schema import TenderDetailEntry
+from src.repositories.database import DatabaseRepository
+from src.repositories.models import TenderDetailRecord
+
+
+TENDER_CACHE_TTL = timedelta(hours=float(os.getenv("TENDER_CACHE_TTL_HOURS", "24")))
+
+
+class TenderDetailCacheRepository(DatabaseRepository):
+    """SQLite-backed cache of tender detail bodies keyed by tenderDocumentId."""
+
+    def __init__(self, db_session: Session, ttl: timedelta = TENDER_CACHE_TTL):
+        super().__init__(db_session)
+        self.ttl = ttl
+
+    def get_by_id(self, record_id) -> Optional[TenderDetailEntry]:
+        record = self.db_session.get(TenderDetailRecord, str(record_id))
+        return TenderDetailEntry.model_validate(record) if record else None
+
+    def get_by_invitation_id(self, invitation_id) -> Optional[TenderDetailEntry]:
+        if invitation_id is None:
+            return None
+        record = self.db_session.scalars(
+            select(TenderDetailRecord)
+            .where(TenderDetailRecord.invitation_id == str(invitation_id))
+            .order_by(TenderDetailRecord.fetched_at.desc())
+        ).first()
+        return TenderDetailEntry.model_validate(record) if record else None
+
+    def get_all(self) -> List[TenderDetailEntry]:
+        records = self.db_session.scalars(select(TenderDetailRecord)).all()
+        return [TenderDetailEntry.model_validate(record) for record in records]
+
+    def create(self, obj_in: TenderDetailEntry) -> TenderDetailEntry:
+        return self.upsert(obj_in)
+
+    def update(self, record_id, obj_in: TenderDetailEntry) -> TenderDetailEntry:
+        return self.upsert(obj_in.model_copy(update={"document_id": str(record_id)}))
+
+    def upsert(self, obj_in: TenderDetailEntry) -> TenderDetailEntry:
+        record = self.db_session.get(TenderDetailRecord, obj_in.document_id)
+        values = obj_in.model_dump()
+        if record is None:
+            record = TenderDetailRecord(**values)
+            self.db_session.add(record)
+        else:
+            for key, value in values.items():
+                setattr(record, key, value)
+        self.db_session.commit()
+        return obj_in
+
+    def mark_validated(self, record_id) -> None:
+        """Record a successful revalidation (304 or unchanged body) without rewriting the body."""
+        record = self.db_session.get(TenderDetailRecord, str(record_id))
+        if record is not None:
+            record.validated_at = datetime.utcnow()
+            record.hits = (record.hits or 0) + 1
+            self.db_session.commit()
+
+    def delete(self, record_id) -> None:
+        record = self.db_session.get(TenderDetailRecord, str(record_id))
+        if record is not None:
+            self.db_session.delete(record)
+            self.db_session.commit()
+
+    def is_fresh(self, entry: TenderDetailEntry) -> bool:
+        return datetime.utcnow() - entry.validated_at < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: Optional[TenderDetailEntry]) -> dict:
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
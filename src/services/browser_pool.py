@@ -0,0 +1,203 @@
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+
+from src.logger import logger
+from src.services.request_policy import RequestStats, get_request_policy
+
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_CONTEXTS_PER_BROWSER = int(os.getenv("BROWSER_CONTEXTS_PER_BROWSER", "3"))
+# Recycle a browser after this many pages to bound Chromium memory growth
+BROWSER_MAX_PAGES_PER_BROWSER = int(os.getenv("BROWSER_MAX_PAGES_PER_BROWSER", "200"))
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36"
+LAUNCH_ARGS = ['--disable-dev-shm-usage', '--no-sandbox']
+
+
+class _BrowserSlot:
+    """One Chromium process plus its idle, reusable contexts."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.browser: Optional[Browser] = None
+        self.idle_contexts: List[BrowserContext] = []
+        self.active = 0
+        self.pages_served = 0
+        self.condition = asyncio.Condition()
+
+
+class BrowserPool:
+    """Fixed set of browsers, each lending up to `contexts_per_browser` contexts at a time.
+
+    Contexts are reused across pages; a browser is drained and relaunched once it has
+    served `max_pages_per_browser` pages.
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        contexts_per_browser: int = BROWSER_CONTEXTS_PER_BROWSER,
+        max_pages_per_browser: int = BROWSER_MAX_PAGES_PER_BROWSER,
+    ):
+        self.size = max(1, size)
+        self.contexts_per_browser = max(1, contexts_per_browser)
+        self.max_pages_per_browser = max(1, max_pages_per_browser)
+        self._playwright: Optional[Playwright] = None
+        self._slots = [_BrowserSlot(i) for i in range(self.size)]
+        self._leases: Optional[asyncio.Queue] = None
+        self._start_lock = asyncio.Lock()
+        # Counters of the run currently leasing each context
+        self._context_stats: Dict[BrowserContext, RequestStats] = {}
+
+    @property
+    def started(self) -> bool:
+        return self._playwright is not None
+
+    async def start(self):
+        """Start Playwright and launch every browser in the pool."""
+        async with self._start_lock:
+            if self.started:
+                return
+            self._playwright = await async_playwright().start()
+            self._leases = asyncio.Queue()
+            # Interleave slot indexes so consecutive leases spread across browsers
+            for _ in range(self.contexts_per_browser):
+                for slot in self._slots:
+                    self._leases.put_nowait(slot.index)
+            for slot in self._slots:
+                await self._ensure_browser(slot)
+            logger.info(
+                f"Browser pool started: {self.size} browsers x {self.contexts_per_browser} contexts, "
+                f"recycle after {self.max_pages_per_browser} pages"
+            )
+
+    async def close(self):
+        """Close every browser and stop Playwright."""
+        async with self._start_lock:
+            for slot in self._slots:
+                await self._close_slot(slot)
+            if self._playwright:
+                try:
+                    await self._playwright.stop()
+                except Exception:
+                    pass
+                self._playwright = None
+                self._leases = None
+                logger.info("Browser pool closed")
+
+    async def _ensure_browser(self, slot: _BrowserSlot) -> Browser:
+        if slot.browser is None or not slot.browser.is_connected():
+            slot.idle_contexts.clear()
+            slot.pages_served = 0
+            slot.browser = await self._playwright.chromium.launch(args=LAUNCH_ARGS)
+            logger.info(f"Launched browser #{slot.index}")
+        return slot.browser
+
+    async def _close_slot(self, slot: _BrowserSlot):
+        for context in slot.idle_contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        slot.idle_contexts.clear()
+        if slot.browser:
+            try:
+                await slot.browser.close()
+            except Exception:
+                pass
+            slot.browser = None
+        slot.pages_served = 0
+
+    async def new_context(self, browser: Browser) -> BrowserContext:
+        context = await browser.new_context(user_agent=USER_AGENT)
+        # Skip images, fonts, stylesheets and analytics; we only read the DOM
+        policy = get_request_policy()
+        await context.route("**/*", lambda route: policy.handle(route, self._context_stats.get(context)))
+        return context
+
+    @asynccontextmanager
+    async def page(self, request_stats: Optional[RequestStats] = None) -> AsyncIterator[Page]:
+        """Lease a fresh page in a reused context; the context returns to the pool on exit.
+
+        The page's requests are counted in `request_stats` when given.
+        """
+        if not self.started:
+            await self.start()
+        leases = self._leases
+        index = await leases.get()
+        slot = self._slots[index]
+        context: Optional[BrowserContext] = None
+        page: Optional[Page] = None
+        healthy = False
+        try:
+            async with slot.condition:
+                if slot.browser is not None and slot.pages_served >= self.max_pages_per_browser:
+                    # Wait for in-flight pages on this browser to finish, then relaunch it
+                    await slot.condition.wait_for(lambda: slot.active == 0)
+                    if slot.pages_served >= self.max_pages_per_browser:
+                        logger.info(f"Recycling browser #{slot.index} after {slot.pages_served} pages")
+                        await self._close_slot(slot)
+                browser = await self._ensure_browser(slot)
+                context = slot.idle_contexts.pop() if slot.idle_contexts else None
+                slot.active += 1
+
+            try:
+                if context is None:
+                    context = await self.new_context(browser)
+                if request_stats is not None:
+                    self._context_stats[context] = request_stats
+                page = await context.new_page()
+                yield page
+                healthy = True
+            finally:
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception:
+                        healthy = False
+                if context is not None:
+                    self._context_stats.pop(context, None)
+                async with slot.condition:
+                    slot.active -= 1
+                    slot.pages_served += 1
+                    if context is not None:
+                        # Only reuse contexts that finished cleanly on the current browser
+                        if healthy and browser is slot.browser and browser.is_connected():
+                            slot.idle_contexts.append(context)
+                        else:
+                            try:
+                                await context.close()
+                            except Exception:
+                                pass
+                    slot.condition.notify_all()
+        finally:
+            leases.put_nowait(index)
+
+
+# Global pool instance shared by every scraper
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get or create the shared browser pool (started lazily on first page lease)."""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+
+async def start_browser_pool():
+    """Start the shared browser pool ahead of the first scrape."""
+    await get_browser_pool().start()
+
+
+async def close_browser_pool():
+    """Close the shared browser pool."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
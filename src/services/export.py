@@ -0,0 +1,240 @@
+import os
+import csv
+import json
+import typing
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from schemas.lvl_schema import TenderOverview
+from schemas.pdf_schema import PDFFoodOverview, PDFOverview
+from src.logger import logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional; CSV works without it
+    pa = pq = None
+
+
+# Rows buffered per Parquet row group
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "5000"))
+PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "zstd")
+
+
+class ExportFormat(str, Enum):
+    PARQUET = "parquet"
+    CSV = "csv"
+
+
+def parse_formats(value: str) -> List[ExportFormat]:
+    """Parse a comma-separated format list; an unknown format disables the whole setting."""
+    try:
+        return [ExportFormat(f.strip().lower()) for f in value.split(",") if f.strip()]
+    except ValueError:
+        logger.error(
+            f"Ignoring EXPORT_FORMATS={value!r}: expected a comma-separated list of "
+            f"{', '.join(f.value for f in ExportFormat)}"
+        )
+        return []
+
+
+# Formats written when a request doesn't choose any, e.g. EXPORT_FORMATS=parquet,csv
+DEFAULT_EXPORT_FORMATS = parse_formats(os.getenv("EXPORT_FORMATS", ""))
+
+
+@dataclass(frozen=True)
+class ExportField:
+    """A typed export column: kind is string, float, int, bool, list (of `item`) or struct (of `fields`)."""
+    name: str
+    kind: str
+    item: Optional["ExportField"] = None
+    fields: Tuple["ExportField", ...] = ()
+
+
+def _field_from_annotation(name: str, annotation: Any) -> ExportField:
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        return _field_from_annotation(name, args[0])
+    if origin in (list, List):
+        return ExportField(name, "list", item=_field_from_annotation("item", args[0]))
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return ExportField(name, "struct", fields=_model_fields(annotation))
+        if issubclass(annotation, bool):
+            return ExportField(name, "bool")
+        if issubclass(annotation, int) and not issubclass(annotation, Enum):
+            return ExportField(name, "int")
+        if issubclass(annotation, float):
+            return ExportField(name, "float")
+    # str and str-valued enums
+    return ExportField(name, "string")
+
+
+def _model_fields(model: type[BaseModel]) -> Tuple[ExportField, ...]:
+    return tuple(_field_from_annotation(name, info.annotation) for name, info in model.model_fields.items())
+
+
+def _from_model(model: type[BaseModel], column: str, field_name: Optional[str] = None) -> ExportField:
+    return _field_from_annotation(column, model.model_fields[field_name or column].annotation)
+
+
+# Overview rows as built by `build_overview`; each column takes its type from a TenderOverview field.
+# The scraped page body is left out; classification_source marks rows guessed by the code index.
+OVERVIEW_SCHEMA: Tuple[ExportField, ...] = (
+    _from_model(TenderOverview, "name"),
+    _from_model(TenderOverview, "selection_number"),
+    _from_model(TenderOverview, "ordering_organization"),
+    _from_model(TenderOverview, "announced_date"),
+    _from_model(TenderOverview, "deadline_date"),
+    _from_model(TenderOverview, "official_link"),
+    _from_model(TenderOverview, "total_budget"),
+    _from_model(TenderOverview, "budget_type"),
+    _from_model(TenderOverview, "tender_type"),
+    _from_model(TenderOverview, "summary"),
+    _from_model(TenderOverview, "level1", "tender_type"),
+    _from_model(TenderOverview, "tender_category"),
+    _from_model(TenderOverview, "level2", "tender_category"),
+    _from_model(TenderOverview, "tender_category_detail"),
+    _from_model(TenderOverview, "level3", "tender_category_detail"),
+    ExportField("classification_source", "string"),
+)
+
+# PDF results: the overview columns plus the PDFOverview fields. Parts use the food variant,
+# a superset of the plain part fields, so food and software results share one schema.
+PDF_SCHEMA: Tuple[ExportField, ...] = OVERVIEW_SCHEMA + (
+    ExportField("main_category", "string"),
+    _from_model(PDFOverview, "have_parts"),
+    _from_model(PDFFoodOverview, "parts"),
+    _from_model(PDFOverview, "requirements"),
+)
+
+
+def _coerce(value: Any, field: ExportField) -> Any:
+    """Convert a record value to the column's type; values that don't fit become null."""
+    if value is None:
+        return None
+    if isinstance(value, Enum):
+        value = value.value
+    elif isinstance(value, BaseModel):
+        value = value.model_dump()
+    try:
+        if field.kind == "list":
+            items = value if isinstance(value, (list, tuple)) else [value]
+            return [_coerce(item, field.item) for item in items]
+        if field.kind == "struct":
+            if not isinstance(value, dict):
+                return None
+            return {member.name: _coerce(value.get(member.name), member) for member in field.fields}
+        if field.kind == "float":
+            return float(value) if value != "" else None
+        if field.kind == "int":
+            return int(value)
+        if field.kind == "bool":
+            return bool(value)
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+def export_rows(records: Iterable[dict], schema: Tuple[ExportField, ...]) -> Iterator[dict]:
+    for record in records:
+        yield {field.name: _coerce(record.get(field.name), field) for field in schema}
+
+
+def _arrow_type(field: ExportField):
+    if field.kind == "list":
+        return pa.list_(_arrow_type(field.item))
+    if field.kind == "struct":
+        return pa.struct([pa.field(member.name, _arrow_type(member)) for member in field.fields])
+    return {"float": pa.float64(), "int": pa.int64(), "bool": pa.bool_()}.get(field.kind, pa.string())
+
+
+def arrow_schema(schema: Tuple[ExportField, ...]):
+    return pa.schema([pa.field(field.name, _arrow_type(field)) for field in schema])
+
+
+def available_formats() -> List[ExportFormat]:
+    return [f for f in ExportFormat if f != ExportFormat.PARQUET or pa is not None]
+
+
+def write_parquet(records: Iterable[dict], path: str, schema: Tuple[ExportField, ...]) -> int:
+    """Write `records` as Parquet, one row group per EXPORT_BATCH_ROWS rows; returns the row count."""
+    if pa is None:
+        raise RuntimeError("Parquet export needs pyarrow; install it or export CSV instead")
+    target = arrow_schema(schema)
+    count = 0
+    with pq.ParquetWriter(path, target, compression=PARQUET_COMPRESSION) as writer:
+        batch = []
+        for row in export_rows(records, schema):
+            batch.append(row)
+            if len(batch) >= EXPORT_BATCH_ROWS:
+                writer.write_table(pa.Table.from_pylist(batch, schema=target))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=target))
+            count += len(batch)
+    return count
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return value
+
+
+def write_csv(records: Iterable[dict], path: str, schema: Tuple[ExportField, ...]) -> int:
+    """Write `records` as CSV row by row; list and struct columns hold compact JSON. Returns the row count."""
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([field.name for field in schema])
+        for row in export_rows(records, schema):
+            writer.writerow([_csv_value(value) for value in row.values()])
+            count += 1
+    return count
+
+
+WRITERS = {
+    ExportFormat.PARQUET: write_parquet,
+    ExportFormat.CSV: write_csv,
+}
+
+
+def export_records(records: List[dict], base_path: str, formats: Iterable[str], schema: Tuple[ExportField, ...]) -> List[str]:
+    """Write `records` to `base_path` + one extension per format; returns the written paths.
+
+    Each file is written under a temporary name and moved into place, so readers never see a
+    partial export.
+    """
+    paths = []
+    if os.path.dirname(base_path):
+        os.makedirs(os.path.dirname(base_path), exist_ok=True)
+    for export_format in dict.fromkeys(ExportFormat(f) for f in formats):
+        path = f"{base_path}.{export_format.value}"
+        partial = f"{path}.partial"
+        try:
+            rows = WRITERS[export_format](records, partial, schema)
+            os.replace(partial, path)
+        except Exception as e:
+            logger.error(f"Failed to export {path}: {e}", exc_info=True)
+            if os.path.exists(partial):
+                os.remove(partial)
+            continue
+        logger.info(f"Exported {rows} rows to {path}")
+        paths.append(path)
+    return paths
+
+
+def export_overviews(overviews: List[dict], base_path: str, formats: Iterable[str]) -> List[str]:
+    return export_records(overviews, base_path, formats, OVERVIEW_SCHEMA)
+
+
+def export_pdf_results(pdf_results: List[dict], base_path: str, formats: Iterable[str]) -> List[str]:
+    return export_records(pdf_results, base_path, formats, PDF_SCHEMA)
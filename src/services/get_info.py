@@ -1,41 +1,13 @@
 import os
 import json
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, Browser
 from typing import List, Optional
 import re
 from collections import Counter
 import asyncio
 
 from src.logger import logger
-
-# Global browser instance for reuse
-_browser: Optional[Browser] = None
-_playwright = None
-
-
-async def get_browser() -> Browser:
-    """Get or create a shared browser instance for better performance."""
-    global _browser, _playwright
-    if _browser is None or not _browser.is_connected():
-        _playwright = await async_playwright().start()
-        _browser = await _playwright.chromium.launch(
-            args=['--disable-dev-shm-usage', '--no-sandbox']
-        )
-        logger.info("Created new shared browser instance")
-    return _browser
-
-
-async def close_browser():
-    """Close the shared browser instance."""
-    global _browser, _playwright
-    if _browser:
-        await _browser.close()
-        _browser = None
-    if _playwright:
-        await _playwright.stop()
-        _playwright = None
-        logger.info("Closed shared browser instance")
+from src.services.browser_pool import get_browser_pool, close_browser_pool
 
 
 def clean_text(text):
@@ -139,60 +111,50 @@ def get_info_from_html(content):
     return results
 
 
-async def get_info(url: str, output_name: str, max_retries: int = 3, browser: Optional[Browser] = None):
+async def get_info(url: str, output_name: str, max_retries: int = 3):
     """Fetch a job listing page using Playwright and extract jobs.
     
     Args:
         url: The URL to fetch
         output_name: Name for output (not used currently)
         max_retries: Number of retry attempts
-        browser: Optional shared browser instance for better performance
     """
     logger.info(f"Fetching tender info from: {url}")
     
     for attempt in range(max_retries):
         try:
-            # Use shared browser or create a new one
-            if browser is not None:
-                current_browser = browser
-            else:
-                current_browser = await get_browser()
-            
-            context = await current_browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36"
-            )
-            page = await context.new_page()
-            page.on("dialog", lambda dialog: dialog.accept())
-            logger.debug(f"Navigating to URL: {url} (attempt {attempt + 1}/{max_retries})")
-            
-            # Use domcontentloaded instead of load for faster initial response
-            await page.goto(url, timeout=30000, wait_until="domcontentloaded")
-            
-            # Wait for specific content instead of networkidle (much faster)
-            try:
-                await page.wait_for_selector("div.p-4.md\\:p-6.rounded-lg.bg-default-100", timeout=10000)
-            except:
-                # Fallback to shorter networkidle if selector not found
-                await page.wait_for_load_state("networkidle", timeout=15000)
-            
-            logger.debug("Page loaded successfully")
-            
-            # Try to find and click the "Зарлал харах" button with better error handling
-            button = page.get_by_role("button", name="Зарлал харах")
-            
-            # Check if button exists before clicking
-            button_count = await button.count()
-            if button_count > 0:
-                await button.wait_for(state="visible", timeout=5000)
-                await button.click(timeout=5000)
-                logger.debug("Clicked 'Зарлал харах' button successfully")
-            else:
-                # Button doesn't exist - page might already show the content or have different structure
-                logger.warning(f"'Зарлал харах' button not found on page, proceeding with current content")
-            
-            raw_html = await page.content()
+            # Lease a page from the shared browser pool (contexts are reused across pages)
+            async with get_browser_pool().page() as page:
+                page.on("dialog", lambda dialog: dialog.accept())
+                logger.debug(f"Navigating to URL: {url} (attempt {attempt + 1}/{max_retries})")
+                
+                # Use domcontentloaded instead of load for faster initial response
+                await page.goto(url, timeout=30000, wait_until="domcontentloaded")
+                
+                # Wait for specific content instead of networkidle (much faster)
+                try:
+                    await page.wait_for_selector("div.p-4.md\\:p-6.rounded-lg.bg-default-100", timeout=10000)
+                except:
+                    # Fallback to shorter networkidle if selector not found
+                    await page.wait_for_load_state("networkidle", timeout=15000)
+                
+                logger.debug("Page loaded successfully")
+                
+                # Try to find and click the "Зарлал харах" button with better error handling
+                button = page.get_by_role("button", name="Зарлал харах")
+                
+                # Check if button exists before clicking
+                button_count = await button.count()
+                if button_count > 0:
+                    await button.wait_for(state="visible", timeout=5000)
+                    await button.click(timeout=5000)
+                    logger.debug("Clicked 'Зарлал харах' button successfully")
+                else:
+                    # Button doesn't exist - page might already show the content or have different structure
+                    logger.warning(f"'Зарлал харах' button not found on page, proceeding with current content")
+                
+                raw_html = await page.content()
             html_content = BeautifulSoup(raw_html, "lxml")  # lxml is faster than html.parser
-            await context.close()  # Close context, not browser
             
             info = get_info_from_html(html_content)
             tender_document_id = extract_tender_document_id(raw_html)
@@ -204,7 +166,6 @@ async def get_info(url: str, output_name: str, max_retries: int = 3, browser: Op
         except Exception as e:
             logger.warning(f"Attempt {attempt + 1}/{max_retries} failed for {url}: {e}")
             if attempt < max_retries - 1:
-                import asyncio
                 wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
                 logger.info(f"Retrying in {wait_time}s...")
                 await asyncio.sleep(wait_time)
@@ -253,16 +214,13 @@ async def get_info_and_save(urls: List[str], output_name: str, ignore_existing:
     
     logger.info(f"Processing {len(urls_to_process)} URLs with concurrency={concurrency}")
     
-    # Get shared browser instance
-    browser = await get_browser()
-    
     # Create semaphore for concurrency control
     semaphore = asyncio.Semaphore(concurrency)
     
     async def process_url(url: str):
         async with semaphore:
             try:
-                info = await get_info(url, "tender_info_page", browser=browser)
+                info = await get_info(url, "tender_info_page")
                 if info:
                     info["official_link"] = url
                     logger.info(f"Successfully processed: {info.get('name', 'N/A')[:50]}...")
@@ -296,6 +254,7 @@ async def main():
     output_name="tender_info_page"
     info = await get_info(url, output_name)
     print(info)
+    await close_browser_pool()
 
 
 if __name__ == "__main__":
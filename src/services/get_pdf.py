@@ -1,12 +1,55 @@
 import os
 import json
+import asyncio
+import threading
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from bs4 import BeautifulSoup
-from typing import List
-from playwright.async_api import async_playwright
-import requests
+from typing import List, Optional, Tuple
 
+from schemas.cache_schema import PdfManifestEntry
+from src.dependencies import get_pdf_manifest_repository
 from src.logger import logger
+from src.repositories.pdf_manifest import PdfManifestRepository
+from src.services.browser_pool import get_browser_pool, close_browser_pool
+from src.services.http_client import download_to_file
+from src.services.pdf_store import has_entry, ingest, new_temp_path, store_path
+from src.services.request_policy import RequestStats
+
+
+# Attachments of a single tender downloaded at once
+PDF_ATTACHMENT_CONCURRENCY = int(os.getenv("PDF_ATTACHMENT_CONCURRENCY", "4"))
+# Threads serving manifest reads and writes for every concurrent download
+PDF_MANIFEST_THREADS = int(os.getenv("PDF_MANIFEST_THREADS", "2"))
+
+# Manifest I/O runs here so SQLite never blocks the downloads sharing the event loop;
+# each thread keeps its own repository because a session can't be shared across threads
+_manifest_executor: Optional[ThreadPoolExecutor] = None
+_manifest_local = threading.local()
+
+
+def _thread_manifest() -> PdfManifestRepository:
+    manifest = getattr(_manifest_local, "manifest", None)
+    if manifest is None:
+        manifest = _manifest_local.manifest = get_pdf_manifest_repository()
+    return manifest
+
+
+async def _manifest_call(fn, *args):
+    """Run fn(manifest, *args) on a manifest thread with that thread's repository."""
+    global _manifest_executor
+    if _manifest_executor is None:
+        _manifest_executor = ThreadPoolExecutor(max_workers=max(1, PDF_MANIFEST_THREADS), thread_name_prefix="pdf-manifest")
+    return await asyncio.get_running_loop().run_in_executor(_manifest_executor, lambda: fn(_thread_manifest(), *args))
+
+
+def _lookup_entry(manifest: PdfManifestRepository, tender_number, url) -> Tuple[Optional[PdfManifestEntry], bool]:
+    """(entry, fresh) for an attachment; entries whose store file is gone count as missing."""
+    entry = manifest.get_by_id((tender_number, url))
+    if entry is None or not has_entry(entry.sha256):
+        return None, False
+    return entry, manifest.is_fresh(entry)
 
 
 def extract_pdf_url_from_html(content):
@@ -22,92 +65,90 @@ def extract_pdf_url_from_html(content):
     return links
 
 
-#download pdf from download able link and save to local folder
-async def download_pdf(url, output_path, max_retries=3):
+#download pdf from download able link into the content-addressed store
+async def download_pdf(url, tender_number, max_retries=3) -> str | None:
+    """Return the store path for an attachment, downloading only when the manifest can't vouch for it.
+
+    Fresh manifest entries are served from the store; stale ones are revalidated with a
+    conditional request, and a failed download falls back to the stored copy.
+    """
     main_url ="https://api.mcs.mn/tender/stream?url="+url
+    entry, fresh = await _manifest_call(_lookup_entry, tender_number, url)
+    if fresh:
+        logger.info(f"PDF store hit: {url} -> {entry.sha256[:12]}")
+        return store_path(entry.sha256)
+
     logger.info(f"Downloading PDF from: {main_url}")
-    
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(main_url, stream=True, timeout=30)
-            if response.status_code == 200:
-                file_size = 0
-                with open(output_path, 'wb') as file:
-                    # Write the content in chunks to handle large files efficiently
-                    for chunk in response.iter_content(chunk_size=8192):
-                        file.write(chunk)
-                        file_size += len(chunk)
-                logger.info(f"PDF downloaded successfully: {output_path} ({file_size} bytes)")
-                return True
-            elif response.status_code in [502, 503, 504]:
-                # Server errors - retry
-                logger.warning(f"Server error {response.status_code} on attempt {attempt + 1}/{max_retries}, URL: {main_url}")
-                if attempt < max_retries - 1:
-                    import asyncio
-                    await asyncio.sleep(2 ** attempt)  # Exponential backoff: 1s, 2s, 4s
-                    continue
-            else:
-                logger.error(f"Failed to download PDF. Status code: {response.status_code}, URL: {main_url}")
-                return False
-        except requests.exceptions.Timeout:
-            logger.warning(f"Timeout on attempt {attempt + 1}/{max_retries} for {main_url}")
-            if attempt < max_retries - 1:
-                import asyncio
-                await asyncio.sleep(2 ** attempt)
-                continue
-        except Exception as e:
-            logger.error(f"Exception while downloading PDF from {main_url}: {e}", exc_info=True)
-            if attempt < max_retries - 1:
-                import asyncio
-                await asyncio.sleep(2 ** attempt)
-                continue
-    
-    logger.error(f"Failed to download PDF after {max_retries} attempts: {main_url}")
-    return False
+    temp_path = new_temp_path()
+    try:
+        # Streams the body in chunks through the shared session; retries 5xx/timeouts with backoff
+        result = await download_to_file(
+            main_url, temp_path, headers=PdfManifestRepository.conditional_headers(entry), max_retries=max_retries
+        )
+    except Exception as e:
+        logger.error(f"Failed to download PDF: {main_url} ({e!r})")
+        for leftover in (temp_path, f"{temp_path}.part"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        return store_path(entry.sha256) if entry is not None else None
+
+    if result.status == 304 and entry is not None:
+        logger.info(f"PDF not modified: {url} -> {entry.sha256[:12]}")
+        await _manifest_call(PdfManifestRepository.mark_validated, (tender_number, url))
+        return store_path(entry.sha256)
+
+    # Hashing and moving a multi-MB file would stall concurrent downloads on the event loop
+    sha256, size, path = await asyncio.to_thread(ingest, temp_path)
+    now = datetime.utcnow()
+    await _manifest_call(PdfManifestRepository.upsert, PdfManifestEntry(
+        tender_number=str(tender_number),
+        url=url,
+        sha256=sha256,
+        size=size,
+        etag=result.headers.get("ETag"),
+        last_modified=result.headers.get("Last-Modified"),
+        fetched_at=now,
+        validated_at=now,
+    ))
+    logger.info(f"PDF downloaded successfully: {path} ({size} bytes)")
+    return path
 
 
-async def fetch_pdf_page(url: str, output_name: str):
+async def fetch_pdf_page(url: str, output_name: str, request_stats: Optional[RequestStats] = None):
     """Fetch a job listing page using Playwright and extract jobs"""
     logger.info(f"Fetching PDF links from: {url}")
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36"
-        )
-        page = await context.new_page()
+    async with get_browser_pool().page(request_stats) as page:
         logger.debug(f"Navigating to PDF page: {url}")
         await page.goto(url)
         await page.wait_for_load_state("networkidle")
         logger.debug("PDF page loaded, parsing content")
-        html_content = BeautifulSoup(await page.content(), "html.parser")
-        await browser.close()
-        #get tender number from url
-        tender_number = url.split("/")[-1]
-        links = extract_pdf_url_from_html(html_content)
-
-        pdf_paths=[]
-
-        for i in range(len(links)):
-            pdf_url = links[i]
-            tender_number_suffix = ""
-            if i != 0:
-                tender_number_suffix = f"_{i+1}"
-            output_name_pdf = f"pdfs/tender_{tender_number}{tender_number_suffix}.pdf"
-
-            success = await download_pdf(pdf_url, output_name_pdf)
-            
-            if success:
-                pdf_paths.append(output_name_pdf)
-            else:
-                logger.warning(f"Skipping failed PDF download: {pdf_url}")
+        raw_html = await page.content()
+    html_content = BeautifulSoup(raw_html, "html.parser")
+    #get tender number from url
+    tender_number = url.split("/")[-1]
+    links = extract_pdf_url_from_html(html_content)
+
+    semaphore = asyncio.Semaphore(PDF_ATTACHMENT_CONCURRENCY)
+
+    async def download_attachment(pdf_url: str):
+        async with semaphore:
+            path = await download_pdf(pdf_url, tender_number)
         
-        logger.info(f"Successfully downloaded {len(pdf_paths)}/{len(links)} PDFs from {url}")
-        return pdf_paths
+        if not path:
+            logger.warning(f"Skipping failed PDF download: {pdf_url}")
+        return path
+
+    results = await asyncio.gather(*(download_attachment(pdf_url) for pdf_url in links))
+    # Identical attachments resolve to the same store entry; analyze each once
+    pdf_paths = list(dict.fromkeys(path for path in results if path))
+    
+    logger.info(f"Successfully downloaded {len(pdf_paths)}/{len(links)} PDFs from {url}")
+    return pdf_paths
     
-async def download_pdfs_from_tender_page(url: str) -> List[str]:
+async def download_pdfs_from_tender_page(url: str, request_stats: Optional[RequestStats] = None) -> List[str]:
     try:
         logger.info(f"Starting PDF download process for: {url}")
-        pdf_paths = await fetch_pdf_page(url, "tender_pdf_page")
+        pdf_paths = await fetch_pdf_page(url, "tender_pdf_page", request_stats)
         logger.info(f"Successfully downloaded {len(pdf_paths)} PDFs from {url}")
         return pdf_paths
     except Exception as e:
@@ -122,6 +163,7 @@ async def main():
     output_name="tender_pdf_page"
     links = await fetch_pdf_page(url, output_name)
     print(links)
+    await close_browser_pool()
 
 
 if __name__ == "__main__":
@@ -2,110 +2,90 @@ import os
 import sys
 import json
 import asyncio
-import requests
+import functools
 import re
-from typing import Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional
 
+import aiohttp
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, Browser
 from markdownify import markdownify as md
 
+from schemas.cache_schema import TenderDetailEntry
+from src.dependencies import get_tender_cache_repository
 from src.logger import logger
+from src.repositories.tender_cache import TenderDetailCacheRepository
+from src.services.browser_pool import USER_AGENT, get_browser_pool
+from src.services.http_client import fetch_json, request
+from src.services.request_policy import RequestStats
 
 
 #URL https://api.tender.gov.mn/api/process/300/list?endBudget=10000000000000&publishDate=2026-02-02
 BASE_URL = "https://api.tender.gov.mn/api/process/300/list"
 # detail url https://www.tender.gov.mn/api/get-invitation-by-document-id?tenderDocumentId=1769934209748&invitationTypeId=1
 DETAIL_URL = "https://www.tender.gov.mn/api/get-invitation-by-document-id?tenderDocumentId={tenderDocumentId}&invitationTypeId=1"
+INVITATION_URL = "https://www.tender.gov.mn/mn/invitation/detail/{invitation_id}"
 
-# Global browser instance for reuse
-_browser: Optional[Browser] = None
-_playwright = None
+# Try resolving tenderDocumentId from the server-rendered page / RSC payload before launching a browser
+HTTP_FAST_PATH_ENABLED = os.getenv("TENDER_HTTP_FAST_PATH", "1") not in ("0", "false", "False")
 
+# Pages rendered in the browser at once, shared by every date in a run
+TENDER_FETCH_CONCURRENCY = int(os.getenv("TENDER_FETCH_CONCURRENCY", "5"))
 
-async def get_browser() -> Browser:
-    """Get or create a shared browser instance for better performance."""
-    global _browser, _playwright
-    if _browser is None or not _browser.is_connected():
-        if _playwright is None:
-            _playwright = await async_playwright().start()
-        _browser = await _playwright.chromium.launch(
-            args=['--disable-dev-shm-usage', '--no-sandbox']
-        )
-        logger.info("Created new shared browser instance")
-    return _browser
+# Cumulative tenderDocumentId resolution counters: fast_path, browser_fallback, unresolved
+document_id_stats: Counter = Counter()
 
+# Detail cache reads and writes run here: one thread keeps SQLite I/O off the event loop
+# and serializes access to the shared session while details are fetched concurrently
+_cache_executor: Optional[ThreadPoolExecutor] = None
 
-async def close_browser():
-    """Close the shared browser instance."""
-    global _browser, _playwright
-    if _browser:
-        try:
-            await _browser.close()
-        except Exception:
-            pass
-        _browser = None
-    if _playwright:
-        try:
-            await _playwright.stop()
-        except Exception:
-            pass
-        _playwright = None
-        logger.info("Closed shared browser instance")
+
+async def _cache_call(fn, *args):
+    global _cache_executor
+    if _cache_executor is None:
+        _cache_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tender-cache")
+    return await asyncio.get_running_loop().run_in_executor(_cache_executor, functools.partial(fn, *args))
 
 
-async def get_info(url: str, output_name: str, max_retries: int = 3):
+async def get_info(url: str, output_name: str, max_retries: int = 3, request_stats: Optional[RequestStats] = None):
     """Fetch a job listing page using Playwright and extract jobs"""
-    global _browser, _playwright
     logger.info(f"Fetching tender info from: {url}")
     
     for attempt in range(max_retries):
-        context = None
         try:
-            browser = await get_browser()
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36"
-            )
-            page = await context.new_page()
-            page.on("dialog", lambda dialog: dialog.accept())
-            logger.debug(f"Navigating to URL: {url} (attempt {attempt + 1}/{max_retries})")
-            
-            await page.goto(url, timeout=30000, wait_until="domcontentloaded")
-            
-            # Wait for specific content instead of networkidle (much faster)
-            try:
-                await page.wait_for_selector("button", timeout=5000)
-            except:
-                await page.wait_for_load_state("networkidle", timeout=10000)
-            
-            logger.debug("Page loaded successfully")
-            # Try to find and click the "Зарлал харах" button with better error handling
-            button = page.get_by_role("button", name="Зарлал харах")
-            
-            # Check if button exists before clicking
-            button_count = await button.count()
-            if button_count > 0:
-                await button.wait_for(state="visible", timeout=5000)
-                await button.click(timeout=5000)
-                logger.debug("Clicked 'Зарлал харах' button successfully")
-            else:
-                # Button doesn't exist - page might already show the content or have different structure
-                logger.warning(f"'Зарлал харах' button not found on page, proceeding with current content")
-            raw_html = await page.content()
+            async with get_browser_pool().page(request_stats) as page:
+                page.on("dialog", lambda dialog: dialog.accept())
+                logger.debug(f"Navigating to URL: {url} (attempt {attempt + 1}/{max_retries})")
+                
+                await page.goto(url, timeout=30000, wait_until="domcontentloaded")
+                
+                # Wait for specific content instead of networkidle (much faster)
+                try:
+                    await page.wait_for_selector("button", timeout=5000)
+                except:
+                    await page.wait_for_load_state("networkidle", timeout=10000)
+                
+                logger.debug("Page loaded successfully")
+                # Try to find and click the "Зарлал харах" button with better error handling
+                button = page.get_by_role("button", name="Зарлал харах")
+                
+                # Check if button exists before clicking
+                button_count = await button.count()
+                if button_count > 0:
+                    await button.wait_for(state="visible", timeout=5000)
+                    await button.click(timeout=5000)
+                    logger.debug("Clicked 'Зарлал харах' button successfully")
+                else:
+                    # Button doesn't exist - page might already show the content or have different structure
+                    logger.warning(f"'Зарлал харах' button not found on page, proceeding with current content")
+                raw_html = await page.content()
             html_content = BeautifulSoup(raw_html, "lxml")
-            await context.close()
             return str(html_content)
         except Exception as e:
+            # The pool discards the failed context and relaunches a disconnected browser
             logger.warning(f"Attempt {attempt + 1}/{max_retries} failed for {url}: {e}")
-            # Clean up context on error
-            if context:
-                try:
-                    await context.close()
-                except Exception:
-                    pass
-            # Reset browser and playwright if it's a connection/closed/driver error
-            if "closed" in str(e).lower() or "target" in str(e).lower() or "driver" in str(e).lower():
-                await close_browser()  # Properly clean up both browser and playwright
             if attempt < max_retries - 1:
                 await asyncio.sleep(2 ** attempt)  # Exponential backoff
             else:
@@ -135,103 +115,249 @@ async def get_tender_document_id(html_content) -> str | None:
     return tender_document_id
 
 
-async def fetch_tender_infos(publish_date: str, concurrency: int = 5) -> list:
-    """Fetch tender URLs from the API for a given publish date with concurrent processing"""
+async def resolve_document_id_over_http(invitation_id) -> str | None:
+    """Resolve tenderDocumentId without a browser.
+
+    The invitation page is a Next.js app: the document id is usually embedded in the
+    server-rendered flight data, and otherwise in the RSC payload returned for `RSC: 1`.
+    """
+    url = INVITATION_URL.format(invitation_id=invitation_id)
+    attempts = [
+        {"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"},
+        {"User-Agent": USER_AGENT, "Accept": "text/x-component", "RSC": "1"},
+    ]
+    for headers in attempts:
+        try:
+            response = await request("GET", url, headers=headers, timeout=15, max_retries=2)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug(f"HTTP fast path failed for {url}: {e!r}")
+            continue
+        if response.status != 200:
+            logger.debug(f"HTTP fast path got status {response.status} for {url}")
+            continue
+        document_id = await get_tender_document_id(response.text())
+        if document_id:
+            return document_id
+    return None
+
+
+async def resolve_document_id(
+    invitation_id, semaphore: asyncio.Semaphore, stats: Counter, request_stats: Optional[RequestStats] = None
+) -> str | None:
+    """Resolve tenderDocumentId over plain HTTP, falling back to the headless browser."""
+    if HTTP_FAST_PATH_ENABLED:
+        document_id = await resolve_document_id_over_http(invitation_id)
+        if document_id:
+            stats["fast_path"] += 1
+            return document_id
+
+    url = INVITATION_URL.format(invitation_id=invitation_id)
+    async with semaphore:
+        html_content = await get_info(url, "tender_info_page", request_stats=request_stats)
+    document_id = await get_tender_document_id(html_content)
+    stats["browser_fallback" if document_id else "unresolved"] += 1
+    return document_id
+
+
+async def fetch_detail_markdown(
+    document_id: str,
+    invitation_id,
+    cache: TenderDetailCacheRepository,
+    stats: Counter,
+    cached: Optional[TenderDetailEntry] = None,
+) -> str:
+    """Return the markdown detail body for a document, doing network work only when needed.
+
+    Fresh cache entries are returned as-is; stale ones are revalidated with
+    If-None-Match/If-Modified-Since, and an unchanged body skips the markdown conversion.
+    """
+    if cached is None or cached.document_id != str(document_id):
+        cached = await _cache_call(cache.get_by_id, document_id)
+    if cached is not None and cache.is_fresh(cached):
+        stats["cache_hit"] += 1
+        return cached.markdown
+
+    detail_url = DETAIL_URL.format(tenderDocumentId=document_id)
+    try:
+        response_detail = await request("GET", detail_url, headers=cache.conditional_headers(cached), timeout=15)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.warning(f"Failed to fetch detail for {document_id}: {e!r}")
+        # Serve a stale copy rather than nothing
+        return cached.markdown if cached is not None else ""
+
+    if response_detail.status == 304 and cached is not None:
+        stats["cache_revalidated"] += 1
+        await _cache_call(cache.mark_validated, document_id)
+        return cached.markdown
+    if response_detail.status != 200:
+        logger.warning(f"Detail API returned {response_detail.status} for {document_id}")
+        return cached.markdown if cached is not None else ""
+
+    detail_data = response_detail.json()
+    body = detail_data.get("data", {}).get("body", "")
+    encoded_body = body.encode('utf-8', errors='ignore').decode('utf-8', errors='ignore')
+    if cached is not None and cached.raw_body == encoded_body:
+        stats["cache_revalidated"] += 1
+        await _cache_call(cache.mark_validated, document_id)
+        return cached.markdown
+
+    markdown_content = md(encoded_body)
+    stats["cache_miss"] += 1
+    now = datetime.utcnow()
+    await _cache_call(cache.upsert, TenderDetailEntry(
+        document_id=str(document_id),
+        invitation_id=str(invitation_id) if invitation_id is not None else None,
+        detail_url=detail_url,
+        raw_body=encoded_body,
+        markdown=markdown_content,
+        etag=response_detail.headers.get("ETag"),
+        last_modified=response_detail.headers.get("Last-Modified"),
+        fetched_at=now,
+        validated_at=now,
+    ))
+    return markdown_content
+
+
+async def fetch_tender_listing(publish_date: str) -> list:
+    """Fetch the raw tender listing items (with a tenderId) published on a given date"""
     params = {
         "publishDate": publish_date
     }
     try:
         logger.info(f"Fetching tender URLs for date: {publish_date}")
-        response = requests.get(BASE_URL, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if not data:
-            logger.error(f"API returned non-success status for date {publish_date}: {data}")
-            return []
-        
-        # Build list of items to process
-        items_to_process = []
-        for item in data:
-            tender_id = item.get("tenderId")
-            if tender_id:
-                items_to_process.append(item)
-        
-        logger.info(f"Processing {len(items_to_process)} tenders concurrently (concurrency={concurrency})")
-        
-        # Semaphore for concurrency control
-        semaphore = asyncio.Semaphore(concurrency)
-        
-        async def process_single_tender(item):
-            """Process a single tender item"""
-            async with semaphore:
-                tender_id = item.get("tenderId")
-                tender_code = item.get("tenderCode")
-                invitation_id = item.get("invitationId")
-                invitation_number = item.get("invitationNumber")
-                published_date = item.get("publishDate")
-                tender_name = item.get("tenderName")
-                total_budget = item.get("totalBudget")
-                tender_type_name = item.get("tenderTypeName")
-                budget_entity_name = item.get("budgetEntityName")
-                fund_name = item.get("fundName")
-                doc_status_code = item.get("docStatusCode")
-                
-                url = f"https://www.tender.gov.mn/mn/invitation/detail/{invitation_id}"
-                encoded_body = ""
-                detail_url = ""
-                
-                try:
-                    html_content = await get_info(url, "tender_info_page")
-                    document_id = await get_tender_document_id(html_content)
-                    
-                    if document_id:
-                        detail_url = DETAIL_URL.format(tenderDocumentId=document_id)
-                        for retry in range(3):
-                            try:
-                                response_detail = requests.get(detail_url, timeout=15)
-                                if response_detail.status_code == 200:
-                                    detail_data = response_detail.json()
-                                    body = detail_data.get("data", {}).get("body", "")
-                                    encoded_body = body.encode('utf-8', errors='ignore').decode('utf-8', errors='ignore')
-                                    markdown_content = md(encoded_body)
-                                    encoded_body = markdown_content
-                                    break
-                            except requests.RequestException as e:
-                                logger.warning(f"Retry {retry + 1}/3 failed to fetch detail for {document_id}: {e}")
-                                if retry < 2:
-                                    await asyncio.sleep(1 * (retry + 1))
-                                else:
-                                    encoded_body = ""
-                except Exception as e:
-                    logger.error(f"Error processing tender {tender_id}: {e}")
-                
-                return {
-                    "tender_id": tender_id,
-                    "tender_code": tender_code,
-                    "invitation_id": invitation_id,
-                    "invitation_number": invitation_number,
-                    "tender_name": tender_name,
-                    "total_budget": total_budget,
-                    "tender_type_name": tender_type_name,
-                    "publish_date": published_date,
-                    "fund_name": fund_name,
-                    "budget_entity_name": budget_entity_name,
-                    "doc_status_code": doc_status_code,
-                    "official_link": f"https://www.tender.gov.mn/mn/invitation/detail/{invitation_id}",
-                    "detail_url": detail_url,
-                    "body": encoded_body
-                }
-        
-        # Process all tenders concurrently
-        tasks = [process_single_tender(item) for item in items_to_process]
-        infos = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Filter out exceptions
-        valid_infos = [info for info in infos if isinstance(info, dict)]
-        
-        logger.info(f"Extracted {len(valid_infos)} tender URLs for date: {publish_date}")
-        return valid_infos
-    except requests.RequestException as e:
+        data = await fetch_json(BASE_URL, params=params)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         logger.error(f"Error fetching tender URLs: {e}", exc_info=True)
         return []
+    if not data:
+        logger.error(f"API returned non-success status for date {publish_date}: {data}")
+        return []
+    return [item for item in data if item.get("tenderId")]
+
+
+async def fetch_tender_detail(
+    item: dict,
+    semaphore: asyncio.Semaphore,
+    cache: TenderDetailCacheRepository,
+    stats: Counter,
+    request_stats: Optional[RequestStats] = None,
+) -> dict:
+    """Resolve a listing item's tenderDocumentId and detail body into a tender info dict"""
+    tender_id = item.get("tenderId")
+    tender_code = item.get("tenderCode")
+    invitation_id = item.get("invitationId")
+    invitation_number = item.get("invitationNumber")
+    published_date = item.get("publishDate")
+    tender_name = item.get("tenderName")
+    total_budget = item.get("totalBudget")
+    tender_type_name = item.get("tenderTypeName")
+    budget_entity_name = item.get("budgetEntityName")
+    fund_name = item.get("fundName")
+    doc_status_code = item.get("docStatusCode")
+    
+    encoded_body = ""
+    detail_url = ""
+    
+    try:
+        # A cached invitation already knows its tenderDocumentId: no page visit needed
+        cached = await _cache_call(cache.get_by_invitation_id, invitation_id)
+        if cached is not None:
+            document_id = cached.document_id
+            stats["cached_document_id"] += 1
+        else:
+            document_id = await resolve_document_id(invitation_id, semaphore, stats, request_stats)
+        
+        if document_id:
+            detail_url = DETAIL_URL.format(tenderDocumentId=document_id)
+            encoded_body = await fetch_detail_markdown(document_id, invitation_id, cache, stats, cached)
+    except Exception as e:
+        logger.error(f"Error processing tender {tender_id}: {e}")
+    
+    return {
+        "tender_id": tender_id,
+        "tender_code": tender_code,
+        "invitation_id": invitation_id,
+        "invitation_number": invitation_number,
+        "tender_name": tender_name,
+        "total_budget": total_budget,
+        "tender_type_name": tender_type_name,
+        "publish_date": published_date,
+        "fund_name": fund_name,
+        "budget_entity_name": budget_entity_name,
+        "doc_status_code": doc_status_code,
+        "official_link": INVITATION_URL.format(invitation_id=invitation_id),
+        "detail_url": detail_url,
+        "body": encoded_body
+    }
+
+
+def log_fetch_stats(label: str, stats: Counter):
+    logger.info(
+        f"tenderDocumentId resolution for {label}: fast_path={stats['fast_path']}, "
+        f"browser_fallback={stats['browser_fallback']}, unresolved={stats['unresolved']}, "
+        f"cached={stats['cached_document_id']}"
+    )
+    logger.info(
+        f"Detail cache for {label}: hit={stats['cache_hit']}, "
+        f"revalidated={stats['cache_revalidated']}, miss={stats['cache_miss']}"
+    )
+
+
+async def _fetch_details(
+    items: list, semaphore: asyncio.Semaphore, label: str, request_stats: Optional[RequestStats] = None
+) -> list:
+    run_stats: Counter = Counter()
+    with get_tender_cache_repository() as cache:
+        infos = await asyncio.gather(
+            *(fetch_tender_detail(item, semaphore, cache, run_stats, request_stats) for item in items),
+            return_exceptions=True,
+        )
+    # Filter out exceptions
+    valid_infos = [info for info in infos if isinstance(info, dict)]
+    document_id_stats.update(run_stats)
+    log_fetch_stats(label, run_stats)
+    return valid_infos
+
+
+async def fetch_tender_infos(
+    publish_date: str, concurrency: int = TENDER_FETCH_CONCURRENCY, request_stats: Optional[RequestStats] = None
+) -> list:
+    """Fetch tender URLs from the API for a given publish date with concurrent processing"""
+    items_to_process = await fetch_tender_listing(publish_date)
+    logger.info(f"Processing {len(items_to_process)} tenders concurrently (concurrency={concurrency})")
+    # Semaphore bounds browser usage only; detail API calls share the HTTP connection pool
+    valid_infos = await _fetch_details(items_to_process, asyncio.Semaphore(concurrency), publish_date, request_stats)
+    logger.info(f"Extracted {len(valid_infos)} tender URLs for date: {publish_date}")
+    return valid_infos
+
+
+async def fetch_tender_infos_for_dates(
+    publish_dates: List[str], concurrency: int = TENDER_FETCH_CONCURRENCY, request_stats: Optional[RequestStats] = None
+) -> list:
+    """Fetch tenders for several publish dates at once under one shared concurrency budget.
+
+    Listings for all dates are fetched concurrently and deduplicated by invitationId
+    (first date wins), then every detail is resolved against the same semaphore.
+    """
+    listings = await asyncio.gather(*(fetch_tender_listing(publish_date) for publish_date in publish_dates))
+
+    items_to_process = []
+    seen = set()
+    duplicates = 0
+    for publish_date, items in zip(publish_dates, listings):
+        logger.info(f"Listed {len(items)} tenders for date: {publish_date}")
+        for item in items:
+            key = item.get("invitationId") or f"tender:{item.get('tenderId')}"
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            items_to_process.append(item)
+    if duplicates:
+        logger.info(f"Skipped {duplicates} tenders listed on more than one date")
 
+    label = f"{publish_dates[0]}..{publish_dates[-1]}" if publish_dates else "no dates"
+    logger.info(f"Processing {len(items_to_process)} tenders across {len(publish_dates)} dates (concurrency={concurrency})")
+    valid_infos = await _fetch_details(items_to_process, asyncio.Semaphore(concurrency), label, request_stats)
+    logger.info(f"Extracted {len(valid_infos)} tender URLs for {label}")
+    return valid_infos
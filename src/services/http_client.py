@@ -0,0 +1,237 @@
+import os
+import json
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+import aiohttp
+
+from src.logger import logger
+
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+HTTP_DOWNLOAD_READ_TIMEOUT_SECONDS = float(os.getenv("HTTP_DOWNLOAD_READ_TIMEOUT_SECONDS", "60"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+# Hard cap on requests per download, counting resumes and restarts that made progress
+HTTP_DOWNLOAD_MAX_ATTEMPTS = int(os.getenv("HTTP_DOWNLOAD_MAX_ATTEMPTS", "10"))
+# Received bytes are buffered and written to disk off the event loop in blocks of this size
+HTTP_DOWNLOAD_WRITE_BUFFER = int(os.getenv("HTTP_DOWNLOAD_WRITE_BUFFER", str(1024 * 1024)))
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "30"))
+
+# Statuses worth retrying: rate limiting and transient upstream/proxy failures
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Global session instance for reuse (keep-alive connection pool)
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+@dataclass
+class HttpResponse:
+    """Fully-read response returned by `request`."""
+    status: int
+    headers: Mapping[str, str]  # case-insensitive
+    body: bytes
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="ignore")
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of `download_to_file`: 200 when a body was written, 304 when validators matched."""
+    status: int
+    size: int
+    headers: Mapping[str, str]  # case-insensitive, from the response that started the body
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Get or create the shared HTTP session bound to the running event loop."""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_MAX_CONNECTIONS,
+            limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+            ttl_dns_cache=300,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS),
+        )
+        _session_loop = loop
+        logger.info(
+            f"Created shared HTTP session (limit={HTTP_MAX_CONNECTIONS}, per_host={HTTP_MAX_CONNECTIONS_PER_HOST})"
+        )
+    return _session
+
+
+async def close_session():
+    """Close the shared HTTP session."""
+    global _session, _session_loop
+    if _session is not None:
+        try:
+            await _session.close()
+        except Exception:
+            pass
+        _session = None
+        _session_loop = None
+        logger.info("Closed shared HTTP session")
+
+
+async def _backoff(attempt: int, retry_after: Optional[str] = None):
+    delay = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
+    if retry_after and retry_after.isdigit():
+        delay = max(delay, int(retry_after))
+    await asyncio.sleep(delay)
+
+
+async def request(
+    method: str,
+    url: str,
+    *,
+    params: Optional[dict] = None,
+    headers: Optional[dict] = None,
+    timeout: Optional[float] = None,
+    max_retries: int = HTTP_MAX_RETRIES,
+) -> HttpResponse:
+    """Send a request through the shared session, retrying transient failures with backoff.
+
+    Non-retryable statuses (e.g. 404) are returned to the caller as-is; connection errors
+    and timeouts are re-raised once all attempts are exhausted.
+    """
+    session = await get_session()
+    request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+
+    for attempt in range(max_retries):
+        try:
+            async with session.request(method, url, params=params, headers=headers, timeout=request_timeout) as response:
+                body = await response.read()
+                if response.status in RETRYABLE_STATUSES and attempt < max_retries - 1:
+                    logger.warning(f"HTTP {response.status} on attempt {attempt + 1}/{max_retries} for {url}")
+                    await _backoff(attempt, response.headers.get("Retry-After"))
+                    continue
+                return HttpResponse(status=response.status, headers=response.headers.copy(), body=body)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Attempt {attempt + 1}/{max_retries} failed for {url}: {e!r}")
+            if attempt < max_retries - 1:
+                await _backoff(attempt)
+            else:
+                raise
+    raise aiohttp.ClientError(f"Request failed after {max_retries} attempts: {url}")
+
+
+async def fetch_json(url: str, params: Optional[dict] = None, **kwargs) -> Any:
+    """GET a JSON document, raising `aiohttp.ClientError` on non-200 statuses."""
+    response = await request("GET", url, params=params, **kwargs)
+    if response.status != 200:
+        raise aiohttp.ClientError(f"HTTP {response.status} for {url}")
+    return response.json()
+
+
+async def download_to_file(
+    url: str,
+    output_path: str,
+    *,
+    headers: Optional[dict] = None,
+    chunk_size: int = 64 * 1024,
+    max_retries: int = HTTP_MAX_RETRIES,
+    max_attempts: int = HTTP_DOWNLOAD_MAX_ATTEMPTS,
+) -> DownloadResult:
+    """Stream a response body to disk in chunks.
+
+    The body is written to `<output_path>.part` and renamed on completion. When a transfer
+    is cut off partway, the next attempt asks for the remaining bytes with a Range request
+    (guarded by If-Range) and appends them; servers that ignore Range restart from zero.
+    Attempts that make progress don't count against `max_retries`, but no download makes
+    more than `max_attempts` requests or restarts from zero more than `max_retries` times.
+
+    `headers` (e.g. If-None-Match) go on the initial request only; a 304 reply writes
+    nothing and is returned as-is.
+    """
+    session = await get_session()
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=HTTP_DOWNLOAD_READ_TIMEOUT_SECONDS)
+    part_path = f"{output_path}.part"
+    received = 0
+    validator = None  # ETag or Last-Modified of the first response, so resumed bytes match
+    body_headers: Mapping[str, str] = {}
+    failures = 0
+    attempts = 0
+    restarts = 0
+
+    # A leftover .part from an earlier run can't be validated; start clean
+    if os.path.exists(part_path):
+        os.remove(part_path)
+
+    while True:
+        attempts += 1
+        if attempts > max_attempts:
+            raise aiohttp.ClientError(f"Download gave up after {max_attempts} attempts ({received} bytes received): {url}")
+        request_headers = {}
+        if received:
+            request_headers["Range"] = f"bytes={received}-"
+            if validator:
+                request_headers["If-Range"] = validator
+        elif headers:
+            request_headers.update(headers)
+        progressed = False
+        try:
+            async with session.get(url, headers=request_headers, timeout=timeout) as response:
+                if response.status in RETRYABLE_STATUSES and failures < max_retries - 1:
+                    logger.warning(f"Server error {response.status} on attempt {failures + 1}/{max_retries}, URL: {url}")
+                    failures += 1
+                    await _backoff(failures - 1, response.headers.get("Retry-After"))
+                    continue
+                if response.status == 304 and not received:
+                    return DownloadResult(304, 0, response.headers.copy())
+                if response.status == 206 and received:
+                    logger.info(f"Resuming download at byte {received}: {url}")
+                    mode = "ab"
+                elif response.status == 200:
+                    if received:
+                        restarts += 1
+                        if restarts > max_retries:
+                            raise aiohttp.ClientError(f"Server ignored Range {restarts} times, giving up: {url}")
+                        logger.info(f"Server ignored Range, restarting download: {url}")
+                    received = 0
+                    mode = "wb"
+                    validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+                    body_headers = response.headers.copy()
+                elif response.status == 416 and received:
+                    # Our offset is past the current body (file changed); start over
+                    received = 0
+                    validator = None
+                    failures += 1
+                    continue
+                else:
+                    raise aiohttp.ClientError(f"HTTP {response.status} for {url}")
+                file = await asyncio.to_thread(open, part_path, mode)
+                buffer = bytearray()
+                try:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        buffer += chunk
+                        received += len(chunk)
+                        progressed = True
+                        if len(buffer) >= HTTP_DOWNLOAD_WRITE_BUFFER:
+                            await asyncio.to_thread(file.write, buffer)
+                            buffer.clear()
+                finally:
+                    # Keep what arrived before an interruption so `received` matches the file on resume
+                    if buffer:
+                        await asyncio.to_thread(file.write, buffer)
+                    await asyncio.to_thread(file.close)
+            await asyncio.to_thread(os.replace, part_path, output_path)
+            return DownloadResult(200, received, body_headers)
+        except (aiohttp.ClientPayloadError, aiohttp.ServerDisconnectedError, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if not progressed:
+                failures += 1
+            logger.warning(f"Download interrupted after {received} bytes ({failures}/{max_retries} failures) for {url}: {e!r}")
+            if failures >= max_retries:
+                raise
+            await _backoff(max(failures - 1, 0))
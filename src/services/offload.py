@@ -0,0 +1,130 @@
+import os
+import time
+import asyncio
+import functools
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.logger import logger
+from src.services.export import export_overviews, export_pdf_results
+from src.services.save_excel import pdf_result_to_excel, save_to_excel
+from src.services.send_email import send_email, send_notification_email
+
+
+# Workbook building is CPU-bound; "process" keeps it from contending with the event loop for the GIL
+EXCEL_POOL_KIND = os.getenv("EXCEL_POOL_KIND", "thread")
+EXCEL_POOL_WORKERS = int(os.getenv("EXCEL_POOL_WORKERS", "2"))
+# SMTP sends are network-bound and only need threads
+EMAIL_POOL_WORKERS = int(os.getenv("EMAIL_POOL_WORKERS", "2"))
+
+_excel_pool: Optional[Executor] = None
+_email_pool: Optional[Executor] = None
+
+# label -> {"calls", "failed", "wait_seconds", "run_seconds", "max_run_seconds"}
+_timings: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+
+def _get_excel_pool() -> Executor:
+    global _excel_pool
+    if _excel_pool is None:
+        if EXCEL_POOL_KIND == "process":
+            _excel_pool = ProcessPoolExecutor(max_workers=EXCEL_POOL_WORKERS)
+        else:
+            _excel_pool = ThreadPoolExecutor(max_workers=EXCEL_POOL_WORKERS, thread_name_prefix="excel")
+    return _excel_pool
+
+
+def _get_email_pool() -> Executor:
+    global _email_pool
+    if _email_pool is None:
+        _email_pool = ThreadPoolExecutor(max_workers=EMAIL_POOL_WORKERS, thread_name_prefix="email")
+    return _email_pool
+
+
+def _timed(fn: Callable, *args, **kwargs):
+    """Runs in the pool; returns (result, pool start time, run seconds)."""
+    started = time.time()
+    run_started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, started, time.perf_counter() - run_started
+
+
+async def _run(pool: Executor, label: str, fn: Callable, *args, **kwargs):
+    """Run a blocking call in `pool` and record how long it queued and ran."""
+    submitted = time.time()
+    stats = _timings[label]
+    stats["calls"] += 1
+    try:
+        result, started, run_seconds = await asyncio.get_running_loop().run_in_executor(
+            pool, functools.partial(_timed, fn, *args, **kwargs)
+        )
+    except Exception:
+        stats["failed"] += 1
+        raise
+    wait_seconds = max(0.0, started - submitted)
+    stats["wait_seconds"] += wait_seconds
+    stats["run_seconds"] += run_seconds
+    stats["max_run_seconds"] = max(stats["max_run_seconds"], run_seconds)
+    logger.info(f"{label} finished in {run_seconds:.2f}s (waited {wait_seconds:.2f}s for a worker)")
+    return result
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _send_file(path: str, **kwargs):
+    send_email(filename=os.path.basename(path), filedata=_read_file(path), **kwargs)
+
+
+async def save_to_excel_async(overviews: List[dict], filename: str):
+    return await _run(_get_excel_pool(), "save_to_excel", save_to_excel, overviews, filename)
+
+
+async def pdf_result_to_excel_async(raw_overviews: List[dict], filename: str):
+    return await _run(_get_excel_pool(), "pdf_result_to_excel", pdf_result_to_excel, raw_overviews, filename)
+
+
+async def export_overviews_async(overviews: List[dict], base_path: str, formats: Iterable[str]) -> List[str]:
+    return await _run(_get_excel_pool(), "export_overviews", export_overviews, overviews, base_path, list(formats))
+
+
+async def export_pdf_results_async(pdf_results: List[dict], base_path: str, formats: Iterable[str]) -> List[str]:
+    return await _run(_get_excel_pool(), "export_pdf_results", export_pdf_results, pdf_results, base_path, list(formats))
+
+
+async def send_email_async(**kwargs):
+    return await _run(_get_email_pool(), "send_email", send_email, **kwargs)
+
+
+async def send_file_email_async(path: str, **kwargs):
+    """Read `path` and send it as the attachment of `send_email`, both off the event loop."""
+    return await _run(_get_email_pool(), "send_email", _send_file, path, **kwargs)
+
+
+async def send_notification_email_async(**kwargs):
+    return await _run(_get_email_pool(), "send_notification_email", send_notification_email, **kwargs)
+
+
+def offload_stats() -> dict:
+    """Per-call timing totals since start."""
+    return {
+        label: {
+            "calls": int(stats["calls"]),
+            "failed": int(stats["failed"]),
+            "avg_run_seconds": round(stats["run_seconds"] / max(1, stats["calls"] - stats["failed"]), 3),
+            "max_run_seconds": round(stats["max_run_seconds"], 3),
+            "avg_wait_seconds": round(stats["wait_seconds"] / max(1, stats["calls"] - stats["failed"]), 3),
+        }
+        for label, stats in _timings.items()
+    }
+
+
+def shutdown_pools():
+    global _excel_pool, _email_pool
+    for pool in (_excel_pool, _email_pool):
+        if pool is not None:
+            pool.shutdown(wait=True)
+    _excel_pool = _email_pool = None
@@ -0,0 +1,49 @@
+import os
+import uuid
+import hashlib
+from typing import Tuple
+
+
+PDF_STORE_DIR = os.getenv("PDF_STORE_DIR", "pdfs/store")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def store_path(sha256: str) -> str:
+    """Path of the store entry for a SHA-256 digest (fanned out by its first two hex chars)."""
+    return os.path.join(PDF_STORE_DIR, sha256[:2], f"{sha256}.pdf")
+
+
+def has_entry(sha256: str) -> bool:
+    return os.path.exists(store_path(sha256))
+
+
+def new_temp_path() -> str:
+    """A unique download location inside the store, on the same filesystem as its entries."""
+    temp_dir = os.path.join(PDF_STORE_DIR, "tmp")
+    os.makedirs(temp_dir, exist_ok=True)
+    return os.path.join(temp_dir, f"{uuid.uuid4().hex}.pdf")
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def ingest(temp_path: str) -> Tuple[str, int, str]:
+    """Move a downloaded file into the store under its hash.
+
+    Returns (sha256, size, store path). When identical content is already stored the
+    temporary file is discarded, so shared attachments are kept once.
+    """
+    sha256 = file_sha256(temp_path)
+    size = os.path.getsize(temp_path)
+    path = store_path(sha256)
+    if os.path.exists(path):
+        os.remove(temp_path)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(temp_path, path)
+    return sha256, size, path
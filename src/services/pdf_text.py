@@ -0,0 +1,144 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from src.logger import logger
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # optional: without pypdf every PDF is sent whole
+    PdfReader = None
+
+
+# Average extracted characters per page below which a PDF is treated as scanned
+SCANNED_CHARS_PER_PAGE = int(os.getenv("PDF_SCANNED_CHARS_PER_PAGE", "200"))
+# Upper bound on the text sent for one PDF
+PDF_TEXT_MAX_CHARS = int(os.getenv("PDF_TEXT_MAX_CHARS", "60000"))
+# Opening text kept for tender name, organization and budget
+HEAD_CHARS = 3000
+# Lines kept around every Багц mention so the part tables come through whole
+LOT_CONTEXT_LINES = 12
+
+ROMAN_NUMERALS = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"]
+# Stems of the ordinal-word headings ("ГУРАВДУГААР БҮЛЭГ"); some documents shorten ЗУРГАА and ДОЛОО
+ORDINAL_WORDS = {
+    "НЭГ": 1, "ХОЁР": 2, "ГУРАВ": 3, "ДӨРӨВ": 4, "ТАВ": 5,
+    "ЗУРГАА": 6, "ЗУРГА": 6, "ДОЛОО": 7, "ДОЛ": 7, "НАЙМ": 8, "ЕС": 9, "АРАВ": 10,
+}
+
+# "III БҮЛЭГ", "БҮЛЭГ III", "3 дугаар бүлэг", "ГУРАВДУГААР БҮЛЭГ", ...
+SECTION_HEADING = re.compile(
+    r"^\s*(?:(?P<pre>[IVX]{1,4}|\d{1,2})\s*(?:[-.]?\s*(?:дугаар|дүгээр))?\s*[.\-]?\s*БҮЛЭГ"
+    r"|(?P<word>" + "|".join(sorted(ORDINAL_WORDS, key=len, reverse=True)) + r")\s*-?\s*(?:дугаар|дүгээр)\s*БҮЛЭГ"
+    r"|БҮЛЭГ\s*[.\-]?\s*(?P<post>[IVX]{1,4}|\d{1,2}))\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+TECHNICAL_SECTION_TITLE = re.compile(r"ТЕХНИКИЙН\s+ТОДОРХОЙЛОЛТ", re.IGNORECASE)
+LOT_MENTION = re.compile(r"Багц", re.IGNORECASE)
+
+
+@dataclass
+class PdfText:
+    """Relevant text sliced out of one PDF."""
+    text: str
+    pages: int
+    total_chars: int
+    section_found: bool
+    lots_found: bool
+
+
+def _section_number(match: re.Match) -> Optional[int]:
+    if match.group("word"):
+        return ORDINAL_WORDS[match.group("word").upper()]
+    value = (match.group("pre") or match.group("post") or "").upper()
+    if value.isdigit():
+        return int(value)
+    return ROMAN_NUMERALS.index(value) + 1 if value in ROMAN_NUMERALS else None
+
+
+def extract_pages(path: str) -> Optional[List[str]]:
+    """Per-page text of a PDF, or None when pypdf is unavailable or the file can't be parsed."""
+    if PdfReader is None:
+        return None
+    try:
+        reader = PdfReader(path)
+        return [page.extract_text() or "" for page in reader.pages]
+    except Exception as e:
+        logger.warning(f"Text extraction failed for {path}: {e!r}")
+        return None
+
+
+def find_section(text: str, number: int = 3) -> Optional[Tuple[int, int]]:
+    """Span of БҮЛЭГ `number` up to the next БҮЛЭГ heading.
+
+    Tables of contents repeat every heading, so the longest candidate span wins.
+    """
+    headings = [(match.start(), _section_number(match)) for match in SECTION_HEADING.finditer(text)]
+    best = None
+    for index, (start, value) in enumerate(headings):
+        if value != number:
+            continue
+        end = next((s for s, v in headings[index + 1:] if v is not None and v != number), len(text))
+        if best is None or end - start > best[1] - best[0]:
+            best = (start, end)
+    if best is None:
+        # Fall back to the section title itself when headings aren't numbered
+        title = TECHNICAL_SECTION_TITLE.search(text)
+        if title:
+            end = next((s for s, _ in headings if s > title.start()), len(text))
+            best = (title.start(), end)
+    return best
+
+
+def lot_passages(text: str) -> List[str]:
+    """Line windows around every Багц mention, merged where they overlap."""
+    lines = text.splitlines()
+    windows: List[List[int]] = []
+    for index, line in enumerate(lines):
+        if LOT_MENTION.search(line):
+            start, end = max(0, index - 2), min(len(lines), index + LOT_CONTEXT_LINES)
+            if windows and start <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], end)
+            else:
+                windows.append([start, end])
+    return ["\n".join(lines[start:end]) for start, end in windows]
+
+
+def extract_relevant_text(path: str) -> Optional[PdfText]:
+    """Slice the opening, section III and the Багц passages out of a text PDF.
+
+    Returns None when the whole PDF should be sent instead: pypdf missing, a scanned
+    document, or neither section III nor any Багц found.
+    """
+    pages = extract_pages(path)
+    if not pages:
+        return None
+    text = "\n".join(pages)
+    if len(text.strip()) < SCANNED_CHARS_PER_PAGE * len(pages):
+        logger.info(f"{os.path.basename(path)} looks scanned ({len(text)} chars / {len(pages)} pages), sending whole PDF")
+        return None
+
+    section = find_section(text)
+    passages = lot_passages(text)
+    if section is None:
+        logger.info(
+            f"{os.path.basename(path)}: no section III heading found"
+            + (", keeping Багц passages only" if passages else " and no Багц mentions, sending whole PDF")
+        )
+    if section is None and not passages:
+        return None
+
+    parts = [f"## Баримтын эхлэл\n{text[:HEAD_CHARS]}"]
+    if section is not None:
+        parts.append(f"## III БҮЛЭГ\n{text[section[0]:section[1]]}")
+    if passages:
+        parts.append("## Багц\n" + "\n...\n".join(passages))
+    sliced = "\n\n".join(parts)[:PDF_TEXT_MAX_CHARS]
+    return PdfText(
+        text=sliced,
+        pages=len(pages),
+        total_chars=len(text),
+        section_found=section is not None,
+        lots_found=bool(passages),
+    )
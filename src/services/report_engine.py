@@ -0,0 +1,323 @@
+import os
+from copy import copy
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.borders import DEFAULT_BORDER
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
+
+from src.logger import logger
+
+
+# "streaming" writes reports in openpyxl write-only mode; "workbook" builds them in memory first
+EXCEL_WRITER = os.getenv("EXCEL_WRITER", "streaming")
+# Tenders laid out at a time; row heights are estimated for a whole block at once
+REPORT_BLOCK_SIZE = 512
+
+BASE_ROW_HEIGHT = 15.0
+HEADER_ROWS = 4
+SHEET_TITLE = "Tender Report"
+
+
+@dataclass
+class ReportGroup:
+    """One tender's block of rows; it is as tall as the longest of its per-row `lists`."""
+    number: int
+    record: dict
+    lists: Dict[str, list]
+
+    @property
+    def size(self) -> int:
+        return max([len(items) for items in self.lists.values()] + [1])
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """A report column.
+
+    `value(group, i)` gives the cell for row `i` of a tender's group. Tender-level columns are
+    only evaluated for the first row and merged down the group; a per-row column also merges
+    when the list named by `merge_single` holds a single item. `style` is one of text, center,
+    number or link; empty number and link cells fall back to text unless `style_empty` is set.
+    `fit` says whether the column's text counts toward the row height.
+    """
+    header: str
+    width: float
+    value: Callable[[ReportGroup, int], Any]
+    style: str = "text"
+    per_row: bool = False
+    merge_single: Optional[str] = None
+    fit: bool = True
+    style_empty: bool = False
+
+
+@dataclass(frozen=True)
+class ReportSpec:
+    """A tender report: banner title, columns, and how a record splits into per-row lists."""
+    title: str
+    columns: List[ColumnSpec]
+    group_lists: Callable[[dict], Dict[str, list]]
+    # Excel column width -> characters per wrapped line
+    chars_per_width: float = 1.15
+    # Blank lines added under wrapped text
+    padding_lines: int = 0
+    max_row_height: float = 240.0
+    # How merged text sizes its group: "shortfall" also sizes the first row for it, then spreads
+    # whatever the group still lacks over its rows; "even" gives every row an equal share of it
+    group_fit: str = "shortfall"
+
+
+def _thin_border() -> Border:
+    return Border(left=Side(style="thin"), right=Side(style="thin"), top=Side(style="thin"), bottom=Side(style="thin"))
+
+
+def _report_styles() -> List[NamedStyle]:
+    header_font = Font(color="FFFFFF", bold=True, name="Times New Roman", size=10)
+    data_font = Font(name="Times New Roman", size=10)
+    center_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    left_align = Alignment(horizontal="left", vertical="top", wrap_text=True)
+    return [
+        NamedStyle(
+            name="report_title",
+            font=Font(bold=True, size=14, name="Times New Roman"),
+            alignment=Alignment(horizontal="left", vertical="center"),
+            border=DEFAULT_BORDER,
+        ),
+        NamedStyle(
+            name="report_date",
+            font=Font(italic=True, size=10, name="Times New Roman"),
+            alignment=Alignment(horizontal="left", vertical="center"),
+            border=DEFAULT_BORDER,
+        ),
+        NamedStyle(
+            name="report_banner",
+            font=header_font,
+            fill=PatternFill(start_color="2F75B5", end_color="2F75B5", fill_type="solid"),
+            alignment=center_align,
+            border=_thin_border(),
+        ),
+        NamedStyle(
+            name="report_header",
+            font=header_font,
+            fill=PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid"),
+            alignment=center_align,
+            border=_thin_border(),
+        ),
+        # Covered cells of a merged range only carry the border
+        NamedStyle(name="report_border", border=_thin_border()),
+        NamedStyle(name="report_text", font=data_font, alignment=left_align, border=_thin_border()),
+        NamedStyle(
+            name="report_center",
+            font=data_font,
+            alignment=Alignment(horizontal="center", vertical="top", wrap_text=True),
+            border=_thin_border(),
+        ),
+        NamedStyle(
+            name="report_number",
+            font=data_font,
+            alignment=left_align,
+            border=_thin_border(),
+            number_format="#,##0.00",
+        ),
+        NamedStyle(
+            name="report_link",
+            font=Font(name="Times New Roman", size=10, color="0000FF", underline="single"),
+            alignment=left_align,
+            border=_thin_border(),
+        ),
+    ]
+
+
+def _line_counts(values: List[Any], chars_per_line: np.ndarray) -> np.ndarray:
+    """Wrapped line count of each value at the matching characters-per-line."""
+    texts = [value if isinstance(value, str) else str(value) for value in values]
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    lines = np.maximum(1, -(-lengths // chars_per_line))
+    # Explicit line breaks are rare; count those texts segment by segment
+    for k, text in enumerate(texts):
+        if "\n" in text:
+            segments = np.fromiter((len(seg.strip("\r")) for seg in text.splitlines()), dtype=np.int64)
+            lines[k] = max(1, int(np.maximum(1, -(-segments // chars_per_line[k])).sum()))
+    return lines
+
+
+class _ReportWriter:
+    """Lays out a `ReportSpec` one block of tenders at a time into a single worksheet."""
+
+    COVERED = object()
+
+    def __init__(self, spec: ReportSpec, write_only: bool):
+        self.spec = spec
+        self.write_only = write_only
+        self.wb = openpyxl.Workbook(write_only=write_only)
+        if write_only:
+            self.ws = self.wb.create_sheet(SHEET_TITLE)
+        else:
+            self.ws = self.wb.active
+            self.ws.title = SHEET_TITLE
+        # Register each named style once and keep its style array; assigning `cell.style = name`
+        # looks the name up in the workbook's style list on every cell
+        self.styles = {}
+        for style in _report_styles():
+            self.wb.add_named_style(style)
+            self.styles[style.name] = style.as_tuple()
+        self.column_styles = [f"report_{column.style}" for column in spec.columns]
+        self.chars_per_line = np.array(
+            [max(8, int(column.width * spec.chars_per_width)) for column in spec.columns], dtype=np.int64
+        )
+        # Ranges are disjoint by construction, so they skip MultiCellRange.add's overlap scan
+        self.merges = self.ws.merged_cells.ranges
+        self.next_row = 1
+
+    def cell(self, value=None, style: Optional[str] = None):
+        c = WriteOnlyCell(self.ws, value=value)
+        if style is not None:
+            c._style = copy(self.styles[style])
+        return c
+
+    def append(self, cells: list, height: Optional[float] = None):
+        if height is not None:
+            self.ws.row_dimensions[self.next_row].height = height
+        self.ws.append(cells)
+        if self.write_only:
+            if height is not None:
+                # The row is on disk; drop its dimension so memory doesn't grow with the report
+                del self.ws.row_dimensions[self.next_row]
+        else:
+            # Only write-only mode re-anchors hyperlinks once a cell has its position
+            for c in cells:
+                if c.hyperlink is not None:
+                    c.hyperlink.ref = c.coordinate
+        self.next_row += 1
+
+    def write_header(self):
+        # Column widths and freeze panes must be set before the first row is written
+        for i, column in enumerate(self.spec.columns, 1):
+            self.ws.column_dimensions[get_column_letter(i)].width = column.width
+        self.ws.freeze_panes = f"A{HEADER_ROWS + 1}"
+        n = len(self.spec.columns)
+
+        self.append([self.cell("Тендерийн бүртгэл", "report_title")], height=24)
+        current_date = datetime.now().strftime("%Y.%m.%d")
+        self.append([self.cell(f"Тайлант хугацаа: {current_date}", "report_date")])
+        self.append([self.cell(self.spec.title, "report_banner")] + [self.cell(style="report_border") for _ in range(n - 1)], height=20)
+        self.append([self.cell(column.header, "report_header") for column in self.spec.columns])
+        for row in (1, 2, 3):
+            self.merges.add(CellRange(min_col=1, min_row=row, max_col=n, max_row=row))
+
+    def write_block(self, groups: List[ReportGroup]):
+        columns = self.spec.columns
+        rows: List[list] = []
+        sizes = np.array([group.size for group in groups], dtype=np.int64)
+        # Text that sizes one row, and merged text that must fit across its whole group
+        row_fit, row_owner, row_col = [], [], []
+        group_fit, group_owner, group_col = [], [], []
+
+        for g, group in enumerate(groups):
+            size = int(sizes[g])
+            merged = [
+                size > 1 and (not column.per_row or (column.merge_single is not None and len(group.lists[column.merge_single]) == 1))
+                for column in columns
+            ]
+            start_row = self.next_row + len(rows)
+            for c, is_merged in enumerate(merged):
+                if is_merged:
+                    self.merges.add(CellRange(min_col=c + 1, min_row=start_row, max_col=c + 1, max_row=start_row + size - 1))
+
+            for i in range(size):
+                values = []
+                for c, column in enumerate(columns):
+                    if i > 0 and not column.per_row:
+                        values.append(self.COVERED)
+                        continue
+                    # A merged per-row column repeats its single item; it is written once but,
+                    # in "shortfall" mode, still sizes every row like the unmerged column would
+                    value = column.value(group, i)
+                    values.append(self.COVERED if i > 0 and merged[c] else value)
+                    if column.fit and value not in (None, ""):
+                        if merged[c] and i == 0:
+                            group_fit.append(value)
+                            group_owner.append(g)
+                            group_col.append(c)
+                        if not merged[c] or self.spec.group_fit != "even":
+                            row_fit.append(value)
+                            row_owner.append(len(rows))
+                            row_col.append(c)
+                rows.append(values)
+
+        heights = self._heights(len(rows), sizes, row_fit, row_owner, row_col, group_fit, group_owner, group_col)
+        for values, height in zip(rows, heights):
+            self.append([self._data_cell(value, c) for c, value in enumerate(values)], height=float(height))
+
+    def _heights(self, n_rows, sizes, row_fit, row_owner, row_col, group_fit, group_owner, group_col) -> np.ndarray:
+        max_height = self.spec.max_row_height
+        padding = self.spec.padding_lines
+        heights = np.full(n_rows, BASE_ROW_HEIGHT)
+        if row_fit:
+            needed = BASE_ROW_HEIGHT * (_line_counts(row_fit, self.chars_per_line[row_col]) + padding)
+            np.maximum.at(heights, np.array(row_owner), np.minimum(max_height, needed))
+        if group_fit:
+            owners = np.array(group_owner)
+            needed = BASE_ROW_HEIGHT * (_line_counts(group_fit, self.chars_per_line[group_col]) + padding)
+            group_needed = np.zeros(len(sizes))
+            if self.spec.group_fit == "even":
+                np.maximum.at(group_needed, owners, np.minimum(max_height, needed))
+                return np.maximum(heights, np.repeat(group_needed / sizes, sizes))
+            np.maximum.at(group_needed, owners, np.minimum(max_height * sizes[owners], needed))
+            # Spread any shortfall of a merged cell evenly over its group's rows
+            starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+            shortfall = np.maximum(0, group_needed - np.add.reduceat(heights, starts))
+            heights = np.minimum(max_height, heights + np.repeat(shortfall / sizes, sizes))
+        return heights
+
+    def _data_cell(self, value, c: int):
+        if value is self.COVERED:
+            return self.cell(style="report_border")
+        style = self.column_styles[c]
+        empty = value in (None, "")
+        if empty and style in ("report_number", "report_link") and not self.spec.columns[c].style_empty:
+            style = "report_text"
+        cell = self.cell(value, style)
+        if style == "report_link" and not empty:
+            cell.hyperlink = value
+        return cell
+
+    def save(self, filename: str):
+        self.ws.auto_filter.ref = f"A{HEADER_ROWS}:{get_column_letter(len(self.spec.columns))}{self.next_row - 1}"
+        self.wb.save(filename)
+
+
+def render_report(spec: ReportSpec, records: Iterable[dict], filename: str, write_only: Optional[bool] = None):
+    """Write `records` as a `spec` report to `filename` in a single pass.
+
+    `write_only` picks openpyxl's streaming mode (defaults to the EXCEL_WRITER setting); both
+    modes produce the same sheet.
+    """
+    if write_only is None:
+        write_only = EXCEL_WRITER == "streaming"
+    writer = _ReportWriter(spec, write_only)
+    writer.write_header()
+    block: List[ReportGroup] = []
+    for number, record in enumerate(records, 1):
+        block.append(ReportGroup(number=number, record=record, lists=spec.group_lists(record)))
+        if len(block) == REPORT_BLOCK_SIZE:
+            writer.write_block(block)
+            block = []
+    if block:
+        writer.write_block(block)
+
+    try:
+        writer.save(filename)
+        logger.info(f"Excel file saved successfully: {filename}")
+    except PermissionError:
+        logger.error(f"Permission denied: Cannot save '{filename}'. Please close the file if it's open.")
+        raise
+    except Exception as e:
+        logger.error(f"Error saving Excel file '{filename}': {e}", exc_info=True)
+        raise
@@ -0,0 +1,118 @@
+import os
+import fnmatch
+from collections import Counter
+from typing import Iterable, List, Optional
+
+from playwright.async_api import Route
+
+from src.logger import logger
+
+
+def _env_list(name: str, default: str) -> List[str]:
+    raw = os.getenv(name, default)
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+
+# We only read the DOM, so anything that just paints the page is skipped
+BLOCKED_RESOURCE_TYPES = _env_list("SCRAPER_BLOCKED_RESOURCE_TYPES", "image,font,stylesheet,media")
+BLOCKED_URL_PATTERNS = _env_list(
+    "SCRAPER_BLOCKED_URL_PATTERNS",
+    "*google-analytics.com*,*googletagmanager.com*,*doubleclick.net*,*facebook.net*,"
+    "*facebook.com/tr*,*hotjar.com*,*mc.yandex.*,*clarity.ms*",
+)
+# Allow-list wins over both deny lists (e.g. a stylesheet a page needs to render its buttons)
+ALLOWED_URL_PATTERNS = _env_list("SCRAPER_ALLOWED_URL_PATTERNS", "")
+
+# Rough average transfer size per resource type, used to estimate the bytes we never downloaded
+ESTIMATED_BYTES_BY_TYPE = {
+    "image": 40 * 1024,
+    "font": 60 * 1024,
+    "stylesheet": 30 * 1024,
+    "media": 500 * 1024,
+    "script": 50 * 1024,
+}
+DEFAULT_ESTIMATED_BYTES = 10 * 1024
+
+
+class RequestStats:
+    """Allowed/blocked request counters for one run; each run passes its own to the browser pool."""
+
+    def __init__(self):
+        self.blocked = Counter()
+        self.allowed = 0
+        self.estimated_bytes_saved = 0
+
+    def record(self, resource_type: str, blocked: bool):
+        if blocked:
+            self.blocked[resource_type] += 1
+            self.estimated_bytes_saved += ESTIMATED_BYTES_BY_TYPE.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+        else:
+            self.allowed += 1
+
+    def report(self) -> dict:
+        return {
+            "allowed_requests": self.allowed,
+            "blocked_requests": sum(self.blocked.values()),
+            "blocked_by_type": dict(self.blocked),
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+        }
+
+    def log_report(self, label: str) -> dict:
+        report = self.report()
+        logger.info(
+            f"Request policy report ({label}): allowed={report['allowed_requests']}, "
+            f"blocked={report['blocked_requests']} {report['blocked_by_type']}, "
+            f"~{report['estimated_bytes_saved'] / (1024 * 1024):.1f} MB saved"
+        )
+        return report
+
+
+class RequestPolicy:
+    """Allow/deny policy applied to every request a scraping context makes."""
+
+    def __init__(
+        self,
+        blocked_resource_types: Iterable[str] = BLOCKED_RESOURCE_TYPES,
+        blocked_url_patterns: Iterable[str] = BLOCKED_URL_PATTERNS,
+        allowed_url_patterns: Iterable[str] = ALLOWED_URL_PATTERNS,
+    ):
+        self.blocked_resource_types = set(blocked_resource_types)
+        self.blocked_url_patterns = list(blocked_url_patterns)
+        self.allowed_url_patterns = list(allowed_url_patterns)
+
+    @staticmethod
+    def _matches(url: str, patterns: List[str]) -> bool:
+        return any(fnmatch.fnmatch(url, pattern) for pattern in patterns)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        if self._matches(url, self.allowed_url_patterns):
+            return False
+        if self._matches(url, self.blocked_url_patterns):
+            return True
+        return resource_type in self.blocked_resource_types
+
+    async def handle(self, route: Route, stats: Optional[RequestStats] = None):
+        """Playwright route handler: abort blocked requests, pass everything else through.
+
+        The request is counted in `stats`, the counters of the run that leased the page.
+        """
+        request = route.request
+        blocked = self.should_block(request.url, request.resource_type)
+        if stats is not None:
+            stats.record(request.resource_type, blocked)
+        if blocked:
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+
+# Global policy instance shared by every browser context; counters live in per-run RequestStats
+_policy: Optional[RequestPolicy] = None
+
+
+def get_request_policy() -> RequestPolicy:
+    """Get or create the shared request policy."""
+    global _policy
+    if _policy is None:
+        _policy = RequestPolicy()
+    return _policy
@@ -12,6 +12,9 @@ from typing import List
 from src.logger import logger
 
 
+# Bounds the SMTP connect and each command so a stalled server can't hold a sender thread forever
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "60"))
+
 def _parse_email_list(raw: str | None, *, fallback: List[str]) -> List[str]:
         if raw is None:
                 return list(fallback)
@@ -302,7 +305,7 @@ def send_notification_email(
         msg.attach(MIMEText(html_body, "html", "utf-8"))
 
         try:
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
+            with smtplib.SMTP_SSL("smtp.gmail.com", 465, timeout=SMTP_TIMEOUT_SECONDS) as server:
                 server.login(sender_email, app_password)
                 server.send_message(msg)
             logger.info(f"Notification email sent successfully to {receiver_emails} with CC to {cc_emails}")
@@ -355,7 +358,7 @@ def send_email(
 
     try:
         # Send the email via Gmail SMTP server
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
+        with smtplib.SMTP_SSL('smtp.gmail.com', 465, timeout=SMTP_TIMEOUT_SECONDS) as server:
             server.login(sender_email, app_password)
             server.send_message(msg)
         logger.info(f"Email sent successfully to {receiver_emails} with CC to {cc_emails}")
@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Agents are built at import time in some modules; no request ever reaches the API in tests
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+
+from src.repositories.models import Base  # noqa: E402
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def make_overview(**overrides):
+    """A valid TenderOverview with placeholder text; override any field."""
+    from schemas.lvl_schema import TenderOverview
+
+    values = {
+        "summary": "Сургуулийн барилгын засвар",
+        "name": "Сургуулийн барилгын засвар",
+        "selection_number": "ШТ-000001",
+        "ordering_organization": "Боловсролын газар",
+        "announced_date": "2026-01-01",
+        "deadline_date": "2026-02-01",
+        "official_link": "https://www.tender.gov.mn/mn/invitation/detail/1",
+        "type_reason": "Барилгын ажил",
+        "tender_type": "WORKS",
+        "category_reason": "Засвар",
+        "tender_category": ["W01"],
+        "category_detail_reason": "Засвар",
+        "tender_category_detail": ["W01_001"],
+    }
+    values.update(overrides)
+    return TenderOverview(**values)
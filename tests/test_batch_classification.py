@@ -0,0 +1,196 @@
+import ast
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import make_overview
+from schemas.lvl_schema import TenderOverviewAgent, TenderOverviewConfig
+
+
+def _usage():
+    return SimpleNamespace(input_tokens=0, cache_read_tokens=0, output_tokens=0)
+
+
+class FakeBatchAgent:
+    """Stands in for the batch agent: echoes each prompt's item_id back as an overview."""
+
+    def __init__(self, respond=None):
+        self.calls = []
+        self.respond = respond or (lambda item_ids: [make_overview(item_id=item_id, name=item_id) for item_id in item_ids])
+
+    async def run(self, prompts, instructions=None, model_settings=None):
+        item_ids = [ast.literal_eval(prompt)["item_id"] for prompt in prompts]
+        self.calls.append(item_ids)
+        return SimpleNamespace(output=self.respond(item_ids), usage=_usage)
+
+
+class FakeSingleAgent:
+    def __init__(self):
+        self.calls = []
+
+    async def run(self, prompts, instructions=None, model_settings=None):
+        item_id = ast.literal_eval(prompts[0])["item_id"]
+        self.calls.append(item_id)
+        return SimpleNamespace(output=make_overview(item_id=item_id, name=f"single {item_id}"), usage=_usage)
+
+
+@pytest.fixture
+def agent():
+    return TenderOverviewAgent(TenderOverviewConfig(
+        model_name="test", context_cache=False, index_fallback=False, requests_per_minute=None, tokens_per_minute=None,
+    ))
+
+
+def _classify(agent, batch_agent, items, batch_size=10):
+    agent.tier.batch_agent = batch_agent
+    agent.tier.agent = FakeSingleAgent()
+    return asyncio.run(agent._classify_batch(items, batch_size, agent.tier))
+
+
+def _items(n):
+    return [{"invitation_id": str(100 + i), "tender_name": f"tender {i}"} for i in range(n)]
+
+
+def test_item_ids_are_unique_and_stable():
+    items = [{"invitation_id": "7"}, {"tender_id": "8"}, {"invitation_id": "7"}, {}]
+    assert TenderOverviewAgent._assign_item_ids(items) == ["7", "8", "7#1", "3"]
+
+
+def test_results_follow_input_order_not_output_order(agent):
+    batch = FakeBatchAgent(lambda item_ids: [make_overview(item_id=i, name=i) for i in reversed(item_ids)])
+    results = _classify(agent, batch, _items(4))
+    assert [overview.name for overview in results] == ["100", "101", "102", "103"]
+
+
+def test_missing_and_unknown_items_are_rerun_singly(agent):
+    batch = FakeBatchAgent(lambda item_ids: [make_overview(item_id=i, name=i) for i in item_ids[1:]] + [make_overview(item_id="bogus")])
+    results = _classify(agent, batch, _items(3))
+    assert agent.tier.agent.calls == ["100"]
+    assert [overview.name for overview in results] == ["single 100", "101", "102"]
+
+
+def test_duplicate_outputs_keep_the_first(agent):
+    batch = FakeBatchAgent(lambda item_ids: [make_overview(item_id=item_ids[0], name="first"), make_overview(item_id=item_ids[0], name="second")])
+    results = _classify(agent, batch, _items(1))
+    assert results[0].name == "first"
+
+
+def test_pack_chunks_respects_size_and_token_budget(agent):
+    agent.config.batch_token_budget = 100
+    # ~34 estimated tokens each, then one oversized prompt
+    prompts = ["x" * 100] * 5 + ["y" * 1000] + ["x" * 100]
+    assert agent._pack_chunks(prompts, batch_size=10) == [[0, 1], [2, 3], [4], [5], [6]]
+    assert agent._pack_chunks(["x"] * 5, batch_size=2) == [[0, 1], [2, 3], [4]]
+
+
+def test_failing_chunk_is_split_until_it_succeeds(agent):
+    from pydantic_ai.exceptions import UnexpectedModelBehavior
+
+    def respond(item_ids):
+        if len(item_ids) > 2:
+            raise UnexpectedModelBehavior("output validation failed")
+        return [make_overview(item_id=i, name=i) for i in item_ids]
+
+    batch = FakeBatchAgent(respond)
+    results = _classify(agent, batch, _items(8))
+    assert [overview.name for overview in results] == [str(100 + i) for i in range(8)]
+    assert batch.calls[0] == [str(100 + i) for i in range(8)]
+    assert sorted(len(call) for call in batch.calls if len(call) <= 2) == [2, 2, 2, 2]
+    assert agent.tier.agent.calls == []
+
+
+def test_timed_out_chunk_is_split(agent):
+    agent.config.batch_timeout_seconds = 0.05
+
+    class SlowForLargeChunks(FakeBatchAgent):
+        async def run(self, prompts, instructions=None, model_settings=None):
+            if len(prompts) > 1:
+                await asyncio.sleep(1)
+            return await super().run(prompts, instructions, model_settings)
+
+    results = _classify(agent, SlowForLargeChunks(), _items(2))
+    assert [overview.name for overview in results] == ["100", "101"]
+
+
+def test_single_item_chunk_failure_falls_back_to_single_run(agent):
+    from pydantic_ai.exceptions import UnexpectedModelBehavior
+
+    def respond(item_ids):
+        raise UnexpectedModelBehavior("output validation failed")
+
+    results = _classify(agent, FakeBatchAgent(respond), _items(1))
+    assert agent.tier.agent.calls == ["100"]
+    assert results[0].name == "single 100"
+
+
+def test_tiered_mode_caches_only_main_model_results(db_session, monkeypatch):
+    from src.agent.agent import AgentProcessor
+    from src.agent.keyword_scorer import KeywordMatch
+    from src.repositories.classification_cache import ClassificationCacheRepository
+
+    agent = TenderOverviewAgent(TenderOverviewConfig(
+        model_name="test", fast_model_name="test", tiered=True, context_cache=False,
+        index_fallback=False, requests_per_minute=None, tokens_per_minute=None,
+    ))
+    agent.fast_tier.name = "test-fast"
+    # The first tender is obvious (goes to the fast tier and agrees), the second is ambiguous
+    matches = {"100": KeywordMatch("W01", "W01_001", 10.0, 1.0), "101": KeywordMatch(None, None, 0.0, 0.0)}
+    monkeypatch.setattr(agent.keyword_scorer, "score", lambda input_data: matches[input_data["invitation_id"]])
+    for tier in (agent.tier, agent.fast_tier):
+        tier.batch_agent = FakeBatchAgent()
+        tier.agent = FakeSingleAgent()
+
+    cache = ClassificationCacheRepository(db_session, system_prompt="prompt", model_name="test", catalog_hash="c")
+    items = _items(2)
+    results = asyncio.run(AgentProcessor(agent, cache=cache).process_batch(items))
+
+    assert [overview.produced_by for overview in results] == ["test-fast", "test"]
+    assert agent.fast_tier.batch_agent.calls == [["100"]]
+    assert cache.get_by_id(cache.make_key(items[0])) is None
+    assert cache.get_by_id(cache.make_key(items[1])).name == "101"
+
+
+def test_index_fallback_results_are_not_cached(db_session):
+    from src.agent.agent import AgentProcessor
+    from src.repositories.classification_cache import ClassificationCacheRepository
+
+    agent = TenderOverviewAgent(TenderOverviewConfig(
+        model_name="test", context_cache=False, index_fallback=True, requests_per_minute=None, tokens_per_minute=None,
+    ))
+    agent.tier.batch_agent = FakeBatchAgent(lambda item_ids: [])
+
+    class FailingSingleAgent:
+        async def run(self, *args, **kwargs):
+            raise RuntimeError("model unavailable")
+
+    agent.tier.agent = FailingSingleAgent()
+    cache = ClassificationCacheRepository(db_session, system_prompt="prompt", model_name="test", catalog_hash="c")
+    items = [{"invitation_id": "100", "tender_name": "Сургуулийн барилгын засвар"}]
+    results = asyncio.run(AgentProcessor(agent, cache=cache).process_batch(items))
+
+    assert results[0].is_fallback and results[0].produced_by is None
+    assert cache.get_by_id(cache.make_key(items[0])) is None
+
+
+def test_cache_io_runs_off_the_event_loop(db_session, agent):
+    import threading
+
+    from src.agent.agent import AgentProcessor
+    from src.repositories.classification_cache import ClassificationCacheRepository
+
+    agent.tier.batch_agent = FakeBatchAgent()
+    agent.tier.agent = FakeSingleAgent()
+    cache = ClassificationCacheRepository(db_session, system_prompt="prompt", model_name="test", catalog_hash="c")
+    threads = []
+    for name in ("get_many", "upsert_many", "flush_hits"):
+        method = getattr(cache, name)
+        setattr(cache, name, lambda *args, _method=method: (threads.append(threading.current_thread()), _method(*args))[1])
+
+    processor = AgentProcessor(agent, cache=cache)
+    first = asyncio.run(processor.process_batch(_items(2)))
+    again = asyncio.run(processor.process_batch(_items(2)))
+
+    assert [overview.name for overview in again] == [overview.name for overview in first] == ["100", "101"]
+    assert cache.stats() == {"hits": 2, "misses": 2, "hit_rate": 0.5}
+    assert len(threads) == 5 and threading.main_thread() not in threads
@@ -0,0 +1,55 @@
+from conftest import make_overview
+from schemas.cache_schema import ClassificationEntry
+from src.repositories.classification_cache import ClassificationCacheRepository
+from src.repositories.models import ClassificationRecord
+
+
+def _repository(db_session, model_name="model-a", catalog_hash="catalog-1"):
+    return ClassificationCacheRepository(db_session, system_prompt="prompt", model_name=model_name, catalog_hash=catalog_hash)
+
+
+def test_create_stores_entry_under_its_key(db_session):
+    cache = _repository(db_session)
+    key = cache.make_key({"name": "tender"})
+    cache.create(ClassificationEntry(key=key, overview=make_overview()))
+
+    assert cache.get_by_id(key).name == make_overview().name
+
+
+def test_key_depends_on_model(db_session):
+    assert _repository(db_session, "model-a").make_key({"name": "x"}) != _repository(db_session, "model-b").make_key({"name": "x"})
+
+
+def test_hits_are_counted_without_committing_on_read(db_session):
+    cache = _repository(db_session)
+    cache.upsert("k", make_overview())
+    commits = []
+    original_commit = db_session.commit
+    db_session.commit = lambda: (commits.append(1), original_commit())
+
+    cache.get_by_id("k")
+    cache.get_by_id("k")
+    assert cache.get_by_id("missing") is None
+    assert commits == []
+    assert cache.stats()["hits"] == 2
+
+    cache.flush_hits()
+    assert commits == [1]
+    assert db_session.get(ClassificationRecord, "k").hits == 2
+
+
+def test_catalog_change_invalidates_entries(db_session):
+    _repository(db_session, catalog_hash="old").upsert("k", make_overview())
+
+    assert _repository(db_session, catalog_hash="new").get_by_id("k") is None
+
+
+def test_get_many_lines_up_with_keys_and_counts_hits(db_session):
+    cache = _repository(db_session)
+    cache.upsert_many({"a": make_overview(name="A"), "b": make_overview(name="B")})
+
+    results = cache.get_many(["b", "missing", "a", "b"])
+    assert [result.name if result else None for result in results] == ["B", None, "A", "B"]
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+    cache.flush_hits()
+    assert db_session.get(ClassificationRecord, "b").hits == 2
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from conftest import make_overview
+from main import build_overview, is_specific_overview
+from src.agent.code_index import CodeCandidate, CodeCandidates, CodeIndex
+
+CATALOG = [
+    ("W01", None, "Барилгын ажил"),
+    ("W01_001", "W01", "Сургууль, цэцэрлэгийн барилгын засвар"),
+    ("W01_002", "W01", "Орон сууцны барилга угсралт"),
+    ("G07", None, "Хүнсний бүтээгдэхүүн"),
+    ("G07_001", "G07", "Мах, махан бүтээгдэхүүн"),
+    ("G07_002", "G07", "Гурил, будаа, гурилан бүтээгдэхүүн"),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return CodeIndex(CATALOG, dimensions=1024)
+
+
+def test_search_finds_nearest_codes(index):
+    candidates = index.search({"tender_name": "Махан бүтээгдэхүүн нийлүүлэх"})
+    assert candidates.best_level2.code == "G07"
+    assert candidates.level3[0].code == "G07_001"
+
+    candidates = index.search({"tender_name": "Сургуулийн барилгын засвар"})
+    assert candidates.best_level2.code == "W01"
+    assert candidates.level3[0].code == "W01_001"
+
+
+def test_level2_score_covers_its_best_child(index):
+    candidates = index.search({"tender_name": "Гурил будаа"}, level2_k=2, level3_k=4)
+    level2 = {c.code: c.score for c in candidates.level2}
+    level3 = {c.code: c.score for c in candidates.level3}
+    assert level2["G07"] >= level3["G07_002"]
+    assert [c.score for c in candidates.level3] == sorted(level3.values(), reverse=True)
+
+
+def test_search_many_matches_search(index):
+    items = [{"tender_name": "Мах нийлүүлэх"}, {"tender_name": "Орон сууцны барилга"}, {}]
+    for single, batched in zip([index.search(item) for item in items], index.search_many(items)):
+        assert [c.code for c in single.level2] == [c.code for c in batched.level2]
+        assert np.allclose([c.score for c in single.level3], [c.score for c in batched.level3])
+    assert index.search_many([]) == []
+
+
+def test_empty_tender_has_no_candidates(index):
+    candidates = index.search({"tender_name": "", "body": ""})
+    assert candidates.level2 == [] and candidates.best_level2 is None
+
+
+def test_fallback_overview_is_marked_and_skips_pdf_stage():
+    from schemas.lvl_schema import TenderOverviewAgent, TenderOverviewConfig
+
+    agent = TenderOverviewAgent(TenderOverviewConfig(model_name="test", context_cache=False))
+    assert agent.config.index_fallback is False
+
+    candidates = CodeCandidates(
+        level2=[CodeCandidate("G07", 0.8)], level3=[CodeCandidate("W01_001", 0.9), CodeCandidate("G07_007", 0.7)]
+    )
+    overview = agent.fallback_overview({"tender_name": "Хүнс", "total_budget": "1000"}, candidates)
+    assert overview.is_fallback
+    assert [c.value for c in overview.tender_category] == ["G07"]
+    assert [c.value for c in overview.tender_category_detail] == ["G07_007"]
+
+    row = build_overview(overview, {})
+    assert row["classification_source"] == "code_index"
+    assert not is_specific_overview(row)
+
+    model_row = build_overview(make_overview(tender_type="GOODS", tender_category=["G07"], tender_category_detail=["G07_007"]), {})
+    assert model_row["classification_source"] == "model"
+    assert is_specific_overview(model_row)
+
+
+def test_fallback_below_min_score_assigns_other():
+    from schemas.lvl_schema import TenderOverviewAgent, TenderOverviewConfig
+
+    agent = TenderOverviewAgent(TenderOverviewConfig(model_name="test", context_cache=False))
+    overview = agent.fallback_overview({"tender_name": "x"}, CodeCandidates(level2=[CodeCandidate("G07", 0.01)], level3=[]))
+    assert overview.tender_type.value == "OTHER"
+    assert overview.tender_category[0].value == "Other"
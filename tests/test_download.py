@@ -0,0 +1,118 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from src.services import http_client
+from src.services.http_client import download_to_file
+
+BODY = bytes(range(256)) * 4096  # 1 MiB
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    async def backoff(attempt, retry_after=None):
+        pass
+
+    monkeypatch.setattr(http_client, "_backoff", backoff)
+    # Small blocks so interrupted transfers leave partial data behind
+    monkeypatch.setattr(http_client, "HTTP_DOWNLOAD_WRITE_BUFFER", 64 * 1024)
+
+
+async def _send(request, status, body, headers, total=None, cut_after=None):
+    response = web.StreamResponse(status=status, headers={"ETag": '"v1"', "Content-Length": str(total or len(body)), **headers})
+    await response.prepare(request)
+    if cut_after is None:
+        await response.write(body)
+        return response
+    # Paced so the client reads the partial body before the connection drops
+    for start in range(0, cut_after, 16 * 1024):
+        await response.write(body[start:min(start + 16 * 1024, cut_after)])
+        await asyncio.sleep(0.005)
+    await asyncio.sleep(0.05)
+    request.transport.close()
+    return response
+
+
+def _download(handler, tmp_path, **kwargs):
+    """Serve `handler` locally and download from it; returns (result or exception, requests seen, file path)."""
+    seen = []
+
+    async def run():
+        async def recording(request):
+            seen.append(dict(request.headers))
+            return await handler(request, len(seen))
+
+        app = web.Application()
+        app.router.add_get("/file.pdf", recording)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            return await download_to_file(f"http://127.0.0.1:{port}/file.pdf", str(tmp_path / "file.pdf"), **kwargs)
+        except aiohttp.ClientError as e:
+            return e
+        finally:
+            await http_client.close_session()
+            await runner.cleanup()
+
+    return asyncio.run(run()), seen, tmp_path / "file.pdf"
+
+
+def test_interrupted_download_resumes_with_range(tmp_path):
+    async def handler(request, n):
+        if n == 1:
+            return await _send(request, 200, BODY, {}, cut_after=300_000)
+        start = int(request.headers["Range"].split("=")[1].rstrip("-"))
+        return await _send(request, 206, BODY[start:], {"Content-Range": f"bytes {start}-{len(BODY) - 1}/{len(BODY)}"})
+
+    result, seen, path = _download(handler, tmp_path)
+    assert result.status == 200 and result.size == len(BODY)
+    assert path.read_bytes() == BODY
+    assert seen[1]["Range"].startswith("bytes=") and seen[1]["If-Range"] == '"v1"'
+
+
+def test_server_ignoring_range_restarts_from_zero(tmp_path):
+    async def handler(request, n):
+        return await _send(request, 200, BODY, {}, cut_after=300_000 if n == 1 else None)
+
+    result, seen, path = _download(handler, tmp_path)
+    assert result.size == len(BODY)
+    assert path.read_bytes() == BODY
+    assert len(seen) == 2
+
+
+def test_server_ignoring_range_and_dropping_is_capped(tmp_path):
+    async def handler(request, n):
+        return await _send(request, 200, BODY, {}, cut_after=300_000)
+
+    result, seen, path = _download(handler, tmp_path, max_retries=3)
+    assert isinstance(result, aiohttp.ClientError)
+    # The first request plus three restarts; the fourth restart gives up
+    assert len(seen) == 5
+    assert not path.exists()
+
+
+def test_total_attempts_are_capped(tmp_path):
+    async def handler(request, n):
+        start = int(request.headers["Range"].split("=")[1].rstrip("-")) if "Range" in request.headers else 0
+        status = 206 if start else 200
+        # Every attempt makes progress, so only the attempt cap stops it
+        return await _send(request, status, BODY[start:], {}, cut_after=50_000)
+
+    result, seen, path = _download(handler, tmp_path, max_attempts=4)
+    assert isinstance(result, aiohttp.ClientError)
+    assert len(seen) == 4
+
+
+def test_not_modified_writes_nothing(tmp_path):
+    async def handler(request, n):
+        return web.Response(status=304)
+
+    result, seen, path = _download(handler, tmp_path, headers={"If-None-Match": '"v1"'})
+    assert result.status == 304
+    assert seen[0]["If-None-Match"] == '"v1"'
+    assert not path.exists()
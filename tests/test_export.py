@@ -0,0 +1,64 @@
+import csv
+import json
+
+import pytest
+
+from src.services import export
+from src.services.export import ExportFormat, OVERVIEW_SCHEMA, export_overviews, parse_formats
+
+
+def _record(**overrides):
+    record = {
+        "name": "Сургуулийн засвар",
+        "selection_number": "ШТ-000001",
+        "total_budget": "1500000.5",
+        "tender_type": "WORKS",
+        "tender_category": ["W01", "W02"],
+        "classification_source": "model",
+        "content": "scraped page body, never exported",
+    }
+    record.update(overrides)
+    return record
+
+
+def test_parse_formats():
+    assert parse_formats("parquet, CSV") == [ExportFormat.PARQUET, ExportFormat.CSV]
+    assert parse_formats("") == []
+
+
+def test_parse_formats_falls_back_on_unknown_format():
+    assert parse_formats("parquet,xlsx") == []
+
+
+def test_csv_round_trip(tmp_path):
+    paths = export_overviews([_record(), _record(total_budget="", tender_category=[])], str(tmp_path / "out" / "overview"), ["csv"])
+    assert paths == [str(tmp_path / "out" / "overview.csv")]
+    with open(paths[0], encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == [field.name for field in OVERVIEW_SCHEMA]
+    assert rows[0]["total_budget"] == "1500000.5"
+    assert json.loads(rows[0]["tender_category"]) == ["W01", "W02"]
+    assert rows[1]["total_budget"] == "" and rows[1]["tender_category"] == "[]"
+
+
+def test_parquet_round_trip(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    paths = export_overviews([_record(), _record(total_budget="n/a")], str(tmp_path / "overview"), ["parquet"])
+    table = pq.read_table(paths[0])
+    assert table.schema.names == [field.name for field in OVERVIEW_SCHEMA]
+    rows = table.to_pylist()
+    assert rows[0]["total_budget"] == 1500000.5
+    assert rows[0]["tender_category"] == ["W01", "W02"]
+    assert rows[1]["total_budget"] is None
+
+
+def test_failed_format_is_skipped_and_leaves_no_partial_file(tmp_path, monkeypatch):
+    def broken(records, path, schema):
+        with open(path, "w") as f:
+            f.write("half")
+        raise OSError("disk full")
+
+    monkeypatch.setitem(export.WRITERS, ExportFormat.PARQUET, broken)
+    paths = export_overviews([_record()], str(tmp_path / "overview"), ["parquet", "csv"])
+    assert paths == [str(tmp_path / "overview.csv")]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["overview.csv"]
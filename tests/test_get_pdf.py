@@ -0,0 +1,66 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.repositories.models import Base
+from src.repositories.pdf_manifest import PdfManifestRepository
+from src.services import get_pdf, pdf_store
+
+
+@pytest.fixture
+def manifest_threads(tmp_path, monkeypatch):
+    """Point the manifest threads at a fresh database; yields the threads that opened a repository."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    opened = []
+
+    def repository():
+        opened.append(threading.current_thread())
+        return PdfManifestRepository(Session())
+
+    monkeypatch.setattr(get_pdf, "get_pdf_manifest_repository", repository)
+    monkeypatch.setattr(get_pdf, "_manifest_local", threading.local())
+    monkeypatch.setattr(get_pdf, "_manifest_executor", None)
+    monkeypatch.setattr(pdf_store, "PDF_STORE_DIR", str(tmp_path / "store"))
+    yield opened, Session
+    if get_pdf._manifest_executor is not None:
+        get_pdf._manifest_executor.shutdown()
+    engine.dispose()
+
+
+def test_concurrent_downloads_share_the_manifest(manifest_threads, monkeypatch):
+    opened, Session = manifest_threads
+    downloads = []
+    in_flight = [0, 0]
+
+    async def fake_download(url, path, headers=None, max_retries=3):
+        downloads.append(url)
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        with open(path, "wb") as f:
+            # Attachments 0 and 1 carry the same file
+            f.write(f"%PDF {max(0, int(url[-1]) - 1)}".encode())
+        return SimpleNamespace(status=200, headers={"ETag": f'"{url[-1]}"'})
+
+    monkeypatch.setattr(get_pdf, "download_to_file", fake_download)
+    urls = [f"https://www.tender.gov.mn/file/{i}" for i in range(6)]
+
+    async def run():
+        return await asyncio.gather(*(get_pdf.download_pdf(url, "T-1") for url in urls))
+
+    paths = asyncio.run(run())
+    assert len(downloads) == 6 and in_flight[1] > 1
+    assert paths[0] == paths[1] and len(set(paths)) == 5
+    assert opened and threading.main_thread() not in opened
+    assert len(PdfManifestRepository(Session()).get_all()) == 6
+
+    # Fresh entries are served from the store without another request
+    assert asyncio.run(run()) == paths
+    assert len(downloads) == 6
@@ -0,0 +1,18 @@
+import asyncio
+
+from src.repositories.tender_cache import TenderDetailCacheRepository
+from src.services import get_tenders
+
+
+def test_fetch_details_closes_its_cache_session(db_session, monkeypatch):
+    closed = []
+    repository = TenderDetailCacheRepository(db_session)
+    monkeypatch.setattr(repository, "close", lambda: closed.append(True))
+    monkeypatch.setattr(get_tenders, "get_tender_cache_repository", lambda: repository)
+
+    async def failing_detail(*args):
+        raise RuntimeError("detail API down")
+
+    monkeypatch.setattr(get_tenders, "fetch_tender_detail", failing_detail)
+    infos = asyncio.run(get_tenders._fetch_details([{"tenderId": 1}], asyncio.Semaphore(1), "2026-01-01"))
+    assert infos == [] and closed == [True]
@@ -0,0 +1,186 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from schemas.job_schema import JobEntry, JobStatus
+from src.jobs import JobManager, JobProgress
+from src.repositories.job_repository import JobRepository
+from src.repositories.models import Base, upgrade_schema
+
+
+def _manager(db_session, handler=None, **kwargs) -> JobManager:
+    manager = JobManager(JobRepository(db_session), **kwargs)
+
+    async def default(date_from, date_to, progress, formats):
+        return {"range": f"{date_from}..{date_to}", "formats": formats}
+
+    manager.register("process", handler or default)
+    return manager
+
+
+async def _drain(manager: JobManager):
+    await manager._queue.join()
+    await manager.stop()
+
+
+def test_active_submission_coalesces(db_session):
+    async def run():
+        manager = _manager(db_session)
+        first, coalesced_first = await manager.submit("process", "2026-01-01", "2026-01-02")
+        again, coalesced_again = await manager.submit("process", "2026-01-01", "2026-01-02")
+        other, coalesced_other = await manager.submit("process", "2026-01-03", "2026-01-03")
+        return first, coalesced_first, again, coalesced_again, other, coalesced_other
+
+    first, coalesced_first, again, coalesced_again, other, coalesced_other = asyncio.run(run())
+    assert not coalesced_first and coalesced_again and not coalesced_other
+    assert again.id == first.id
+    assert other.id != first.id
+
+
+def test_submissions_for_other_formats_get_their_own_job(db_session):
+    async def run():
+        manager = _manager(db_session)
+        plain, _ = await manager.submit("process", "2026-01-01", "2026-01-01")
+        both, coalesced_both = await manager.submit("process", "2026-01-01", "2026-01-01", ["parquet", "csv"])
+        reordered, coalesced_reordered = await manager.submit("process", "2026-01-01", "2026-01-01", ["csv", "parquet"])
+        return plain, both, coalesced_both, reordered, coalesced_reordered
+
+    plain, both, coalesced_both, reordered, coalesced_reordered = asyncio.run(run())
+    assert not coalesced_both and both.id != plain.id
+    assert coalesced_reordered and reordered.id == both.id
+    assert both.formats == ["parquet", "csv"]
+
+
+def test_finished_job_is_not_reused(db_session):
+    async def run():
+        manager = _manager(db_session)
+        await manager.start()
+        first, _ = await manager.submit("process", "2026-01-01", "2026-01-01")
+        await manager._queue.join()
+        second, coalesced = await manager.submit("process", "2026-01-01", "2026-01-01")
+        await _drain(manager)
+        return first, second, coalesced
+
+    first, second, coalesced = asyncio.run(run())
+    repository = JobRepository(db_session)
+    assert not coalesced and second.id != first.id
+    finished = repository.get_by_id(first.id)
+    assert finished.status == JobStatus.SUCCEEDED
+    assert finished.result == {"range": "2026-01-01..2026-01-01", "formats": []}
+    assert finished.progress["stage"] == "finished"
+
+
+def test_failing_handler_marks_job_failed(db_session):
+    async def failing(date_from, date_to, progress, formats):
+        raise RuntimeError("listing unavailable")
+
+    async def run():
+        manager = _manager(db_session, failing)
+        await manager.start()
+        job, _ = await manager.submit("process", "2026-01-01", "2026-01-01")
+        await _drain(manager)
+        return job
+
+    job = JobRepository(db_session).get_by_id(asyncio.run(run()).id)
+    assert job.status == JobStatus.FAILED
+    assert job.error == "listing unavailable"
+
+
+def test_interrupted_jobs_resume_until_max_attempts(db_session):
+    repository = JobRepository(db_session)
+    resumable = repository.create(JobEntry(id="resume", kind="process", date_from="2026-01-01", date_to="2026-01-01"))
+    repository.mark_running(resumable.id)
+    exhausted = repository.create(JobEntry(id="exhausted", kind="process", date_from="2026-01-02", date_to="2026-01-02"))
+    for _ in range(3):
+        repository.mark_running(exhausted.id)
+    queued = repository.create(JobEntry(id="queued", kind="process", date_from="2026-01-03", date_to="2026-01-03"))
+
+    async def run():
+        manager = _manager(db_session, max_attempts=3)
+        await manager.start()
+        await _drain(manager)
+
+    asyncio.run(run())
+    assert repository.get_by_id("resume").status == JobStatus.SUCCEEDED
+    assert repository.get_by_id("resume").attempts == 2
+    assert repository.get_by_id("exhausted").status == JobStatus.FAILED
+    assert "Interrupted 3 times" in repository.get_by_id("exhausted").error
+    assert repository.get_by_id(queued.id).status == JobStatus.SUCCEEDED
+
+
+def test_unknown_kind_is_rejected(db_session):
+    manager = _manager(db_session)
+    with pytest.raises(ValueError, match="unknown"):
+        asyncio.run(manager.submit("unknown", "2026-01-01", "2026-01-01"))
+
+
+def test_progress_writes_are_throttled(db_session):
+    repository = JobRepository(db_session)
+    repository.create(JobEntry(id="job", kind="process", date_from="2026-01-01", date_to="2026-01-01"))
+    progress = JobProgress(repository, "job", interval=60)
+
+    progress.update("classify", processed=1)
+    progress.update(processed=2)
+    asyncio.run(progress.flush())
+    assert repository.get_by_id("job").progress["processed"] == 1
+    progress.update(processed=3, force=True)
+    asyncio.run(progress.flush())
+    assert repository.get_by_id("job").progress == {"stage": "classify", "processed": 3, "updated_at": progress.snapshot["updated_at"]}
+
+
+def test_upgrade_adds_formats_to_an_existing_jobs_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    with engine.begin() as conn:
+        # The jobs table as first released, before export formats
+        conn.execute(text(
+            "CREATE TABLE jobs (id VARCHAR(32) PRIMARY KEY, kind VARCHAR(64), dedup_key VARCHAR(160), "
+            "date_from VARCHAR(10), date_to VARCHAR(10), status VARCHAR(16), progress_json TEXT, "
+            "result_json TEXT, error TEXT, attempts INTEGER, created_at DATETIME, started_at DATETIME, "
+            "finished_at DATETIME)"
+        ))
+        conn.execute(text(
+            "INSERT INTO jobs (id, kind, dedup_key, date_from, date_to, status, progress_json, attempts, created_at) "
+            "VALUES ('old', 'process', 'process:2026-01-01:2026-01-01', '2026-01-01', '2026-01-01', 'queued', '{}', 0, "
+            "'2026-01-01 00:00:00')"
+        ))
+    Base.metadata.create_all(engine)
+    upgrade_schema(engine)
+    upgrade_schema(engine)
+    assert "formats" in {c["name"] for c in inspect(engine).get_columns("jobs")}
+
+    repository = JobRepository(sessionmaker(bind=engine, expire_on_commit=False)())
+    assert repository.get_by_id("old").formats == []
+    repository.create(JobEntry(id="new", kind="process", date_from="2026-01-02", date_to="2026-01-02", formats=["csv"]))
+    assert repository.get_by_id("new").formats == ["csv"]
+    engine.dispose()
+
+
+def test_job_table_error_does_not_stop_the_worker(db_session, monkeypatch):
+    repository = JobRepository(db_session)
+    mark_running = repository.mark_running
+
+    def flaky_mark_running(job_id):
+        if job_id == "broken":
+            raise RuntimeError("database is locked")
+        return mark_running(job_id)
+
+    monkeypatch.setattr(repository, "mark_running", flaky_mark_running)
+    manager = JobManager(repository, workers=1)
+
+    async def handler(date_from, date_to, progress, formats):
+        return {}
+
+    manager.register("process", handler)
+    repository.create(JobEntry(id="broken", kind="process", date_from="2026-01-01", date_to="2026-01-01"))
+    repository.create(JobEntry(id="next", kind="process", date_from="2026-01-02", date_to="2026-01-02"))
+
+    async def run():
+        await manager.start()
+        await _drain(manager)
+
+    asyncio.run(run())
+    broken = repository.get_by_id("broken")
+    assert broken.status == JobStatus.FAILED and "database is locked" in broken.error
+    assert repository.get_by_id("next").status == JobStatus.SUCCEEDED
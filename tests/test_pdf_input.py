@@ -0,0 +1,30 @@
+import asyncio
+import threading
+
+from pydantic_ai import BinaryContent
+
+from src.agent import pdf_input
+from src.agent.pdf_input import PdfInputLayer
+
+
+def test_inline_pdfs_are_read_off_the_loop_within_the_budget(tmp_path, monkeypatch):
+    paths = []
+    for i, size in enumerate((3000, 5000)):
+        path = tmp_path / f"{i}.pdf"
+        path.write_bytes(b"%PDF" + bytes([i]) * (size - 4))
+        paths.append(str(path))
+    readers = []
+    read_bytes = pdf_input._read_bytes
+    monkeypatch.setattr(pdf_input, "_read_bytes", lambda path: (readers.append(threading.current_thread()), read_bytes(path))[1])
+    layer = PdfInputLayer("test", memory_budget_bytes=10000, upload_enabled=False, text_extraction=False)
+
+    async def run():
+        async with layer.open(paths) as inputs:
+            held = layer.budget.in_use
+        return inputs, held
+
+    inputs, held = asyncio.run(run())
+    assert all(isinstance(item, BinaryContent) for item in inputs)
+    assert [len(item.data) for item in inputs] == [3000, 5000]
+    assert held == 8000 and layer.budget.in_use == 0
+    assert len(readers) == 2 and threading.main_thread() not in readers
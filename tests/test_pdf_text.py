@@ -0,0 +1,76 @@
+import pytest
+
+from src.services.pdf_text import find_section, lot_passages
+
+
+def _document(heading_3: str, heading_4: str) -> str:
+    return "\n".join([
+        "Тендерийн баримт бичиг",
+        "Удиртгал",
+        heading_3,
+        "Техникийн тодорхойлолт: 100 ширхэг ширээ",
+        heading_4,
+        "Гэрээний нөхцөл",
+    ])
+
+
+@pytest.mark.parametrize("heading_3, heading_4", [
+    ("III БҮЛЭГ", "IV БҮЛЭГ"),
+    ("БҮЛЭГ III. ТЕХНИКИЙН ТОДОРХОЙЛОЛТ", "БҮЛЭГ IV"),
+    ("3 дугаар бүлэг", "4 дүгээр бүлэг"),
+    ("ГУРАВДУГААР БҮЛЭГ", "ДӨРӨВДҮГЭЭР БҮЛЭГ"),
+    ("Гуравдугаар бүлэг. Техникийн тодорхойлолт", "Дөрөвдүгээр бүлэг"),
+    ("ГУРАВ ДУГААР БҮЛЭГ", "ДӨРӨВ ДҮГЭЭР БҮЛЭГ"),
+])
+def test_find_section_heading_forms(heading_3, heading_4):
+    text = _document(heading_3, heading_4)
+    start, end = find_section(text)
+    assert text[start:end].strip().startswith(heading_3)
+    assert "100 ширхэг" in text[start:end]
+    assert "Гэрээний нөхцөл" not in text[start:end]
+
+
+def test_find_section_prefers_body_over_table_of_contents():
+    text = "\n".join([
+        "ГАРЧИГ",
+        "ГУРАВДУГААР БҮЛЭГ",
+        "ДӨРӨВДҮГЭЭР БҮЛЭГ",
+        "ГУРАВДУГААР БҮЛЭГ",
+        "Техникийн тодорхойлолт",
+        "1. Ширээ 100 ширхэг",
+        "2. Сандал 200 ширхэг",
+        "ДӨРӨВДҮГЭЭР БҮЛЭГ",
+    ])
+    start, end = find_section(text)
+    assert "Сандал" in text[start:end]
+
+
+def test_find_section_other_ordinals_are_not_section_three():
+    text = _document("ХОЁРДУГААР БҮЛЭГ", "ЗУРГААДУГААР БҮЛЭГ").replace("Техникийн тодорхойлолт", "Шаардлага")
+    assert find_section(text) is None
+
+
+def test_find_section_falls_back_to_title():
+    text = "Удиртгал\nТЕХНИКИЙН ТОДОРХОЙЛОЛТ\nШирээ\nIV БҮЛЭГ\nГэрээ"
+    start, end = find_section(text)
+    assert text[start:end] == "ТЕХНИКИЙН ТОДОРХОЙЛОЛТ\nШирээ\n"
+
+
+def test_find_section_missing():
+    assert find_section("Зөвхөн удиртгал") is None
+
+
+def test_lot_passages_merge_overlapping_windows():
+    lines = [f"мөр {i}" for i in range(60)]
+    lines[5] = "Багц 1: ширээ"
+    lines[10] = "Багц 2: сандал"
+    lines[40] = "БАГЦ 3: самбар"
+    passages = lot_passages("\n".join(lines))
+    assert len(passages) == 2
+    assert "Багц 1" in passages[0] and "Багц 2" in passages[0]
+    assert passages[0].splitlines()[0] == "мөр 3"
+    assert passages[1].startswith("мөр 38") and "БАГЦ 3" in passages[1]
+
+
+def test_lot_passages_none():
+    assert lot_passages("Багцгүй баримт".replace("Багц", "")) == []
@@ -0,0 +1,33 @@
+from typing import List
+
+import pytest
+from pydantic_ai import NativeOutput
+
+from schemas.lvl_schema import TenderOverview, TenderOverviewAgent, TenderOverviewConfig
+from src.agent.prompt_cache import GeminiPromptCache, StubPromptCache
+
+
+def _agent(monkeypatch, cache):
+    monkeypatch.setattr("schemas.lvl_schema.get_prompt_cache", lambda: cache)
+    return TenderOverviewAgent(TenderOverviewConfig(
+        model_name="test", context_cache=True, index_fallback=False, requests_per_minute=None, tokens_per_minute=None,
+    ))
+
+
+def test_unsupported_model_keeps_tool_output(monkeypatch):
+    agent = _agent(monkeypatch, GeminiPromptCache())
+    assert agent.prompt_cache is not None
+    assert agent.agent._output_type is TenderOverview
+    assert agent.batch_agent._output_type == List[TenderOverview]
+
+
+def test_cached_gemini_model_uses_native_output(monkeypatch):
+    agent = _agent(monkeypatch, GeminiPromptCache())
+    if not agent.prompt_cache.supports("google-gla:gemini-2.5-flash", agent.agent_system_prompt):
+        pytest.skip("system prompt is below PROMPT_CACHE_MIN_TOKENS")
+    assert isinstance(agent._output_type(TenderOverview, "google-gla:gemini-2.5-flash"), NativeOutput)
+
+
+def test_stub_cache_keeps_tool_output(monkeypatch):
+    agent = _agent(monkeypatch, StubPromptCache())
+    assert agent._output_type(TenderOverview, "google-gla:gemini-2.5-flash") is TenderOverview
@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from src.agent.rate_limiter import RateLimiter, estimate_tokens
+
+
+def _acquire_times(limiter: RateLimiter, tokens: list) -> list:
+    async def run():
+        started = time.monotonic()
+        times = []
+        for count in tokens:
+            await limiter.acquire(count)
+            times.append(time.monotonic() - started)
+        return times
+
+    return asyncio.run(run())
+
+
+def test_requests_within_limit_do_not_wait():
+    times = _acquire_times(RateLimiter(requests_per_minute=3, window=0.3), [0, 0, 0])
+    assert times[-1] < 0.1
+
+
+def test_request_limit_waits_for_window():
+    times = _acquire_times(RateLimiter(requests_per_minute=2, window=0.3), [0, 0, 0])
+    assert times[1] < 0.1
+    assert times[2] >= 0.25
+
+
+def test_token_limit_waits_for_window():
+    times = _acquire_times(RateLimiter(tokens_per_minute=100, window=0.3), [60, 30, 20])
+    assert times[1] < 0.1
+    assert times[2] >= 0.25
+
+
+def test_oversized_request_passes_on_empty_window():
+    times = _acquire_times(RateLimiter(tokens_per_minute=10, window=0.3), [500])
+    assert times[0] < 0.1
+
+
+def test_concurrent_waiters_share_the_limit():
+    limiter = RateLimiter(requests_per_minute=2, window=0.3)
+
+    async def run():
+        started = time.monotonic()
+
+        async def one():
+            await limiter.acquire()
+            return time.monotonic() - started
+
+        return sorted(await asyncio.gather(*(one() for _ in range(4))))
+
+    times = asyncio.run(run())
+    assert times[1] < 0.1
+    assert times[2] >= 0.25
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 1
+    assert estimate_tokens("a" * 30) == 11
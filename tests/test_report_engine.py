@@ -0,0 +1,74 @@
+import openpyxl
+
+from src.services.save_excel import pdf_result_to_excel, save_to_excel
+
+FIRST_DATA_ROW = 5
+
+
+def _overview(**overrides):
+    record = {
+        "summary": "Сургуулийн засвар",
+        "name": "Сургуулийн засвар",
+        "ordering_organization": "Боловсролын газар",
+        "announced_date": "2026-01-01",
+        "deadline_date": "2026-02-01",
+        "selection_number": "ШТ-000001",
+        "official_link": "https://www.tender.gov.mn/mn/invitation/detail/1",
+        "total_budget": 1500000,
+        "tender_type": "WORKS",
+        "tender_category": ["W01"],
+        "tender_category_detail": ["W01_001"],
+        "level1": "W",
+        "level2": ["W01"],
+        "level3": ["W01_001"],
+    }
+    record.update(overrides)
+    return record
+
+
+def _sheet(path):
+    return openpyxl.load_workbook(path).active
+
+
+def _heights(ws, count):
+    return [ws.row_dimensions[FIRST_DATA_ROW + i].height for i in range(count)]
+
+
+def test_overview_keeps_number_format_on_empty_budget(tmp_path):
+    path = tmp_path / "overview.xlsx"
+    save_to_excel([_overview(total_budget=None, official_link="")], str(path))
+    ws = _sheet(path)
+    assert ws[f"H{FIRST_DATA_ROW}"].number_format == "#,##0.00"
+    link = ws[f"L{FIRST_DATA_ROW}"]
+    assert link.font.color.rgb.endswith("0000FF")
+    assert link.hyperlink is None
+
+
+def test_pdf_report_writes_empty_budget_as_text(tmp_path):
+    path = tmp_path / "pdf.xlsx"
+    pdf_result_to_excel([_overview(total_budget=None, main_category="Барилга", parts=[])], str(path))
+    assert _sheet(path)[f"E{FIRST_DATA_ROW}"].number_format == "General"
+
+
+def test_overview_heights_size_first_row_and_repeated_single_items(tmp_path):
+    path = tmp_path / "overview.xlsx"
+    # Summary wraps to 8 lines at 51 characters; the single category wraps to 2 at 20
+    record = _overview(
+        summary="с" * 51 * 8,
+        tender_category=["к" * 30],
+        tender_category_detail=["W01_001", "W01_002"],
+    )
+    save_to_excel([record], str(path))
+    assert _heights(_sheet(path), 2) == [120.0, 30.0]
+
+
+def test_pdf_heights_share_merged_text_evenly(tmp_path):
+    # Requirements wrap to 5 lines at 54 characters, plus one padding line: 90pt
+    requirements = {"main_requirements": "ш" * 54 * 5}
+    parts = [{"part_name": "Хэсэг 1", "content": ""}, {"part_name": "Хэсэг 2", "content": ""}]
+    single = tmp_path / "single.xlsx"
+    grouped = tmp_path / "grouped.xlsx"
+    pdf_result_to_excel([_overview(main_category="Барилга", requirements=requirements, parts=parts[:1])], str(single))
+    pdf_result_to_excel([_overview(main_category="Барилга", requirements=requirements, parts=parts)], str(grouped))
+    assert _heights(_sheet(single), 1) == [90.0]
+    assert _heights(_sheet(grouped), 2) == [45.0, 45.0]
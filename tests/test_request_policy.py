@@ -0,0 +1,97 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.services.browser_pool import BrowserPool
+from src.services.request_policy import ESTIMATED_BYTES_BY_TYPE, RequestPolicy, RequestStats
+
+
+def _policy(**kwargs) -> RequestPolicy:
+    defaults = {
+        "blocked_resource_types": ["image", "stylesheet"],
+        "blocked_url_patterns": ["*google-analytics.com*"],
+        "allowed_url_patterns": ["*tender.gov.mn/css/app.css"],
+    }
+    defaults.update(kwargs)
+    return RequestPolicy(**defaults)
+
+
+def test_blocks_by_resource_type():
+    policy = _policy()
+    assert policy.should_block("https://www.tender.gov.mn/logo.png", "image")
+    assert not policy.should_block("https://www.tender.gov.mn/api/tenders", "xhr")
+    assert not policy.should_block("https://www.tender.gov.mn/", "document")
+
+
+def test_blocks_tracker_urls_of_any_type():
+    assert _policy().should_block("https://www.google-analytics.com/analytics.js", "script")
+
+
+def test_allow_list_wins_over_both_deny_lists():
+    policy = _policy(blocked_url_patterns=["*tender.gov.mn/css/*"])
+    assert not policy.should_block("https://www.tender.gov.mn/css/app.css", "stylesheet")
+    assert policy.should_block("https://www.tender.gov.mn/css/theme.css", "stylesheet")
+
+
+class FakeRoute:
+    def __init__(self, url: str, resource_type: str):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type)
+        self.outcome = None
+
+    async def abort(self, reason: str):
+        self.outcome = reason
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+def test_handle_counts_into_the_given_run():
+    policy = _policy()
+    first, second = RequestStats(), RequestStats()
+    image = FakeRoute("https://www.tender.gov.mn/logo.png", "image")
+    page = FakeRoute("https://www.tender.gov.mn/", "document")
+
+    async def run():
+        await policy.handle(image, first)
+        await policy.handle(page, second)
+        await policy.handle(FakeRoute("https://www.tender.gov.mn/api", "xhr"))
+
+    asyncio.run(run())
+    assert image.outcome == "blockedbyclient" and page.outcome == "continued"
+    assert first.report() == {
+        "allowed_requests": 0,
+        "blocked_requests": 1,
+        "blocked_by_type": {"image": 1},
+        "estimated_bytes_saved": ESTIMATED_BYTES_BY_TYPE["image"],
+    }
+    assert second.report()["allowed_requests"] == 1 and second.report()["blocked_requests"] == 0
+
+
+class FakeContext:
+    def __init__(self):
+        self.handler = None
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+class FakeBrowser:
+    async def new_context(self, user_agent):
+        return FakeContext()
+
+
+def test_pool_counts_each_context_into_its_current_lease():
+    pool = BrowserPool()
+    first, second = RequestStats(), RequestStats()
+
+    async def run():
+        one = await pool.new_context(FakeBrowser())
+        two = await pool.new_context(FakeBrowser())
+        pool._context_stats[one] = first
+        pool._context_stats[two] = second
+        await one.handler(FakeRoute("https://www.tender.gov.mn/logo.png", "image"))
+        await two.handler(FakeRoute("https://www.tender.gov.mn/", "document"))
+        await two.handler(FakeRoute("https://www.tender.gov.mn/", "document"))
+
+    asyncio.run(run())
+    assert first.report()["blocked_requests"] == 1 and first.allowed == 0
+    assert second.allowed == 2 and second.report()["blocked_requests"] == 0